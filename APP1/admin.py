@@ -1,14 +1,33 @@
 # app1/admin.py
 from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+
+from config.autocomplete import PrefixSearchMixin
+from config.facets import ActiveListFilter
 
 from .models import Profile, Address
 
 
+User = get_user_model()
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class UserAdmin(PrefixSearchMixin, BaseUserAdmin):
+    # حقول المستخدم في بقية اللوحات autocomplete تبحث هنا بالبادئة (فهرسا Lower في 0004)
+    autocomplete_prefix_fields = ("username", "email")
+
+
 @admin.register(Profile)
-class ProfileAdmin(admin.ModelAdmin):
+class ProfileAdmin(PrefixSearchMixin, admin.ModelAdmin):
     list_display = ("user", "full_name", "phone", "role", "is_active", "created_at")
-    list_filter = ("role", "is_active", "preferred_language")
+    list_select_related = ("user",)
+    list_filter = ("role", ActiveListFilter, "preferred_language")
     search_fields = ("full_name", "phone", "user__username", "user__email")
+    autocomplete_prefix_fields = ("full_name",)
+    autocomplete_fields = ("user",)
     ordering = ("-created_at",)
     readonly_fields = ("id", "created_at", "updated_at")
 
@@ -20,11 +39,17 @@ class ProfileAdmin(admin.ModelAdmin):
         ("Meta", {"fields": ("id", "created_at", "updated_at")}),
     )
 
+    def get_queryset(self, request):
+        # __str__ يرجع إلى اسم المستخدم، ونتائج autocomplete تمر بهذا الاستعلام
+        return super().get_queryset(request).select_related("user")
+
 
 @admin.register(Address)
 class AddressAdmin(admin.ModelAdmin):
     list_display = ("profile", "label", "city", "district", "is_default", "is_active", "created_at")
-    list_filter = ("city", "is_default", "is_active")
+    list_select_related = ("profile__user",)
+    list_filter = ("city", "is_default", ActiveListFilter)
     search_fields = ("profile__full_name", "city", "district", "street", "postal_code")
+    autocomplete_fields = ("profile",)
     ordering = ("-created_at",)
     readonly_fields = ("id", "created_at", "updated_at")
@@ -5,3 +5,6 @@ class App1Config(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "APP1"
     verbose_name = _("التطبيق الأول")
+
+    def ready(self):
+        from . import cache  # noqa: F401  (إشارات إبطال تخزين الملفات الشخصية)
@@ -0,0 +1,133 @@
+# app1/cache.py
+"""
+تخزين مؤقت للملف الشخصي (الدور، اللغة، المنطقة الزمنية) على مستويين:
+
+- داخل الطلب: يُربط الملف بكائن المستخدم نفسه فيعمل request.user.profile دون استعلام.
+- بين الطلبات: قيم الحقول في ذاكرة تخزين Django (locmem افتراضيًا، قابلة للتبديل عبر
+  PROFILE_CACHE["ALIAS"]) بمفتاح له إصدار، وتُحذف عبر إشارات post_save/post_delete.
+
+تعديل الملف عبر QuerySet.update() أو إنشاؤه عبر bulk_create() لا يرسل إشارات؛ استدعِ
+invalidate(user_id) أو invalidate_many(user_ids) بعد الالتزام، وإلا بقي "لا يوجد ملف"
+المخزّن قبل الإنشاء صالحًا حتى انتهاء مهلته.
+"""
+import threading
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Profile
+
+# يُرفع عند تغيير حقول Profile حتى لا تُقرأ قيم بصيغة قديمة
+SCHEMA_VERSION = 1
+# تمييز "لا يوجد ملف" عن "غير موجود في التخزين"
+_NO_PROFILE = "__none__"
+
+_lock = threading.Lock()
+_counters = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def _config():
+    return {"ALIAS": "default", "TIMEOUT": 600, "VERSION": 1, **getattr(settings, "PROFILE_CACHE", {})}
+
+
+def _cache():
+    return caches[_config()["ALIAS"]]
+
+
+def cache_key(user_id) -> str:
+    return f"profile:{SCHEMA_VERSION}:{user_id}"
+
+
+def _count(name):
+    with _lock:
+        _counters[name] += 1
+
+
+def stats() -> dict:
+    """عدادات العملية الحالية: hits / misses / invalidations ونسبة الإصابة."""
+    with _lock:
+        counters = dict(_counters)
+    lookups = counters["hits"] + counters["misses"]
+    counters["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+    return counters
+
+
+def reset_stats() -> None:
+    with _lock:
+        for name in _counters:
+            _counters[name] = 0
+
+
+def _field_names():
+    return [field.attname for field in Profile._meta.concrete_fields]
+
+
+def _attach(user, profile):
+    """يربط الملف بالمستخدم في الاتجاهين (None يجعل user.profile يرفع DoesNotExist دون استعلام)."""
+    user_field = Profile._meta.get_field("user")
+    user_field.remote_field.set_cached_value(user, profile)
+    if profile is not None:
+        user_field.set_cached_value(profile, user)
+    return profile
+
+
+def get_profile(user):
+    """الملف الشخصي للمستخدم أو None، من الكائن ثم من التخزين ثم من قاعدة البيانات."""
+    if user is None or not getattr(user, "is_authenticated", False):
+        return None
+    rel = Profile._meta.get_field("user").remote_field
+    if rel.is_cached(user):
+        return rel.get_cached_value(user)
+
+    config = _config()
+    cache = _cache()
+    key = cache_key(user.pk)
+    cached = cache.get(key, version=config["VERSION"])
+    if cached is not None:
+        _count("hits")
+        if cached == _NO_PROFILE:
+            return _attach(user, None)
+        db = router.db_for_read(Profile)
+        return _attach(user, Profile.from_db(db, _field_names(), [cached[name] for name in _field_names()]))
+
+    _count("misses")
+    profile = Profile._default_manager.filter(user_id=user.pk).first()
+    if profile is None:
+        value = _NO_PROFILE
+    else:
+        value = {name: getattr(profile, name) for name in _field_names()}
+    cache.set(key, value, config["TIMEOUT"], version=config["VERSION"])
+    return _attach(user, profile)
+
+
+def attach_profile(user):
+    """يحمّل الملف (من التخزين غالبًا) ويربطه بالمستخدم، ثم يعيد المستخدم."""
+    get_profile(user)
+    return user
+
+
+def invalidate(user_id) -> None:
+    _count("invalidations")
+    _cache().delete(cache_key(user_id), version=_config()["VERSION"])
+
+
+def invalidate_many(user_ids, batch_size=1000) -> None:
+    """حذف مجمّع لعدة مستخدمين (بعد bulk_create مثلًا) بدفعات delete_many."""
+    cache, version = _cache(), _config()["VERSION"]
+    user_ids = iter(user_ids)
+    while batch := list(islice(user_ids, batch_size)):
+        with _lock:
+            _counters["invalidations"] += len(batch)
+        cache.delete_many([cache_key(user_id) for user_id in batch], version=version)
+
+
+@receiver(post_save, sender=Profile, dispatch_uid="profile-cache-save")
+@receiver(post_delete, sender=Profile, dispatch_uid="profile-cache-delete")
+def _invalidate_profile(sender, instance, using=None, **kwargs):
+    invalidate(instance.user_id)
+    # حذف ثانٍ بعد الالتزام حتى لا يبقى في التخزين ما قرأه طلب آخر قبل الالتزام
+    transaction.on_commit(lambda: invalidate(instance.user_id), using=using)
@@ -0,0 +1,304 @@
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from config.db.transactions import atomic_immediate
+
+
+class Importer(ABC):
+    """مواصفات استيراد نموذج: الحقول التي تُتحقق في العمال، وحلّ المراجع في العملية الرئيسية."""
+
+    model_label = None
+    fields = ()
+    required = ()
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def validate(self, row):
+        """تحقق لا يحتاج قاعدة البيانات (يعمل داخل عمال المعالجة المتوازية)."""
+        cleaned, errors = {}, {}
+        for name in self.required:
+            if not str(row.get(name) or "").strip():
+                errors[name] = ["هذا الحقل مطلوب."]
+        for name in self.fields:
+            if name not in row or name in errors:
+                continue
+            field = self.model._meta.get_field(name)
+            raw = row[name]
+            if raw in (None, "") and (field.blank or field.null):
+                continue
+            try:
+                cleaned[name] = field.clean(raw.strip() if isinstance(raw, str) else raw, None)
+            except ValidationError as exc:
+                errors[name] = exc.messages
+        return cleaned, errors
+
+    def build_lookups(self):
+        return {}
+
+    def prepare_chunk(self, rows, lookups):
+        pass
+
+    @abstractmethod
+    def resolve(self, row, cleaned, lookups):
+        """يعيد (instance, errors) بعد حلّ المراجع عبر القواميس المبنية مسبقًا."""
+
+    def after_write(self, objs):
+        pass
+
+    def after_commit(self, objs):
+        pass
+
+
+class ProfileImporter(Importer):
+    model_label = "APP1.Profile"
+    fields = ("full_name", "phone", "national_id", "role", "gender", "birth_date", "preferred_language", "timezone", "notes")
+    required = ("username",)
+
+    def __init__(self, create_users=False):
+        self.create_users = create_users
+
+    def build_lookups(self):
+        User = get_user_model()
+        return {
+            "users": dict(User.objects.values_list(User.USERNAME_FIELD, "pk")),
+            "profiled": set(self.model.objects.values_list("user_id", flat=True)),
+        }
+
+    def prepare_chunk(self, rows, lookups):
+        # إنشاء المستخدمين الناقصين دفعة واحدة قبل حلّ الصفوف
+        if not self.create_users:
+            return
+        User = get_user_model()
+        missing = {row["username"].strip() for row, cleaned, errors in rows if not errors} - lookups["users"].keys()
+        if not missing:
+            return
+        password = make_password(None)
+        User.objects.bulk_create(
+            [User(**{User.USERNAME_FIELD: name, "password": password}) for name in sorted(missing)],
+            ignore_conflicts=True,
+        )
+        lookups["users"].update(User.objects.filter(**{f"{User.USERNAME_FIELD}__in": missing}).values_list(
+            User.USERNAME_FIELD, "pk"
+        ))
+
+    def resolve(self, row, cleaned, lookups):
+        user_id = lookups["users"].get(row["username"].strip())
+        if user_id is None:
+            return None, {"username": ["المستخدم غير موجود."]}
+        if user_id in lookups["profiled"]:
+            return None, {"username": ["يوجد ملف شخصي لهذا المستخدم."]}
+        lookups["profiled"].add(user_id)
+        return self.model(user_id=user_id, **cleaned), {}
+
+    def after_commit(self, objs):
+        # bulk_create لا يرسل post_save: يُحذف "لا يوجد ملف" المخزّن لهؤلاء المستخدمين
+        from APP1 import cache as profile_cache
+
+        profile_cache.invalidate_many(obj.user_id for obj in objs)
+
+
+class AddressImporter(Importer):
+    model_label = "APP1.Address"
+    fields = ("label", "city", "district", "street", "postal_code", "is_default")
+    required = ("username", "city")
+
+    def build_lookups(self):
+        Profile = apps.get_model("APP1.Profile")
+        return {"profiles": dict(Profile.objects.values_list(f"user__{get_user_model().USERNAME_FIELD}", "pk"))}
+
+    def resolve(self, row, cleaned, lookups):
+        profile_id = lookups["profiles"].get(row["username"].strip())
+        if profile_id is None:
+            return None, {"username": ["لا يوجد ملف شخصي لهذا المستخدم."]}
+        return self.model(profile_id=profile_id, **cleaned), {}
+
+
+class AssetImporter(Importer):
+    model_label = "APP2.Asset"
+    fields = ("name", "serial_number", "quantity", "condition", "notes")
+    required = ("name",)
+
+    def build_lookups(self):
+        Department = apps.get_model("APP2.Department")
+        Category = apps.get_model("APP2.Category")
+        categories = {}
+        nodes = {pk: (name, parent_id) for pk, name, parent_id in Category.objects.values_list("pk", "name", "parent_id")}
+        for pk, (name, parent_id) in nodes.items():
+            # يُقبل الاسم وحده (إن لم يتكرر) أو المسار الكامل "أب/ابن"
+            names = [name]
+            while parent_id is not None and parent_id in nodes:
+                parent_name, parent_id = nodes[parent_id]
+                names.insert(0, parent_name)
+            categories["/".join(names)] = pk
+            categories[name] = None if name in categories and categories[name] != pk else pk
+        return {
+            "departments": dict(Department.objects.values_list("code", "pk")),
+            "categories": categories,
+        }
+
+    def resolve(self, row, cleaned, lookups):
+        errors = {}
+        kwargs = dict(cleaned)
+        department = str(row.get("department") or "").strip()
+        if department:
+            kwargs["department_id"] = lookups["departments"].get(department)
+            if kwargs["department_id"] is None:
+                errors["department"] = ["رمز الإدارة غير معروف."]
+        category = str(row.get("category") or "").strip()
+        if category:
+            kwargs["category_id"] = lookups["categories"].get(category)
+            if kwargs["category_id"] is None:
+                errors["category"] = ["التصنيف غير معروف أو اسمه مكرر (استخدم المسار الكامل)."]
+        if errors:
+            return None, errors
+        return self.model(**kwargs), {}
+
+    def after_write(self, objs):
+        # bulk_create لا يرسل post_save، لذا يُحدَّث فهرس البحث يدويًا
+        from APP2.search import index
+
+        index.add_many(objs)
+
+
+IMPORTERS = {"profile": ProfileImporter, "address": AddressImporter, "asset": AssetImporter}
+
+
+def _init_worker():
+    if not apps.ready:
+        django.setup()
+
+
+def _validate_chunk(model_key, chunk):
+    importer = IMPORTERS[model_key]()
+    results = []
+    for line, row in chunk:
+        cleaned, errors = importer.validate(row)
+        results.append((line, row, cleaned, errors))
+    return results
+
+
+def read_rows(path, fmt):
+    """يقرأ الملف سطرًا بسطر دون تحميله في الذاكرة: [(رقم السطر، الصف)]."""
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        if fmt == "csv":
+            reader = csv.DictReader(fh)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for number, line in enumerate(fh, start=1):
+                if line.strip():
+                    try:
+                        yield number, json.loads(line)
+                    except json.JSONDecodeError as exc:
+                        yield number, {"__error__": str(exc)}
+
+
+class Command(BaseCommand):
+    help = "استيراد الملفات الشخصية أو العناوين أو الأصول من CSV/JSONL بشكل متدفق مع نقطة استئناف وتقرير بالصفوف المرفوضة."
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", choices=sorted(IMPORTERS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="الافتراضي: حسب امتداد الملف")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="0 للتحقق داخل العملية")
+        parser.add_argument("--checkpoint", help="مفتاح نقطة الاستئناف في ImportCheckpoint (الافتراضي: <model>:<path>)")
+        parser.add_argument("--resume", action="store_true", help="متابعة من آخر نقطة محفوظة")
+        parser.add_argument("--rejects", help="تقرير الصفوف المرفوضة (الافتراضي: <path>.rejects.csv)")
+        parser.add_argument("--create-users", action="store_true", help="إنشاء المستخدمين غير الموجودين (profile)")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"الملف غير موجود: {path}")
+        fmt = options["format"] or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+        model_key = options["model"]
+        importer = ProfileImporter(options["create_users"]) if model_key == "profile" else IMPORTERS[model_key]()
+        rejects_path = options["rejects"] or f"{path}.rejects.csv"
+        key = options["checkpoint"] or f"{model_key}:{os.path.abspath(path)}"
+        ImportCheckpoint = apps.get_model("APP1", "ImportCheckpoint")
+        if options["resume"]:
+            checkpoint, _ = ImportCheckpoint.objects.get_or_create(key=key)
+            self.stdout.write(f"resuming after line {checkpoint.line}")
+        else:
+            checkpoint, _ = ImportCheckpoint.objects.update_or_create(
+                key=key, defaults={"line": 0, "imported": 0, "rejected": 0, "rejects_size": 0}
+            )
+        state = {name: getattr(checkpoint, name) for name in ("line", "imported", "rejected")}
+
+        lookups = importer.build_lookups()
+        rows = ((line, row) for line, row in read_rows(path, fmt) if line > state["line"])
+        chunks = iter(lambda: list(islice(rows, options["batch_size"])), [])
+
+        with open(rejects_path, "a" if options["resume"] else "w", newline="", encoding="utf-8") as rejects_fh:
+            if options["resume"]:
+                # مرفوضات دفعة لم تلتزم تُكتب من جديد عند إعادتها
+                rejects_fh.truncate(min(checkpoint.rejects_size, rejects_fh.tell()))
+                rejects_fh.seek(0, os.SEEK_END)
+            rejects = csv.writer(rejects_fh)
+            if rejects_fh.tell() == 0:
+                rejects.writerow(["line", "errors", "row"])
+            for results in self.validated(model_key, chunks, options["workers"]):
+                self.write_chunk(importer, results, lookups, rejects, rejects_fh, state, checkpoint)
+                self.stdout.write(f"line {state['line']}: imported {state['imported']}, rejected {state['rejected']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"done: imported {state['imported']}, rejected {state['rejected']} (report: {rejects_path})"
+        ))
+
+    def validated(self, model_key, chunks, workers):
+        """يتحقق من الدفعات في مجمع عمليات مع عدد محدود من الدفعات المعلّقة، ويعيدها بالترتيب."""
+        if workers <= 0:
+            for chunk in chunks:
+                yield _validate_chunk(model_key, chunk)
+            return
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_validate_chunk, model_key, chunk))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def write_chunk(self, importer, results, lookups, rejects, rejects_fh, state, checkpoint):
+        importer.prepare_chunk([(row, cleaned, errors) for _, row, cleaned, errors in results], lookups)
+        objs = []
+        for line, row, cleaned, errors in results:
+            if "__error__" in row:
+                errors = {"__all__": [row["__error__"]]}
+            if not errors:
+                obj, errors = importer.resolve(row, cleaned, lookups)
+            if errors:
+                rejects.writerow([line, json.dumps(errors, ensure_ascii=False), json.dumps(row, ensure_ascii=False)])
+                state["rejected"] += 1
+            else:
+                objs.append(obj)
+        rejects_fh.flush()
+        with atomic_immediate():
+            importer.model.objects.bulk_create(objs, batch_size=len(objs) or None)
+            importer.after_write(objs)
+            transaction.on_commit(lambda: importer.after_commit(objs))
+            # نقطة الاستئناف في معاملة الدفعة نفسها: إما أن تلتزما معًا أو تتراجعا معًا
+            checkpoint.line = results[-1][0]
+            checkpoint.imported = state["imported"] + len(objs)
+            checkpoint.rejected = state["rejected"]
+            checkpoint.rejects_size = rejects_fh.tell()
+            checkpoint.save()
+        state["imported"] = checkpoint.imported
+        state["line"] = checkpoint.line
@@ -0,0 +1,21 @@
+# app1/middleware.py
+from django.contrib.auth.middleware import get_user
+from django.utils.functional import SimpleLazyObject
+
+from .cache import attach_profile, get_profile
+
+
+class ProfileMiddleware:
+    """
+    يجعل request.user.profile و request.profile يُقرآن من تخزين الملفات الشخصية (APP1.cache)
+    بدل استعلام في كل طلب. يُوضع بعد AuthenticationMiddleware.
+    التحميل كسول: لا شيء يحدث إن لم يُستخدم المستخدم في الطلب.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user = SimpleLazyObject(lambda: attach_profile(get_user(request)))
+        request.profile = SimpleLazyObject(lambda: get_profile(request.user))
+        return self.get_response(request)
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:21
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Profile',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='المعرف')),
+                ('is_active', models.BooleanField(db_index=True, default=True, verbose_name='نشط')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='تاريخ الإنشاء')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+                ('full_name', models.CharField(blank=True, max_length=200, verbose_name='الاسم الكامل')),
+                ('phone', models.CharField(blank=True, db_index=True, max_length=20, validators=[django.core.validators.RegexValidator(message='أدخل رقم جوال صحيح (8-15 رقم) ويمكن أن يبدأ بـ +.', regex='^\\+?\\d{8,15}$')], verbose_name='رقم الجوال')),
+                ('national_id', models.CharField(blank=True, help_text='حقل اختياري (يفضّل تشفيره في بيئة الإنتاج).', max_length=20, validators=[django.core.validators.MinLengthValidator(8)], verbose_name='رقم الهوية/المعرف')),
+                ('role', models.CharField(choices=[('admin', 'مدير نظام'), ('manager', 'مدير'), ('staff', 'موظف'), ('user', 'مستخدم')], db_index=True, default='user', max_length=20, verbose_name='الدور')),
+                ('gender', models.CharField(blank=True, choices=[('male', 'ذكر'), ('female', 'أنثى'), ('other', 'أخرى')], max_length=10, verbose_name='الجنس')),
+                ('birth_date', models.DateField(blank=True, null=True, verbose_name='تاريخ الميلاد')),
+                ('preferred_language', models.CharField(db_index=True, default='ar', max_length=10, verbose_name='اللغة المفضلة')),
+                ('timezone', models.CharField(default='Asia/Riyadh', max_length=64, verbose_name='المنطقة الزمنية')),
+                ('notes', models.TextField(blank=True, verbose_name='ملاحظات')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='profile', to=settings.AUTH_USER_MODEL, verbose_name='المستخدم')),
+            ],
+            options={
+                'verbose_name': 'الملف الشخصي',
+                'verbose_name_plural': 'الملفات الشخصية',
+                'ordering': ('-created_at',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Address',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='المعرف')),
+                ('is_active', models.BooleanField(db_index=True, default=True, verbose_name='نشط')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='تاريخ الإنشاء')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+                ('label', models.CharField(blank=True, help_text='مثال: المنزل، العمل', max_length=50, verbose_name='التسمية')),
+                ('city', models.CharField(max_length=100, verbose_name='المدينة')),
+                ('district', models.CharField(blank=True, max_length=100, verbose_name='الحي')),
+                ('street', models.CharField(blank=True, max_length=200, verbose_name='الشارع')),
+                ('postal_code', models.CharField(blank=True, max_length=20, verbose_name='الرمز البريدي')),
+                ('is_default', models.BooleanField(db_index=True, default=False, verbose_name='افتراضي')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='addresses', to='APP1.profile', verbose_name='الملف الشخصي')),
+            ],
+            options={
+                'verbose_name': 'العنوان',
+                'verbose_name_plural': 'العناوين',
+                'ordering': ('-created_at',),
+                'abstract': False,
+                'indexes': [models.Index(fields=['profile', 'is_default'], name='APP1_addres_profile_db8d15_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:30
+
+import config.active
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP1', '0002_time_ordered_pk'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='address',
+            name='APP1_addres_profile_db8d15_idx',
+        ),
+        config.active.AlterFieldIndex(
+            model_name='address',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='نشط'),
+        ),
+        config.active.AlterFieldIndex(
+            model_name='profile',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='نشط'),
+        ),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='app1_address_active'),
+        ),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['profile', 'is_default'], name='app1_address_active_default'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='app1_profile_active'),
+        ),
+    ]
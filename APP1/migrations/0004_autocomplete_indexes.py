@@ -0,0 +1,44 @@
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+# فهارس بحث autocomplete بالبادئة على جدول المستخدمين (APP1.admin.UserAdmin)؛
+# نموذج المستخدم ليس من هذا التطبيق فلا مكان لها في Meta.indexes
+USER_INDEXES = [
+    models.Index(Lower("username"), name="app1_user_username_lower"),
+    models.Index(Lower("email"), name="app1_user_email_lower"),
+]
+
+
+def _user_model(apps):
+    app_label, model_name = settings.AUTH_USER_MODEL.split(".")
+    return apps.get_model(app_label, model_name)
+
+
+def create_user_indexes(apps, schema_editor):
+    user = _user_model(apps)
+    for index in USER_INDEXES:
+        schema_editor.add_index(user, index)
+
+
+def drop_user_indexes(apps, schema_editor):
+    user = _user_model(apps)
+    for index in USER_INDEXES:
+        schema_editor.remove_index(user, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP1', '0003_active_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(django.db.models.functions.text.Lower('full_name'), name='app1_profile_name_lower'),
+        ),
+        migrations.RunPython(create_user_indexes, drop_user_indexes),
+    ]
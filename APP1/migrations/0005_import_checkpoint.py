@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP1', '0004_autocomplete_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('key', models.CharField(max_length=255, primary_key=True, serialize=False, verbose_name='المفتاح')),
+                ('line', models.PositiveBigIntegerField(default=0, verbose_name='آخر سطر')),
+                ('imported', models.PositiveBigIntegerField(default=0, verbose_name='المستورد')),
+                ('rejected', models.PositiveBigIntegerField(default=0, verbose_name='المرفوض')),
+                ('rejects_size', models.PositiveBigIntegerField(default=0, verbose_name='حجم تقرير المرفوضات')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+            ],
+            options={
+                'verbose_name': 'نقطة استئناف الاستيراد',
+                'verbose_name_plural': 'نقاط استئناف الاستيراد',
+            },
+        ),
+    ]
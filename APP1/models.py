@@ -1,20 +1,27 @@
-import uuid
-
 from django.conf import settings
 from django.core.validators import RegexValidator, MinLengthValidator
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 
+from config.active import ActiveManager, active_index
+from config.ids import default_pk
+
 
 class TimeStampedModel(models.Model):
-    id = models.UUIDField(_("المعرف"), primary_key=True, default=uuid.uuid4, editable=False)
-    is_active = models.BooleanField(_("نشط"), default=True, db_index=True)
+    id = models.UUIDField(_("المعرف"), primary_key=True, default=default_pk, editable=False)
+    # بلا فهرس منفرد: الاستعلامات على النشط تستخدم الفهارس الجزئية (config.active)
+    is_active = models.BooleanField(_("نشط"), default=True)
     created_at = models.DateTimeField(_("تاريخ الإنشاء"), auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(_("تاريخ التحديث"), auto_now=True)
 
+    objects = models.Manager()
+    active = ActiveManager()
+
     class Meta:
         abstract = True
         ordering = ("-created_at",)
+        indexes = [active_index("created_at", name="%(app_label)s_%(class)s_active")]
 
 
 phone_validator = RegexValidator(
@@ -61,6 +68,11 @@ class Profile(TimeStampedModel):
     class Meta(TimeStampedModel.Meta):
         verbose_name = _("الملف الشخصي")
         verbose_name_plural = _("الملفات الشخصية")
+        indexes = [
+            *TimeStampedModel.Meta.indexes,
+            # بحث autocomplete بالبادئة (config.autocomplete.PrefixSearchMixin)
+            models.Index(Lower("full_name"), name="app1_profile_name_lower"),
+        ]
 
     def __str__(self) -> str:
         return self.full_name or getattr(self.user, "username", "ملف شخصي")
@@ -84,8 +96,28 @@ class Address(TimeStampedModel):
         verbose_name = _("العنوان")
         verbose_name_plural = _("العناوين")
         indexes = [
-            models.Index(fields=["profile", "is_default"]),
+            *TimeStampedModel.Meta.indexes,
+            active_index("profile", "is_default", name="app1_address_active_default"),
         ]
 
     def __str__(self) -> str:
         return f"{self.city} - {self.label or 'عنوان'}"
+
+
+class ImportCheckpoint(models.Model):
+    """نقطة استئناف import_data: تُحدَّث في معاملة كل دفعة نفسها، فلا تُستورد دفعة ملتزمة مرتين."""
+
+    key = models.CharField(_("المفتاح"), max_length=255, primary_key=True)
+    line = models.PositiveBigIntegerField(_("آخر سطر"), default=0)
+    imported = models.PositiveBigIntegerField(_("المستورد"), default=0)
+    rejected = models.PositiveBigIntegerField(_("المرفوض"), default=0)
+    # حجم تقرير المرفوضات عند الالتزام؛ الاستئناف يقص ما كُتب بعده لدفعة تراجعت
+    rejects_size = models.PositiveBigIntegerField(_("حجم تقرير المرفوضات"), default=0)
+    updated_at = models.DateTimeField(_("تاريخ التحديث"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("نقطة استئناف الاستيراد")
+        verbose_name_plural = _("نقاط استئناف الاستيراد")
+
+    def __str__(self) -> str:
+        return f"{self.key} @ {self.line}"
@@ -1,3 +1,250 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.functions import Lower
+from django.http import JsonResponse
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path
+
+from APP2.models import Asset, Category, Department
+from config.testing import ADMIN_BUDGET_ROWS, AdminQueryBudgetMixin, query_plan
+
+from . import cache as profile_cache
+from .management.commands.import_data import AssetImporter
+from .models import Address, ImportCheckpoint, Profile
+
+
+def profile_view(request):
+    return JsonResponse({"role": request.user.profile.role, "language": request.profile.preferred_language})
+
+
+urlpatterns = [path("profile/", profile_view)]
+
+
+class ImportDataTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write_csv(self, name, header, rows):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(header)
+            writer.writerows(rows)
+        return path
+
+    def read_rejects(self, path):
+        with open(f"{path}.rejects.csv", encoding="utf-8") as fh:
+            return list(csv.DictReader(fh))
+
+    def run_import(self, *args, **options):
+        call_command("import_data", *args, workers=0, batch_size=2, stdout=io.StringIO(), **options)
+
+    def test_profiles_are_validated_and_users_created(self):
+        path = self.write_csv(
+            "profiles.csv",
+            ["username", "full_name", "phone", "national_id", "role"],
+            [
+                ["ali", "علي أحمد", "+966500000001", "12345678", "staff"],
+                ["sara", "سارة", "123", "", "user"],
+                ["omar", "عمر", "0500000002", "123", "manager"],
+                ["huda", "هدى", "", "", "unknown"],
+                ["ali", "مكرر", "", "", "user"],
+            ],
+        )
+        self.run_import("profile", path, create_users=True)
+        self.assertEqual(list(Profile.objects.values_list("user__username", flat=True)), ["ali"])
+        rejects = {int(r["line"]): json.loads(r["errors"]) for r in self.read_rejects(path)}
+        self.assertEqual(set(rejects), {3, 4, 5, 6})
+        self.assertIn("phone", rejects[3])
+        self.assertIn("national_id", rejects[4])
+        self.assertIn("role", rejects[5])
+        self.assertIn("username", rejects[6])
+
+    def test_imported_profiles_replace_cached_misses(self):
+        caches["profiles"].clear()
+        user = get_user_model().objects.create_user("ali")
+        self.assertIsNone(profile_cache.get_profile(user))
+        path = self.write_csv("profiles.csv", ["username", "role"], [["ali", "staff"]])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.run_import("profile", path)
+        profile = profile_cache.get_profile(get_user_model().objects.get(pk=user.pk))
+        self.assertEqual(profile.role, "staff")
+
+    def test_addresses_resolve_profiles(self):
+        user = get_user_model().objects.create_user("ali")
+        Profile.objects.create(user=user)
+        path = os.path.join(self.tmp.name, "addresses.jsonl")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(json.dumps({"username": "ali", "city": "الرياض", "is_default": True}) + "\n")
+            fh.write(json.dumps({"username": "nobody", "city": "جدة"}) + "\n")
+            fh.write("{broken\n")
+        self.run_import("address", path)
+        self.assertEqual(list(Address.objects.values_list("city", "is_default")), [("الرياض", True)])
+        self.assertEqual([r["line"] for r in self.read_rejects(path)], ["2", "3"])
+
+    def test_assets_resolve_lookups_and_resume_from_checkpoint(self):
+        Department.objects.create(name="تقنية المعلومات", code="IT")
+        root = Category.objects.create(name="أجهزة")
+        Category.objects.create(name="حواسيب", parent=root)
+        path = self.write_csv(
+            "assets.csv",
+            ["name", "department", "category", "quantity"],
+            [
+                ["حاسب 1", "IT", "أجهزة/حواسيب", "1"],
+                ["حاسب 2", "IT", "حواسيب", "2"],
+                ["طابعة", "HR", "", "1"],
+                ["شاشة", "", "", "0"],
+            ],
+        )
+        ImportCheckpoint.objects.create(key="assets", line=2, imported=1)
+        self.run_import("asset", path, checkpoint="assets", resume=True)
+        self.assertEqual(list(Asset.objects.values_list("name", flat=True)), ["حاسب 2"])
+        checkpoint = ImportCheckpoint.objects.get(key="assets")
+        self.assertEqual((checkpoint.line, checkpoint.imported, checkpoint.rejected), (5, 2, 2))
+
+    def test_failed_chunk_is_retried_once_on_resume(self):
+        path = self.write_csv("assets.csv", ["name", "quantity"], [["أصل 0", "1"], ["أصل 1", "1"], ["أصل 2", "1"], ["", "1"], ["أصل 3", "1"]])
+        real_after_write = AssetImporter.after_write
+        calls = []
+
+        def fail_second_chunk(importer, objs):
+            calls.append(len(objs))
+            if len(calls) == 2:
+                raise RuntimeError("crash")
+            real_after_write(importer, objs)
+
+        with mock.patch.object(AssetImporter, "after_write", fail_second_chunk), self.assertRaises(RuntimeError):
+            self.run_import("asset", path)
+        # الدفعة الأولى ونقطتها التزمتا معًا، والثانية تراجعت بكاملها (ومرفوضها يُقص عند الاستئناف)
+        self.assertEqual(Asset.objects.count(), 2)
+        self.assertEqual(ImportCheckpoint.objects.get().line, 3)
+
+        self.run_import("asset", path, resume=True)
+        self.assertEqual(sorted(Asset.objects.values_list("name", flat=True)), [f"أصل {i}" for i in range(4)])
+        self.assertEqual(len(self.read_rejects(path)), 1)
+
+    def test_worker_pool(self):
+        path = self.write_csv("assets.csv", ["name", "quantity"], [[f"أصل {i}", "1"] for i in range(10)])
+        call_command("import_data", "asset", path, workers=2, batch_size=3, stdout=io.StringIO())
+        self.assertEqual(Asset.objects.count(), 10)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class ProfileCacheTests(TestCase):
+    def setUp(self):
+        caches["profiles"].clear()
+        profile_cache.reset_stats()
+        self.user = get_user_model().objects.create_user("ali", password="pass")
+        self.profile = Profile.objects.create(user=self.user, role=Profile.Role.MANAGER, preferred_language="en")
+        self.client.force_login(self.user)
+
+    def profile_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/profile/")
+        self.assertEqual(response.status_code, 200)
+        return response.json(), [q["sql"] for q in queries if Profile._meta.db_table in q["sql"]]
+
+    def test_warm_request_runs_no_profile_query(self):
+        data, queries = self.profile_queries()
+        self.assertEqual(data, {"role": "manager", "language": "en"})
+        self.assertEqual(len(queries), 1)
+        data, queries = self.profile_queries()
+        self.assertEqual(data, {"role": "manager", "language": "en"})
+        self.assertEqual(queries, [])
+        self.assertEqual(profile_cache.stats()["hits"], 1)
+        self.assertEqual(profile_cache.stats()["misses"], 1)
+
+    def test_save_invalidates_cached_profile(self):
+        self.profile_queries()
+        self.profile.role = Profile.Role.ADMIN
+        self.profile.save()
+        data, queries = self.profile_queries()
+        self.assertEqual(data["role"], "admin")
+        self.assertEqual(len(queries), 1)
+
+    def test_missing_profile_is_cached(self):
+        user = get_user_model().objects.create_user("sara")
+        self.assertIsNone(profile_cache.get_profile(user))
+        user = get_user_model().objects.get(pk=user.pk)
+        with self.assertNumQueries(0):
+            self.assertIsNone(profile_cache.get_profile(user))
+            with self.assertRaises(Profile.DoesNotExist):
+                user.profile
+
+
+class AdminQueryBudgetTests(AdminQueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        users = User.objects.bulk_create([User(username=f"user{i}") for i in range(ADMIN_BUDGET_ROWS)])
+        # نصف الملفات بلا اسم كامل حتى يظهر اسم المستخدم (علاقة user) في العرض
+        profiles = Profile.objects.bulk_create([
+            Profile(user=user, full_name=f"مستخدم {i}" if i % 2 else "") for i, user in enumerate(users)
+        ])
+        Address.objects.bulk_create([Address(profile=profile, city=f"مدينة {i}") for i, profile in enumerate(profiles)])
+
+    def test_admin_pages_stay_within_query_budget(self):
+        self.assertAdminBudgets("APP1")
+
+
+class ActiveAddressTests(TestCase):
+    def test_default_address_lookup_uses_partial_index(self):
+        profile = Profile.objects.create(user=get_user_model().objects.create_user("owner"))
+        Address.objects.create(profile=profile, city="الرياض", is_default=True)
+        queryset = Address.active.filter(profile=profile, is_default=True)
+        self.assertIn("app1_address_active_default", query_plan(queryset))
+        self.assertEqual(queryset.get().city, "الرياض")
+
+
+class AutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_superuser("root", "root@example.com", "pass")
+        User.objects.bulk_create([User(username=f"Salem{i:02d}") for i in range(25)] + [User(username="other")])
+
+    def setUp(self):
+        caches["default"].clear()
+        self.client.force_login(self.admin)
+
+    def autocomplete(self, **params):
+        params = {"app_label": "APP3", "model_name": "task", "field_name": "assigned_to", **params}
+        return self.client.get("/admin/autocomplete/", params)
+
+    def test_prefix_matches_are_paginated_without_count(self):
+        first = self.autocomplete(term="salem").json()
+        self.assertEqual(len(first["results"]), 20)
+        self.assertTrue(first["pagination"]["more"])
+        self.assertEqual(first["results"][0]["text"], "Salem00")
+        second = self.autocomplete(term="salem", page=2).json()
+        self.assertEqual([r["text"] for r in second["results"]], [f"Salem{i}" for i in range(20, 25)])
+        self.assertFalse(second["pagination"]["more"])
+
+    def test_results_are_cached_until_the_model_changes(self):
+        self.autocomplete(term="sal")
+        with CaptureQueriesContext(connection) as queries:
+            self.autocomplete(term="sal")
+        self.assertFalse([q for q in queries if "auth_user" in q["sql"] and "LOWER" in q["sql"]])
+
+        get_user_model().objects.create_user("Salad")
+        texts = [r["text"] for r in self.autocomplete(term="sal").json()["results"]]
+        self.assertEqual(texts[0], "Salad")
+
+    def test_prefix_search_uses_lower_index(self):
+        profile = Profile.objects.create(user=self.admin, full_name="سالم")
+        queryset = Profile.objects.alias(name_lower=Lower("full_name")).filter(
+            name_lower__gte="سا", name_lower__lt="سب"
+        )
+        self.assertIn("app1_profile_name_lower", query_plan(queryset))
+        self.assertEqual(queryset.get(), profile)
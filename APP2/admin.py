@@ -1,6 +1,11 @@
 # app2/admin.py
 from django.contrib import admin
 
+from config.export import ExportActionsMixin
+from config.facets import ActiveListFilter, ChoicesFacetListFilter, RelatedFacetListFilter
+from config.pagination import KeysetPaginationMixin
+from config.search import FullTextSearchMixin
+
 from .models import Department, Category, Asset, Attachment, AssetAssignment
 
 
@@ -8,7 +13,7 @@ from .models import Department, Category, Asset, Attachment, AssetAssignment
 class DepartmentAdmin(admin.ModelAdmin):
     list_display = ("name", "code", "is_active", "created_at")
     search_fields = ("name", "code")
-    list_filter = ("is_active",)
+    list_filter = (ActiveListFilter,)
     ordering = ("name",)
     readonly_fields = ("id", "created_at", "updated_at")
 
@@ -16,34 +21,49 @@ class DepartmentAdmin(admin.ModelAdmin):
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ("name", "parent", "is_active", "created_at")
+    list_select_related = ("parent",)
     search_fields = ("name",)
-    list_filter = ("is_active",)
+    list_filter = (ActiveListFilter,)
     ordering = ("name",)
     readonly_fields = ("id", "created_at", "updated_at")
 
 
 @admin.register(Asset)
-class AssetAdmin(admin.ModelAdmin):
+class AssetAdmin(FullTextSearchMixin, ExportActionsMixin, admin.ModelAdmin):
     list_display = ("name", "department", "category", "serial_number", "quantity", "condition", "is_active")
-    list_filter = ("condition", "department", "category", "is_active")
+    list_select_related = ("department", "category")
+    list_filter = (
+        ("condition", ChoicesFacetListFilter),
+        ("department", RelatedFacetListFilter),
+        ("category", RelatedFacetListFilter),
+        ActiveListFilter,
+    )
     search_fields = ("name", "serial_number")
+    export_fields = (
+        "id", "name", "department__code", "department__name", "category__name",
+        "serial_number", "quantity", "condition", "is_active", "created_at",
+    )
     ordering = ("name",)
     readonly_fields = ("id", "created_at", "updated_at")
 
 
 @admin.register(Attachment)
-class AttachmentAdmin(admin.ModelAdmin):
+class AttachmentAdmin(KeysetPaginationMixin, admin.ModelAdmin):
     list_display = ("asset", "title", "uploaded_by", "created_at")
+    list_select_related = ("asset", "uploaded_by")
     search_fields = ("title", "asset__name", "uploaded_by__username", "uploaded_by__email")
-    list_filter = ("created_at",)
+    autocomplete_fields = ("asset", "uploaded_by")
+    list_filter = ("created_at", ActiveListFilter)
     ordering = ("-created_at",)
-    readonly_fields = ("id", "created_at", "updated_at")
+    readonly_fields = ("id", "original_name", "created_at", "updated_at")
 
 
 @admin.register(AssetAssignment)
 class AssetAssignmentAdmin(admin.ModelAdmin):
     list_display = ("asset", "assigned_to", "start_date", "end_date", "is_active", "created_at")
-    list_filter = ("start_date", "end_date", "is_active")
+    list_select_related = ("asset", "assigned_to")
+    list_filter = ("start_date", "end_date", ActiveListFilter)
     search_fields = ("asset__name", "assigned_to__username", "assigned_to__email")
+    autocomplete_fields = ("asset", "assigned_to", "assigned_by")
     ordering = ("-start_date",)
     readonly_fields = ("id", "created_at", "updated_at")
@@ -7,3 +7,6 @@ class App2Config(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "APP2"
     verbose_name = _("التطبيق الثاني")
+
+    def ready(self):
+        from . import search  # noqa: F401  (تسجيل فهرس البحث وإشاراته)
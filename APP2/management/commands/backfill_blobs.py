@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from APP2 import storage
+
+
+class Command(BaseCommand):
+    help = (
+        "نقل المرفقات ذات الأسماء القديمة (uploads/attachments/…) إلى مخزن المحتوى: خلاصة كل ملف "
+        "وصف Blob له وعدد مراجعه، فيشملها gc_blobs --recount و--verify."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="الافتراضي: BLOB_STORAGE['BATCH_SIZE']")
+        parser.add_argument("--remove-legacy", action="store_true", help="حذف الملف القديم بعد نقله")
+
+    def handle(self, *args, **options):
+        moved, missing = storage.backfill(batch_size=options["batch_size"], remove=options["remove_legacy"])
+        self.stdout.write(f"{moved} attachments moved to the blob store")
+        if missing:
+            self.stderr.write(f"{missing} attachments skipped: legacy file not found")
+        self.stdout.write(f"refcount corrected for {storage.recount()} blobs")
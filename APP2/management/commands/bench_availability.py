@@ -0,0 +1,83 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from APP2.models import Asset, AssetAssignment
+from config.dbstats import temporary_sqlite_database
+
+
+class Command(BaseCommand):
+    help = "قياس أداء استعلامات التوفر والتقاطع لتسليمات الأصول (افتراضيًا 10k أصل × 50 تسليم)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--assets", type=int, default=10_000)
+        parser.add_argument("--assignments", type=int, default=50, help="عدد التسليمات لكل أصل")
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        with temporary_sqlite_database("bench_availability") as alias:
+            rng = random.Random(options["seed"])
+            self.populate(alias, rng, options)
+            self.measure(alias, rng, options)
+
+    def populate(self, alias, rng, options):
+        started = time.perf_counter()
+        User = get_user_model()
+        users = [User(username=f"user{i}") for i in range(200)]
+        User.objects.using(alias).bulk_create(users)
+        assets = [Asset(name=f"أصل {i}", quantity=1 if i % 10 else 3) for i in range(options["assets"])]
+        Asset.objects.using(alias).bulk_create(assets, batch_size=2000)
+
+        origin = date(2020, 1, 1)
+        batch = []
+        for asset in assets:
+            day = origin
+            for n in range(options["assignments"]):
+                day += timedelta(days=rng.randint(1, 20))
+                length = rng.randint(1, 30)
+                last = n == options["assignments"] - 1
+                batch.append(AssetAssignment(
+                    asset=asset,
+                    assigned_to=rng.choice(users),
+                    start_date=day,
+                    end_date=None if last and rng.random() < 0.3 else day + timedelta(days=length),
+                ))
+                day += timedelta(days=length + 1)
+            if len(batch) >= 10_000:
+                AssetAssignment.objects.using(alias).bulk_create(batch)
+                batch = []
+        AssetAssignment.objects.using(alias).bulk_create(batch)
+        self.assets = assets
+        total = AssetAssignment.objects.using(alias).count()
+        self.stdout.write(f"populated {len(assets)} assets / {total} assignments in {time.perf_counter() - started:.1f}s")
+
+    def timed(self, label, func, repeat):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        p95 = samples[int(len(samples) * 0.95) - 1] if len(samples) > 1 else samples[0]
+        self.stdout.write(f"{label:<32} median={statistics.median(samples):8.2f} ms  p95={p95:8.2f} ms")
+
+    def measure(self, alias, rng, options):
+        assignments = AssetAssignment.objects.using(alias)
+        assets = Asset.objects.using(alias)
+        repeat = options["queries"]
+
+        def random_range():
+            start = date(2020, 1, 1) + timedelta(days=rng.randint(0, 3000))
+            return start, start + timedelta(days=rng.randint(1, 60))
+
+        self.timed("assignments_overlapping", lambda: list(
+            assignments.assignments_overlapping(rng.choice(self.assets).pk, *random_range())), repeat)
+        self.timed("holders_on", lambda: list(
+            assignments.holders_on(rng.choice(self.assets).pk, random_range()[0])), repeat)
+        self.timed("free_between (count)", lambda: assets.free_between(*random_range()).count(), max(repeat // 20, 3))
+        self.timed("free_between (first 100)", lambda: list(assets.free_between(*random_range())[:100]), repeat)
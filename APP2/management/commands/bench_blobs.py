@@ -0,0 +1,76 @@
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from django.core.files import File
+from django.core.management.base import BaseCommand
+
+from APP2.storage import ContentAddressedStorage, dedupe_stats
+from config.dbstats import temporary_sqlite_database
+
+
+class Command(BaseCommand):
+    help = "قياس سرعة الرفع إلى مخزن المحتوى ونسبة إزالة التكرار لملفات كبيرة (افتراضيًا 8 ملفات × 64 MiB × 3 نسخ)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--files", type=int, default=8, help="عدد الملفات المختلفة")
+        parser.add_argument("--size-mb", type=int, default=64)
+        parser.add_argument("--copies", type=int, default=3, help="مرات رفع كل ملف (لأصول مختلفة)")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        directory = tempfile.mkdtemp(prefix="bench-blobs-")
+        try:
+            with temporary_sqlite_database("bench_blobs") as alias:
+                sources = self.make_sources(directory, options)
+                storage = ContentAddressedStorage(location=os.path.join(directory, "media"), using=alias)
+                self.measure(storage, sources, options)
+                stats = dedupe_stats(alias)
+                self.stdout.write(
+                    f"{stats['blobs']} blobs stored: {stats['stored'] / 2**20:.0f} MiB on disk"
+                )
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def make_sources(self, directory, options):
+        rng = random.Random(options["seed"])
+        sources = []
+        for i in range(options["files"]):
+            path = os.path.join(directory, f"source-{i}.bin")
+            with open(path, "wb") as fh:
+                for _ in range(options["size_mb"]):
+                    fh.write(rng.randbytes(2**20))
+            sources.append(path)
+        return sources
+
+    def measure(self, storage, sources, options):
+        size = options["size_mb"] * 2**20
+        tracemalloc.start()
+        for copy in range(options["copies"]):
+            started = time.perf_counter()
+            for path in sources:
+                with open(path, "rb") as fh:
+                    storage.save(os.path.basename(path), File(fh))
+            elapsed = time.perf_counter() - started
+            label = "first upload" if copy == 0 else f"duplicate #{copy}"
+            self.stdout.write(
+                f"{label:<14} {len(sources)} × {options['size_mb']} MiB: "
+                f"{len(sources) * size / 2**20 / elapsed:8.1f} MiB/s"
+            )
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        logical = len(sources) * size * options["copies"]
+        stored = sum(os.path.getsize(storage.path(name)) for name in self.stored_names(storage))
+        self.stdout.write(
+            f"logical {logical / 2**20:.0f} MiB, stored {stored / 2**20:.0f} MiB, "
+            f"dedupe ratio {logical / stored:.2f}; peak Python memory {peak / 2**20:.1f} MiB"
+        )
+
+    def stored_names(self, storage):
+        for root, _, files in os.walk(storage.path("")):
+            for name in files:
+                if not name.startswith("."):
+                    yield os.path.relpath(os.path.join(root, name), storage.path(""))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from APP2 import uploads
+
+
+class Command(BaseCommand):
+    help = (
+        "حذف جلسات الرفع على قطع التي لم تتقدم منذ UPLOADS['EXPIRE'] ثانية (المتروكة والمكتملة) "
+        "مع ملفاتها الجزئية، والملفات الجزئية التي لا جلسة لها."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-hours", type=float, help="بدل UPLOADS['EXPIRE']")
+        parser.add_argument("--dry-run", action="store_true", help="عدّ الجلسات المؤهلة دون حذفها")
+
+    def handle(self, *args, **options):
+        hours = options["older_than_hours"]
+        sessions, size = uploads.cleanup(
+            older_than=None if hours is None else hours * 3600,
+            dry_run=options["dry_run"],
+        )
+        verb = "eligible" if options["dry_run"] else "removed"
+        self.stdout.write(f"{sessions} upload sessions {verb}, {size / 2**20:.1f} MiB of partial files")
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from APP2 import storage
+
+
+class Command(BaseCommand):
+    help = (
+        "حذف ملفات المرفقات التي لم يعد يشير إليها أي مرفق منذ أكثر من BLOB_STORAGE['GRACE'] ثانية، "
+        "على دفعات قصيرة، مع خيارات لإعادة حساب المراجع والتحقق من سلامة الملفات."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="الافتراضي: BLOB_STORAGE['BATCH_SIZE']")
+        parser.add_argument("--grace", type=int, help="ثوانٍ بلا مراجع قبل الحذف؛ الافتراضي: BLOB_STORAGE['GRACE']")
+        parser.add_argument("--pause", type=float, default=0.0, help="ثوانٍ بين الدفعات")
+        parser.add_argument("--recount", action="store_true", help="إعادة حساب refcount من المرفقات قبل الجمع")
+        parser.add_argument("--verify", action="store_true", help="قراءة كل ملف ومطابقة خلاصته (بطيء)")
+        parser.add_argument("--dry-run", action="store_true", help="عدّ الملفات المؤهلة دون حذفها")
+
+    def handle(self, *args, **options):
+        if options["recount"] and not options["dry_run"]:
+            self.stdout.write(f"refcount corrected for {storage.recount()} blobs")
+        files, size = storage.collect_garbage(
+            batch_size=options["batch_size"],
+            grace=options["grace"],
+            dry_run=options["dry_run"],
+            pause=options["pause"],
+        )
+        verb = "eligible" if options["dry_run"] else "removed"
+        self.stdout.write(f"{files} blobs {verb} ({size / 2**20:.1f} MiB)")
+
+        stats = storage.dedupe_stats()
+        self.stdout.write(
+            f"{stats['blobs']} blobs, {stats['references']} references; "
+            f"{stats['logical'] / 2**20:.1f} MiB logical, {stats['stored'] / 2**20:.1f} MiB stored "
+            f"(dedupe ratio {stats['ratio']:.2f})"
+        )
+
+        if options["verify"]:
+            problems = 0
+            for name, problem in storage.verify_all():
+                problems += 1
+                self.stderr.write(f"{name}: {problem}")
+            if problems:
+                raise CommandError(f"{problems} blobs failed verification")
+            self.stdout.write(self.style.SUCCESS("all blobs verified"))
@@ -0,0 +1,126 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:21
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Asset',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='المعرف')),
+                ('is_active', models.BooleanField(db_index=True, default=True, verbose_name='نشط')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='تاريخ الإنشاء')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+                ('name', models.CharField(db_index=True, max_length=200, verbose_name='اسم الأصل/المورد')),
+                ('serial_number', models.CharField(blank=True, db_index=True, max_length=100, verbose_name='الرقم التسلسلي')),
+                ('quantity', models.PositiveIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)], verbose_name='الكمية')),
+                ('condition', models.CharField(choices=[('new', 'جديد'), ('good', 'جيد'), ('fair', 'مقبول'), ('poor', 'سيء')], default='good', max_length=10, verbose_name='الحالة')),
+                ('notes', models.TextField(blank=True, verbose_name='ملاحظات')),
+            ],
+            options={
+                'verbose_name': 'أصل/مورد',
+                'verbose_name_plural': 'الأصول/الموارد',
+                'ordering': ('-created_at',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Department',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='المعرف')),
+                ('is_active', models.BooleanField(db_index=True, default=True, verbose_name='نشط')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='تاريخ الإنشاء')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+                ('name', models.CharField(max_length=150, unique=True, verbose_name='اسم الإدارة/القسم')),
+                ('code', models.CharField(db_index=True, max_length=50, unique=True, verbose_name='الرمز')),
+                ('description', models.TextField(blank=True, verbose_name='الوصف')),
+            ],
+            options={
+                'verbose_name': 'إدارة/قسم',
+                'verbose_name_plural': 'الإدارات/الأقسام',
+                'ordering': ('-created_at',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Attachment',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='المعرف')),
+                ('is_active', models.BooleanField(db_index=True, default=True, verbose_name='نشط')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='تاريخ الإنشاء')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+                ('title', models.CharField(blank=True, max_length=200, verbose_name='العنوان')),
+                ('file', models.FileField(upload_to='uploads/attachments/%Y/%m/', verbose_name='الملف')),
+                ('asset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attachments', to='APP2.asset', verbose_name='الأصل/المورد')),
+                ('uploaded_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='uploaded_attachments', to=settings.AUTH_USER_MODEL, verbose_name='تم الرفع بواسطة')),
+            ],
+            options={
+                'verbose_name': 'مرفق',
+                'verbose_name_plural': 'المرفقات',
+                'ordering': ('-created_at',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='المعرف')),
+                ('is_active', models.BooleanField(db_index=True, default=True, verbose_name='نشط')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='تاريخ الإنشاء')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+                ('name', models.CharField(db_index=True, max_length=150, verbose_name='اسم التصنيف')),
+                ('parent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='children', to='APP2.category', verbose_name='التصنيف الأب')),
+            ],
+            options={
+                'verbose_name': 'تصنيف',
+                'verbose_name_plural': 'التصنيفات',
+                'ordering': ('-created_at',),
+                'abstract': False,
+                'unique_together': {('name', 'parent')},
+            },
+        ),
+        migrations.AddField(
+            model_name='asset',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assets', to='APP2.category', verbose_name='التصنيف'),
+        ),
+        migrations.AddField(
+            model_name='asset',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assets', to='APP2.department', verbose_name='الإدارة/القسم'),
+        ),
+        migrations.CreateModel(
+            name='AssetAssignment',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='المعرف')),
+                ('is_active', models.BooleanField(db_index=True, default=True, verbose_name='نشط')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='تاريخ الإنشاء')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+                ('start_date', models.DateField(verbose_name='تاريخ البداية')),
+                ('end_date', models.DateField(blank=True, null=True, verbose_name='تاريخ النهاية')),
+                ('note', models.TextField(blank=True, verbose_name='ملاحظة')),
+                ('asset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='APP2.asset', verbose_name='الأصل/المورد')),
+                ('assigned_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='asset_assignments_created', to=settings.AUTH_USER_MODEL, verbose_name='تم التسليم بواسطة')),
+                ('assigned_to', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='asset_assignments', to=settings.AUTH_USER_MODEL, verbose_name='مُسلّم إلى')),
+            ],
+            options={
+                'verbose_name': 'تسليم أصل/مورد',
+                'verbose_name_plural': 'تسليمات الأصول/الموارد',
+                'ordering': ('-created_at',),
+                'abstract': False,
+                'indexes': [models.Index(fields=['asset', 'assigned_to'], name='APP2_asseta_asset_i_ba08dc_idx'), models.Index(fields=['start_date', 'end_date'], name='APP2_asseta_start_d_543e49_idx')],
+            },
+        ),
+    ]
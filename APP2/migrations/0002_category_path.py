@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:24
+
+from django.db import migrations, models
+
+
+def build_category_paths(apps, schema_editor):
+    Category = apps.get_model("APP2", "Category")
+    manager = Category.objects.db_manager(schema_editor.connection.alias)
+    level = list(manager.filter(parent__isnull=True).only("id", "parent_id"))
+    paths = {}
+    depth = 0
+    while level:
+        for node in level:
+            node.path = f"{paths.get(node.parent_id, '')}{node.pk.hex}/"
+            node.depth = depth
+            paths[node.pk] = node.path
+        manager.bulk_update(level, ["path", "depth"], batch_size=500)
+        level = list(manager.filter(parent_id__in=[n.pk for n in level]).only("id", "parent_id"))
+        depth += 1
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP2', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='العمق'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=1024, verbose_name='المسار'),
+        ),
+        migrations.RunPython(build_category_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:27
+
+import config.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP2', '0002_category_path'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='asset',
+            name='id',
+            field=models.UUIDField(default=config.ids.default_pk, editable=False, primary_key=True, serialize=False, verbose_name='المعرف'),
+        ),
+        migrations.AlterField(
+            model_name='assetassignment',
+            name='id',
+            field=models.UUIDField(default=config.ids.default_pk, editable=False, primary_key=True, serialize=False, verbose_name='المعرف'),
+        ),
+        migrations.AlterField(
+            model_name='attachment',
+            name='id',
+            field=models.UUIDField(default=config.ids.default_pk, editable=False, primary_key=True, serialize=False, verbose_name='المعرف'),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='id',
+            field=models.UUIDField(default=config.ids.default_pk, editable=False, primary_key=True, serialize=False, verbose_name='المعرف'),
+        ),
+        migrations.AlterField(
+            model_name='department',
+            name='id',
+            field=models.UUIDField(default=config.ids.default_pk, editable=False, primary_key=True, serialize=False, verbose_name='المعرف'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+TABLE = "APP2_search"
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 متاح في SQLite فقط؛ بقية المحركات تعود إلى بحث الإدارة الافتراضي
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        f'CREATE TABLE "{TABLE}_doc" ("rowid" INTEGER PRIMARY KEY, "model" varchar(100) NOT NULL, '
+        f'"object_id" varchar(64) NOT NULL, UNIQUE ("model", "object_id"))'
+    )
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE "{TABLE}" USING fts5(title, body, prefix = \'2 3\', '
+        f'tokenize = \'unicode61 remove_diacritics 2\')'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(f'DROP TABLE IF EXISTS "{TABLE}"')
+    schema_editor.execute(f'DROP TABLE IF EXISTS "{TABLE}_doc"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP2', '0003_time_ordered_pk'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP2', '0004_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assetassignment',
+            index=models.Index(fields=['asset', 'start_date', 'end_date'], name='APP2_asseta_asset_i_c8f4fc_idx'),
+        ),
+    ]
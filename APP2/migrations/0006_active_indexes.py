@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:30
+
+import config.active
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP2', '0005_assignment_availability_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='assetassignment',
+            name='APP2_asseta_asset_i_c8f4fc_idx',
+        ),
+        config.active.AlterFieldIndex(
+            model_name='asset',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='نشط'),
+        ),
+        config.active.AlterFieldIndex(
+            model_name='assetassignment',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='نشط'),
+        ),
+        config.active.AlterFieldIndex(
+            model_name='attachment',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='نشط'),
+        ),
+        config.active.AlterFieldIndex(
+            model_name='category',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='نشط'),
+        ),
+        config.active.AlterFieldIndex(
+            model_name='department',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='نشط'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='app2_asset_active'),
+        ),
+        migrations.AddIndex(
+            model_name='assetassignment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='app2_assetassignment_active'),
+        ),
+        migrations.AddIndex(
+            model_name='assetassignment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['asset', 'start_date', 'end_date'], name='app2_assignment_active_period'),
+        ),
+        migrations.AddIndex(
+            model_name='attachment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='app2_attachment_active'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='app2_category_active'),
+        ),
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='app2_department_active'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:48
+
+import APP2.storage
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP2', '0007_facet_indexes'),
+    ]
+
+    operations = [
+        # في SQLite يعيد AddField وAlterField بناء الجدول كاملًا؛ هنا عمود بقيمة افتراضية في قاعدة
+        # البيانات، وتغيير storage/upload_to لا يمس قاعدة البيانات أصلًا
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name='attachment',
+                    name='original_name',
+                    field=models.CharField(blank=True, max_length=255, verbose_name='اسم الملف الأصلي'),
+                ),
+                migrations.AlterField(
+                    model_name='attachment',
+                    name='file',
+                    field=models.FileField(storage=APP2.storage.get_blob_storage, upload_to='', verbose_name='الملف'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    'ALTER TABLE "APP2_attachment" ADD COLUMN "original_name" varchar(255) DEFAULT \'\' NOT NULL',
+                    'ALTER TABLE "APP2_attachment" DROP COLUMN "original_name"',
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='خلاصة SHA-256')),
+                ('size', models.BigIntegerField(verbose_name='الحجم بالبايت')),
+                ('refcount', models.PositiveIntegerField(default=0, verbose_name='عدد المراجع')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الإنشاء')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='تاريخ التحديث')),
+            ],
+            options={
+                'verbose_name': 'ملف مخزن',
+                'verbose_name_plural': 'الملفات المخزنة',
+                'indexes': [models.Index(condition=models.Q(('refcount', 0)), fields=['updated_at'], name='app2_blob_orphans')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:54
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP2', '0008_content_addressed_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='المعرف')),
+                ('filename', models.CharField(max_length=255, verbose_name='اسم الملف')),
+                ('title', models.CharField(blank=True, max_length=200, verbose_name='العنوان')),
+                ('size', models.BigIntegerField(verbose_name='الحجم بالبايت')),
+                ('sha256', models.CharField(blank=True, max_length=64, verbose_name='خلاصة SHA-256 المتوقعة')),
+                ('received', models.BigIntegerField(default=0, verbose_name='المستلم بالبايت')),
+                ('status', models.CharField(choices=[('open', 'قيد الرفع'), ('complete', 'مكتمل')], default='open', max_length=10, verbose_name='الحالة')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الإنشاء')),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True, verbose_name='تاريخ التحديث')),
+                ('asset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='APP2.asset', verbose_name='الأصل/المورد')),
+                ('attachment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='APP2.attachment', verbose_name='المرفق')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL, verbose_name='المستخدم')),
+            ],
+            options={
+                'verbose_name': 'جلسة رفع',
+                'verbose_name_plural': 'جلسات الرفع',
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:28
+
+import config.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP2', '0009_upload_session'),
+    ]
+
+    operations = [
+        # القيمة الافتراضية تُحسب في Python ولا تمس قاعدة البيانات؛ AlterField وحده يعيد بناء الجدول في SQLite
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='uploadsession',
+                    name='id',
+                    field=models.UUIDField(default=config.ids.default_pk, editable=False, primary_key=True, serialize=False, verbose_name='المعرف'),
+                ),
+            ],
+        ),
+    ]
@@ -1,20 +1,38 @@
+import os
 import uuid
 
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, StrIndex, Substr
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from config.active import ActiveManager, active_index
+from config.db.transactions import atomic_immediate
+from config.ids import default_pk
+
+from .storage import blob_name, digest_of, get_blob_storage
+
 
 class TimeStampedModel(models.Model):
-    id = models.UUIDField(_("المعرف"), primary_key=True, default=uuid.uuid4, editable=False)
-    is_active = models.BooleanField(_("نشط"), default=True, db_index=True)
+    id = models.UUIDField(_("المعرف"), primary_key=True, default=default_pk, editable=False)
+    # بلا فهرس منفرد: الاستعلامات على النشط تستخدم الفهارس الجزئية (config.active)
+    is_active = models.BooleanField(_("نشط"), default=True)
     created_at = models.DateTimeField(_("تاريخ الإنشاء"), auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(_("تاريخ التحديث"), auto_now=True)
 
+    objects = models.Manager()
+    active = ActiveManager()
+
     class Meta:
         abstract = True
         ordering = ("-created_at",)
+        indexes = [active_index("created_at", name="%(app_label)s_%(class)s_active")]
 
 
 class Department(TimeStampedModel):
@@ -30,6 +48,46 @@ class Department(TimeStampedModel):
         return self.name
 
 
+PATH_SEGMENT_LENGTH = 33  # 32 خانة hex للمعرف + "/"
+
+
+def _path_upper_bound(path: str) -> str:
+    # "0" هو الحرف التالي مباشرة لـ "/" ، لذا [path, bound) يغطي كل ما يبدأ بـ path
+    return path[:-1] + "0"
+
+
+class CategoryQuerySet(models.QuerySet):
+    def subtree(self, path: str, include_root=True):
+        qs = self.filter(path__gte=path, path__lt=_path_upper_bound(path))
+        return qs if include_root else qs.exclude(path=path)
+
+    def descendants(self, category, include_self=False):
+        return self.subtree(category.path, include_root=include_self)
+
+    def ancestors(self, category, include_self=False):
+        ids = category.ancestor_ids()
+        if include_self:
+            ids.append(category.pk)
+        return self.filter(pk__in=ids).order_by("depth")
+
+    def rebuild_paths(self) -> int:
+        """يعيد بناء path/depth للشجرة كاملة مستوى بمستوى (للإصلاح أو بعد bulk_create)."""
+        updated = 0
+        level = list(self.model.objects.filter(parent__isnull=True).only("id", "parent_id"))
+        depth = 0
+        paths = {}
+        while level:
+            for node in level:
+                node.path = f"{paths.get(node.parent_id, '')}{node.pk.hex}/"
+                node.depth = depth
+                paths[node.pk] = node.path
+            self.model.objects.bulk_update(level, ["path", "depth"], batch_size=500)
+            updated += len(level)
+            level = list(self.model.objects.filter(parent_id__in=[n.pk for n in level]).only("id", "parent_id"))
+            depth += 1
+        return updated
+
+
 class Category(TimeStampedModel):
     name = models.CharField(_("اسم التصنيف"), max_length=150, db_index=True)
     parent = models.ForeignKey(
@@ -40,6 +98,11 @@ class Category(TimeStampedModel):
         related_name="children",
         verbose_name=_("التصنيف الأب"),
     )
+    # المسار المُجسَّد: معرفات الأسلاف بصيغة hex مفصولة بـ "/" ، ينتهي بمعرف التصنيف نفسه
+    path = models.CharField(_("المسار"), max_length=1024, editable=False, default="", db_index=True)
+    depth = models.PositiveSmallIntegerField(_("العمق"), editable=False, default=0)
+
+    objects = CategoryQuerySet.as_manager()
 
     class Meta(TimeStampedModel.Meta):
         verbose_name = _("تصنيف")
@@ -49,6 +112,87 @@ class Category(TimeStampedModel):
     def __str__(self) -> str:
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_parent_id = instance.__dict__.get("parent_id")
+        return instance
+
+    def ancestor_ids(self) -> list:
+        return [uuid.UUID(segment) for segment in self.path.split("/")[:-2]]
+
+    def get_descendants(self, include_self=False):
+        return Category.objects.descendants(self, include_self=include_self)
+
+    def get_ancestors(self, include_self=False):
+        return Category.objects.ancestors(self, include_self=include_self)
+
+    def clean(self):
+        super().clean()
+        self._check_parent()
+
+    def _check_parent(self):
+        if self.parent_id and self.path and self.parent.path.startswith(self.path):
+            raise ValidationError({"parent": _("لا يمكن نقل التصنيف تحت نفسه أو تحت أحد فروعه.")})
+
+    def _build_path(self):
+        if self.parent_id is None:
+            return f"{self.pk.hex}/", 0
+        self._check_parent()
+        return f"{self.parent.path}{self.pk.hex}/", self.parent.depth + 1
+
+    def save(self, *args, **kwargs):
+        moved = self._state.adding or self.parent_id != getattr(self, "_loaded_parent_id", self.parent_id)
+        if not moved and self.path:
+            return super().save(*args, **kwargs)
+
+        old_path, old_depth = self.path, self.depth
+        self.path, self.depth = self._build_path()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "path", "depth"}
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+            if old_path and old_path != self.path:
+                # نقل الشجرة الفرعية كاملة بتحديث واحد بدل حفظ كل عقدة
+                Category.objects.subtree(old_path, include_root=False).update(
+                    path=Concat(Value(self.path), Substr("path", len(old_path) + 1)),
+                    depth=F("depth") + (self.depth - old_depth),
+                )
+        self._loaded_parent_id = self.parent_id
+
+
+@receiver(post_delete, sender=Category)
+def _detach_category_subtree(sender, instance, **kwargs):
+    # SET_NULL جعل الأبناء المباشرين جذورًا؛ نزيل بادئة التصنيف المحذوف من مسارات فروعه.
+    # البحث بالمقطع (لا بالمسار المخزّن) يبقى صحيحًا عند حذف عدة مستويات في عملية واحدة.
+    segment = f"{instance.pk.hex}/"
+    position = StrIndex("path", Value(segment))
+    Category.objects.filter(path__contains=segment).update(
+        path=Substr("path", position + len(segment)),
+        depth=F("depth") - (position - 1) / PATH_SEGMENT_LENGTH - 1,
+    )
+
+
+class AssetQuerySet(models.QuerySet):
+    def in_category_subtree(self, category):
+        """الأصول في التصنيف وكل فروعه، باستعلام واحد على فهرس المسار."""
+        return self.filter(
+            category__path__gte=category.path,
+            category__path__lt=_path_upper_bound(category.path),
+        )
+
+    def free_between(self, start, end=None):
+        """
+        الأصول المتاحة طوال الفترة [start, end] (end=None: مفتوحة).
+        الكمية 1: لا يوجد أي تسليم متقاطع (NOT EXISTS على فهرس asset/start_date).
+        الكمية > 1: عدد التسليمات المتقاطعة أقل من الكمية.
+        """
+        overlapping = AssetAssignment.objects.filter(asset=OuterRef("pk")).overlapping(start, end)
+        busy_count = overlapping.order_by().values("asset").annotate(n=Count("pk")).values("n")
+        return self.alias(_busy=Coalesce(Subquery(busy_count), 0)).filter(
+            ~Exists(overlapping) | Q(quantity__gt=1, _busy__lt=F("quantity"))
+        )
+
 
 class Asset(TimeStampedModel):
     class Condition(models.TextChoices):
@@ -80,14 +224,62 @@ class Asset(TimeStampedModel):
     condition = models.CharField(_("الحالة"), max_length=10, choices=Condition.choices, default=Condition.GOOD)
     notes = models.TextField(_("ملاحظات"), blank=True)
 
+    objects = AssetQuerySet.as_manager()
+
     class Meta(TimeStampedModel.Meta):
         verbose_name = _("أصل/مورد")
         verbose_name_plural = _("الأصول/الموارد")
+        indexes = [
+            *TimeStampedModel.Meta.indexes,
+            # أعداد فلاتر القسم والتصنيف في لوحة الإدارة (config.facets): GROUP BY من الفهرس وحده
+            active_index("department", name="app2_asset_active_department"),
+            active_index("category", name="app2_asset_active_category"),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
 
+class BlobQuerySet(models.QuerySet):
+    def acquire(self, name):
+        if digest := digest_of(name):
+            self.filter(digest=digest).update(refcount=F("refcount") + 1, updated_at=timezone.now())
+
+    def release(self, name):
+        if digest := digest_of(name):
+            self.filter(digest=digest, refcount__gt=0).update(refcount=F("refcount") - 1, updated_at=timezone.now())
+
+    def orphans(self, older_than):
+        return self.filter(refcount=0, updated_at__lt=older_than)
+
+
+class Blob(models.Model):
+    """ملف في مخزن المحتوى (APP2.storage) وعدد المرفقات التي تشير إليه."""
+
+    digest = models.CharField(_("خلاصة SHA-256"), max_length=64, primary_key=True)
+    size = models.BigIntegerField(_("الحجم بالبايت"))
+    refcount = models.PositiveIntegerField(_("عدد المراجع"), default=0)
+    created_at = models.DateTimeField(_("تاريخ الإنشاء"), auto_now_add=True)
+    updated_at = models.DateTimeField(_("تاريخ التحديث"), default=timezone.now)
+
+    objects = BlobQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("ملف مخزن")
+        verbose_name_plural = _("الملفات المخزنة")
+        indexes = [
+            # gc_blobs: الملفات بلا مراجع الأقدم من مهلة السماح
+            models.Index(fields=["updated_at"], condition=Q(refcount=0), name="app2_blob_orphans"),
+        ]
+
+    def __str__(self) -> str:
+        return self.digest
+
+    @property
+    def name(self) -> str:
+        return blob_name(self.digest)
+
+
 class Attachment(TimeStampedModel):
     asset = models.ForeignKey(
         Asset,
@@ -96,7 +288,9 @@ class Attachment(TimeStampedModel):
         verbose_name=_("الأصل/المورد"),
     )
     title = models.CharField(_("العنوان"), max_length=200, blank=True)
-    file = models.FileField(_("الملف"), upload_to="uploads/attachments/%Y/%m/")
+    # الاسم المخزّن خلاصة المحتوى (APP2.storage)؛ الاسم الأصلي في original_name
+    file = models.FileField(_("الملف"), storage=get_blob_storage)
+    original_name = models.CharField(_("اسم الملف الأصلي"), max_length=255, blank=True)
     uploaded_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True,
@@ -113,6 +307,87 @@ class Attachment(TimeStampedModel):
     def __str__(self) -> str:
         return self.title or f"مرفق {self.id}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_file = instance.__dict__.get("file")
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.file and not self.file._committed and not self.original_name:
+            self.original_name = os.path.basename(self.file.name)[:255]
+        update_fields = kwargs.get("update_fields")
+        loaded = getattr(self, "_loaded_file", None)
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+            if (update_fields is None or "file" in update_fields) and self.file.name != loaded:
+                Blob.objects.acquire(self.file.name)
+                Blob.objects.release(loaded)
+                self._loaded_file = self.file.name
+
+
+class UploadSession(models.Model):
+    """رفع مرفق على قطع (APP2.uploads): ما استُلم حتى الآن، والمرفق الناتج بعد الإكمال."""
+
+    class Status(models.TextChoices):
+        OPEN = "open", _("قيد الرفع")
+        COMPLETE = "complete", _("مكتمل")
+
+    id = models.UUIDField(_("المعرف"), primary_key=True, default=default_pk, editable=False)
+    asset = models.ForeignKey(
+        Asset, on_delete=models.CASCADE, related_name="upload_sessions", verbose_name=_("الأصل/المورد")
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="upload_sessions",
+        verbose_name=_("المستخدم"),
+    )
+    filename = models.CharField(_("اسم الملف"), max_length=255)
+    title = models.CharField(_("العنوان"), max_length=200, blank=True)
+    size = models.BigIntegerField(_("الحجم بالبايت"))
+    sha256 = models.CharField(_("خلاصة SHA-256 المتوقعة"), max_length=64, blank=True)
+    received = models.BigIntegerField(_("المستلم بالبايت"), default=0)
+    status = models.CharField(_("الحالة"), max_length=10, choices=Status.choices, default=Status.OPEN)
+    attachment = models.ForeignKey(
+        Attachment, null=True, blank=True, on_delete=models.SET_NULL, related_name="+", verbose_name=_("المرفق")
+    )
+    created_at = models.DateTimeField(_("تاريخ الإنشاء"), auto_now_add=True)
+    # cleanup_uploads يحذف الجلسات التي لم تتقدم منذ UPLOADS["EXPIRE"]
+    updated_at = models.DateTimeField(_("تاريخ التحديث"), auto_now=True, db_index=True)
+
+    class Meta:
+        verbose_name = _("جلسة رفع")
+        verbose_name_plural = _("جلسات الرفع")
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+@receiver(post_delete, sender=Attachment)
+def _release_attachment_blob(sender, instance, **kwargs):
+    # الملف نفسه يحذفه gc_blobs بعد مهلة السماح إن لم يعد إليه مرفق آخر
+    Blob.objects.release(instance.file.name)
+
+
+class AssetAssignmentQuerySet(models.QuerySet):
+    def overlapping(self, start, end=None):
+        """التسليمات النشطة التي تتقاطع مع [start, end]؛ end_date الفارغ يعني تسليمًا مفتوحًا."""
+        qs = self.filter(is_active=True).filter(Q(end_date__isnull=True) | Q(end_date__gte=start))
+        if end is not None:
+            qs = qs.filter(start_date__lte=end)
+        return qs
+
+    def on_date(self, day):
+        return self.overlapping(day, day)
+
+    def assignments_overlapping(self, asset, start, end=None):
+        return self.filter(asset=asset).overlapping(start, end)
+
+    def holders_on(self, asset, day):
+        """من يحمل الأصل في تاريخ معين."""
+        return self.filter(asset=asset).on_date(day).select_related("assigned_to")
+
 
 class AssetAssignment(TimeStampedModel):
     asset = models.ForeignKey(
@@ -139,13 +414,40 @@ class AssetAssignment(TimeStampedModel):
     end_date = models.DateField(_("تاريخ النهاية"), null=True, blank=True)
     note = models.TextField(_("ملاحظة"), blank=True)
 
+    objects = AssetAssignmentQuerySet.as_manager()
+
     class Meta(TimeStampedModel.Meta):
         verbose_name = _("تسليم أصل/مورد")
         verbose_name_plural = _("تسليمات الأصول/الموارد")
         indexes = [
+            *TimeStampedModel.Meta.indexes,
             models.Index(fields=["asset", "assigned_to"]),
             models.Index(fields=["start_date", "end_date"]),
+            # assignments_overlapping: التسليمات النشطة لأصل في فترة
+            active_index("asset", "start_date", "end_date", name="app2_assignment_active_period"),
         ]
 
     def __str__(self) -> str:
         return f"{self.asset} -> {self.assigned_to}"
+
+    def clean(self):
+        super().clean()
+        if self.end_date and self.start_date and self.end_date < self.start_date:
+            raise ValidationError({"end_date": _("تاريخ النهاية يجب أن يكون بعد تاريخ البداية.")})
+        if self.asset_id and self.start_date:
+            self._check_overlap()
+
+    def _check_overlap(self):
+        if not self.is_active or self.asset.quantity != 1:
+            return
+        conflicts = AssetAssignment.objects.assignments_overlapping(self.asset_id, self.start_date, self.end_date)
+        if conflicts.exclude(pk=self.pk).exists():
+            raise ValidationError(_("الأصل مُسلَّم لشخص آخر خلال هذه الفترة."), code="overlap")
+
+    def save(self, *args, **kwargs):
+        with atomic_immediate(using=kwargs.get("using")):
+            # قفل صف الأصل قبل الفحص: تحديث بلا أثر يأخذ قفل الكتابة (SQLite) أو قفل الصف
+            # (PostgreSQL)، فلا يمكن لطلبين متزامنين المرور من الفحص معًا لنفس الأصل.
+            Asset.objects.filter(pk=self.asset_id).update(quantity=F("quantity"))
+            self._check_overlap()
+            super().save(*args, **kwargs)
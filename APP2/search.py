@@ -0,0 +1,7 @@
+# app2/search.py
+from config.search import FullTextIndex
+
+from .models import Asset
+
+index = FullTextIndex("APP2_search")
+index.register(Asset, title=("name",), body=("notes",))
@@ -0,0 +1,332 @@
+# app2/storage.py
+"""
+تخزين المرفقات بالمحتوى (content-addressed): كل ملف يُحفظ مرة واحدة باسم خلاصة SHA-256
+لمحتواه (blobs/ab/cd/abcd…) مهما تكرر رفعه ولأي أصل.
+
+- الحفظ يقرأ الملف قطعة بعد قطعة (File.chunks) إلى ملف مؤقت بجوار الوجهة ويحسب الخلاصة أثناء
+  الكتابة، ثم os.replace إلى الاسم النهائي؛ الملف لا يُحمّل كاملًا في الذاكرة.
+- لكل ملف صف Blob فيه الحجم وعدد المراجع. Attachment.save والحذف يزيدان العدد وينقصانه،
+  والأمر gc_blobs يحذف على دفعات الملفات التي بقي عددها صفرًا أكثر من GRACE ثانية، والملفات
+  التي لا صف لها أصلًا (نُقلت في معاملة تراجعت بعد ذلك).
+- الخلاصة في الاسم تتيح التحقق من سلامة الملف: verify(name) أو gc_blobs --verify.
+
+الأسماء القديمة (uploads/attachments/…) حُفظت قبل ضبط MEDIA_ROOT نسبةً إلى مجلد العمل، فتُقرأ من
+BLOB_STORAGE["LEGACY_ROOT"] ولا تُعدّ مراجعها حتى ينقلها الأمر backfill_blobs إلى المخزن.
+"""
+import contextlib
+import hashlib
+import os
+import tempfile
+import time
+from collections import Counter
+from datetime import timedelta
+from itertools import islice
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import router, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+from django.utils._os import safe_join
+from django.utils.functional import cached_property
+
+from config.db.transactions import atomic_immediate
+
+DEFAULTS = {
+    "PREFIX": "blobs",
+    "GRACE": 3600,
+    "BATCH_SIZE": 500,
+    # مجلد الأسماء القديمة خارج PREFIX؛ None: MEDIA_ROOT نفسه
+    "LEGACY_ROOT": None,
+}
+
+DIGEST_LENGTH = 64
+TEMP_PREFIX = ".upload-"
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "BLOB_STORAGE", {})}
+
+
+def blob_name(digest) -> str:
+    return f"{get_config()['PREFIX']}/{digest[:2]}/{digest[2:4]}/{digest}"
+
+
+def is_legacy(name) -> bool:
+    """اسم من قبل مخزن المحتوى (خارج PREFIX)."""
+    prefix = get_config()["PREFIX"]
+    return bool(name) and name != prefix and not name.startswith(f"{prefix}/")
+
+
+def digest_of(name):
+    """خلاصة الملف من اسمه المخزّن، أو None للأسماء التي ليست في مخزن المحتوى."""
+    if not name or blob_name(os.path.basename(name)) != name:
+        return None
+    digest = os.path.basename(name)
+    return digest if len(digest) == DIGEST_LENGTH else None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage يتجاهل اسم الرفع ويحفظ المحتوى باسم خلاصته (مرة واحدة)."""
+
+    def __init__(self, location=None, base_url=None, using=None, **kwargs):
+        super().__init__(location, base_url, **kwargs)
+        self.using = using
+
+    @cached_property
+    def _blob_model(self):
+        return apps.get_model("APP2", "Blob")
+
+    def path(self, name):
+        legacy_root = get_config()["LEGACY_ROOT"]
+        if legacy_root and is_legacy(name):
+            return safe_join(os.fspath(legacy_root), name)
+        return super().path(name)
+
+    def get_available_name(self, name, max_length=None):
+        # الاسم النهائي من المحتوى في _save؛ لا حاجة للبحث عن اسم غير مستخدم
+        return name
+
+    def _save(self, name, content):
+        directory = self.path(get_config()["PREFIX"])
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    size += len(chunk)
+                    fh.write(chunk)
+            return self.adopt(temp_path, digest.hexdigest(), size)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def adopt(self, path, digest, size):
+        """
+        ينقل ملفًا محسوب الخلاصة (على نظام الملفات نفسه) إلى مكانه في المخزن ويسجّل Blob له،
+        أو يتركه إن كان المحتوى مخزنًا أصلًا. يعيد الاسم المخزّن.
+        إن تراجعت معاملة المستدعي بعد ذلك يبقى الملف بلا صف، ويحذفه gc_blobs بعد مهلة السماح.
+        """
+        # في المعاملة نفسها مع gc_blobs: إما أن يرى الحذف هذا التحديث فيترك الملف، أو يُعاد وضعه هنا
+        with transaction.atomic(using=self.using or router.db_for_write(self._blob_model)):
+            name = self.register(digest, size)
+            self.place(path, digest, keep=True)
+        return name
+
+    def register(self, digest, size):
+        """يسجّل Blob للخلاصة (أو يحدّث وقته) دون لمس الملفات؛ المعاملة على المستدعي."""
+        using = self.using or router.db_for_write(self._blob_model)
+        touched = self._blob_model.objects.using(using).filter(digest=digest).update(updated_at=timezone.now())
+        if not touched:
+            self._blob_model.objects.using(using).create(digest=digest, size=size)
+        return blob_name(digest)
+
+    def place(self, path, digest, keep=False):
+        """ينقل path إلى اسم الخلاصة إن لم يكن الملف موجودًا، وإلا يحذفه (أو يتركه مع keep)."""
+        target = self.path(blob_name(digest))
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(path, target)
+            if self.file_permissions_mode is not None:
+                os.chmod(target, self.file_permissions_mode)
+            return
+        # ملف بلا صف يُعاد استخدامه: وقت تعديل جديد يبعده عن الجمع حتى تلتزم المعاملة
+        os.utime(target)
+        if not keep and os.path.exists(path):
+            os.remove(path)
+
+    def verify(self, name, chunk_size=1024 * 1024) -> bool:
+        """هل يطابق محتوى الملف الخلاصة في اسمه؟"""
+        expected = digest_of(name)
+        if expected is None:
+            raise ValueError(f"Not a content-addressed name: {name!r}")
+        digest = hashlib.sha256()
+        with self.open(name, "rb") as fh:
+            while chunk := fh.read(chunk_size):
+                digest.update(chunk)
+        return digest.hexdigest() == expected
+
+
+blob_storage = ContentAddressedStorage()
+
+
+def get_blob_storage():
+    return blob_storage
+
+
+# ---------- جمع الملفات بلا مراجع ----------
+
+
+def collect_garbage(storage=None, batch_size=None, grace=None, dry_run=False, pause=0.0):
+    """
+    يحذف على دفعات صفوف Blob التي عدد مراجعها صفر منذ أكثر من grace ثانية، ثم ملفاتها، ثم ملفات
+    المخزن الأقدم من grace التي لا صف لها.
+    كل دفعة في معاملة: الحذف يعيد فحص الشرط، وadopt() الذي يعيد استخدام الملف ينتظر انتهاءها.
+    يعيد (عدد الملفات، البايتات المحررة).
+    """
+    config = get_config()
+    storage = storage or blob_storage
+    batch_size = batch_size or config["BATCH_SIZE"]
+    cutoff = timezone.now() - timedelta(seconds=config["GRACE"] if grace is None else grace)
+    Blob = apps.get_model("APP2", "Blob")
+    using = storage.using or router.db_for_write(Blob)
+    orphans = Blob.objects.using(using).orphans(cutoff)
+    if dry_run:
+        totals = orphans.aggregate(files=Count("digest"), size=Sum("size"))
+        files, size = _remove_unregistered(storage, cutoff, using, batch_size, dry_run=True)
+        return totals["files"] + files, (totals["size"] or 0) + size
+
+    removed = freed = 0
+    while True:
+        with atomic_immediate(using=using):
+            batch = dict(orphans.order_by("updated_at").values_list("digest", "size")[:batch_size])
+            if not batch:
+                break
+            orphans.filter(digest__in=batch).delete()
+            kept = set(Blob.objects.using(using).filter(digest__in=batch).values_list("digest", flat=True))
+            for digest, size in batch.items():
+                if digest not in kept:
+                    storage.delete(blob_name(digest))
+                    removed += 1
+                    freed += size
+        if pause:
+            time.sleep(pause)
+    files, size = _remove_unregistered(storage, cutoff, using, batch_size)
+    _remove_stale_uploads(storage, cutoff)
+    return removed + files, freed + size
+
+
+def _blob_files(storage, cutoff):
+    """(الخلاصة، (المسار، الحجم)) لكل ملف في المخزن لم يُعدَّل منذ cutoff."""
+    location = storage.path("")
+    limit = cutoff.timestamp()
+    for directory, _, filenames in os.walk(storage.path(get_config()["PREFIX"])):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            digest = digest_of(os.path.relpath(path, location).replace(os.sep, "/"))
+            if digest is None:
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime < limit:
+                yield digest, (path, stat.st_size)
+
+
+def _remove_unregistered(storage, cutoff, using, batch_size, dry_run=False):
+    """ملفات بلا صف Blob: نقلها adopt() في معاملة تراجعت. يعيد (عدد الملفات، البايتات)."""
+    Blob = apps.get_model("APP2", "Blob")
+    files = _blob_files(storage, cutoff)
+    removed = freed = 0
+    while batch := dict(islice(files, batch_size)):
+        # قفل الكتابة يجعل adopt() المتزامن إما مرئيًا هنا أو لاحقًا فيعيد وضع الملف
+        with atomic_immediate(using=using):
+            known = set(Blob.objects.using(using).filter(digest__in=batch).values_list("digest", flat=True))
+            for digest, (path, size) in batch.items():
+                if digest in known:
+                    continue
+                if not dry_run:
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(path)
+                removed += 1
+                freed += size
+    return removed, freed
+
+
+def _remove_stale_uploads(storage, cutoff):
+    """ملفات مؤقتة بقيت من رفع انقطع قبل adopt()."""
+    directory = storage.path(get_config()["PREFIX"])
+    if not os.path.isdir(directory):
+        return
+    limit = cutoff.timestamp()
+    for entry in os.scandir(directory):
+        if entry.name.startswith(TEMP_PREFIX) and entry.stat().st_mtime < limit:
+            os.remove(entry.path)
+
+
+def recount(using=None) -> int:
+    """يعيد حساب refcount من المرفقات (بعد bulk_create أو update لا يمران بـ Attachment.save)."""
+    Blob = apps.get_model("APP2", "Blob")
+    Attachment = apps.get_model("APP2", "Attachment")
+    using = using or router.db_for_write(Blob)
+    names = Attachment.objects.using(using).order_by().values_list("file", flat=True).iterator()
+    counts = Counter(digest for digest in map(digest_of, names) if digest)
+    changed = 0
+    with transaction.atomic(using=using):
+        for digest, refcount in list(Blob.objects.using(using).values_list("digest", "refcount")):
+            if counts.get(digest, 0) != refcount:
+                Blob.objects.using(using).filter(digest=digest).update(
+                    refcount=counts.get(digest, 0), updated_at=timezone.now()
+                )
+                changed += 1
+    return changed
+
+
+def backfill(storage=None, batch_size=None, remove=False):
+    """
+    ينقل المرفقات ذات الأسماء القديمة إلى المخزن: يُنسخ كل ملف باسم خلاصته ويُسجّل Blob له،
+    ثم Attachment.save(update_fields=["file"]) يزيد refcount. الملف القديم يُحذف بعد الالتزام مع remove.
+    يعيد (عدد المنقولة، عدد المفقودة ملفاتها).
+    """
+    storage = storage or blob_storage
+    Attachment = apps.get_model("APP2", "Attachment")
+    batch_size = batch_size or get_config()["BATCH_SIZE"]
+    using = storage.using or router.db_for_write(Attachment)
+    legacy = (
+        Attachment.objects.using(using)
+        .exclude(file="")
+        .exclude(file__startswith=f"{get_config()['PREFIX']}/")
+        .order_by("pk")
+    )
+    moved = missing = 0
+    last = None
+    while batch := list((legacy if last is None else legacy.filter(pk__gt=last))[:batch_size]):
+        last = batch[-1].pk
+        for attachment in batch:
+            old = attachment.file.name
+            try:
+                with storage.open(old, "rb") as fh:
+                    # الخلاصة تُحسب خارج أي معاملة: الصف الجديد محمي بمهلة السماح حتى يُحفظ المرفق
+                    attachment.file.name = storage.save(old, File(fh))
+            except FileNotFoundError:
+                missing += 1
+                continue
+            with transaction.atomic(using=using):
+                attachment.save(using=using, update_fields=["file"])
+                if remove:
+                    transaction.on_commit(lambda old=old: storage.delete(old), using=using)
+            moved += 1
+    return moved, missing
+
+
+def verify_all(storage=None):
+    """يولّد (الاسم، المشكلة) لكل ملف مفقود أو لا يطابق محتواه خلاصته."""
+    storage = storage or blob_storage
+    Blob = apps.get_model("APP2", "Blob")
+    using = storage.using or router.db_for_read(Blob)
+    for digest in Blob.objects.using(using).order_by().values_list("digest", flat=True).iterator():
+        name = blob_name(digest)
+        if not storage.exists(name):
+            yield name, "missing"
+        elif not storage.verify(name):
+            yield name, "digest mismatch"
+
+
+def dedupe_stats(using=None) -> dict:
+    """الحجم المنطقي (مجموع أحجام المرفقات) مقابل المخزّن فعلًا."""
+    Blob = apps.get_model("APP2", "Blob")
+    totals = Blob.objects.using(using or router.db_for_read(Blob)).aggregate(
+        blobs=Count("digest"),
+        references=Sum("refcount"),
+        stored=Sum("size"),
+        logical=Sum(F("size") * F("refcount")),
+    )
+    totals = {key: value or 0 for key, value in totals.items()}
+    totals["ratio"] = totals["logical"] / totals["stored"] if totals["stored"] else 0.0
+    return totals
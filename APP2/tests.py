@@ -1,3 +1,433 @@
-from django.test import TestCase
+import base64
+import hashlib
+import io
+import os
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from config.testing import ADMIN_BUDGET_ROWS, AdminQueryBudgetMixin, TemporaryMediaRootMixin
+
+from . import uploads
+from .models import Asset, AssetAssignment, Attachment, Blob, Category, Department, UploadSession
+from .storage import blob_name, blob_storage, collect_garbage, verify_all
+
+
+class CategoryTreeTests(TestCase):
+    def setUp(self):
+        self.root = Category.objects.create(name="أجهزة")
+        self.computers = Category.objects.create(name="حواسيب", parent=self.root)
+        self.laptops = Category.objects.create(name="محمولة", parent=self.computers)
+        self.furniture = Category.objects.create(name="أثاث")
+
+    def refresh(self, *categories):
+        for category in categories:
+            category.refresh_from_db()
+
+    def test_path_and_depth_on_create(self):
+        self.assertEqual(self.laptops.depth, 2)
+        self.assertEqual(self.laptops.path, f"{self.root.pk.hex}/{self.computers.pk.hex}/{self.laptops.pk.hex}/")
+
+    def test_descendants_and_ancestors_single_query(self):
+        with self.assertNumQueries(1):
+            descendants = set(Category.objects.descendants(self.root))
+        self.assertEqual(descendants, {self.computers, self.laptops})
+        with self.assertNumQueries(1):
+            ancestors = list(Category.objects.ancestors(self.laptops))
+        self.assertEqual(ancestors, [self.root, self.computers])
+
+    def test_assets_in_category_subtree(self):
+        laptop = Asset.objects.create(name="Laptop", category=self.laptops)
+        Asset.objects.create(name="Desk", category=self.furniture)
+        with self.assertNumQueries(1):
+            assets = list(Asset.objects.in_category_subtree(self.root))
+        self.assertEqual(assets, [laptop])
+
+    def test_move_subtree_updates_descendants(self):
+        self.computers.parent = self.furniture
+        self.computers.save()
+        self.refresh(self.laptops)
+        self.assertEqual(self.laptops.depth, 2)
+        self.assertTrue(self.laptops.path.startswith(self.furniture.path))
+        self.assertEqual(set(Category.objects.descendants(self.root)), set())
+
+    def test_move_under_own_descendant_is_rejected(self):
+        self.computers.parent = self.laptops
+        with self.assertRaises(ValidationError):
+            self.computers.save()
+
+    def test_delete_turns_children_into_roots(self):
+        self.root.delete()
+        self.refresh(self.computers, self.laptops)
+        self.assertIsNone(self.computers.parent_id)
+        self.assertEqual(self.computers.path, f"{self.computers.pk.hex}/")
+        self.assertEqual(self.computers.depth, 0)
+        self.assertEqual(self.laptops.depth, 1)
+
+    def test_rebuild_paths(self):
+        Category.objects.update(path="", depth=0)
+        Category.objects.rebuild_paths()
+        self.refresh(self.laptops)
+        self.assertEqual(self.laptops.depth, 2)
+        self.assertEqual(list(Category.objects.ancestors(self.laptops)), [self.root, self.computers])
+
+
+class AssetSearchTests(TestCase):
+    def test_admin_search_by_name_and_serial_number(self):
+        laptop = Asset.objects.create(name="حاسب محمول", notes="مخصص لقسم الإدارة", serial_number="SN-1001")
+        Asset.objects.create(name="طابعة", serial_number="SN-2002")
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        self.client.force_login(user)
+        url = reverse("admin:APP2_asset_changelist")
+        for term in ("محمول", "الاداره", "SN-1001", "1001"):
+            with self.subTest(term=term):
+                response = self.client.get(url, {"q": term})
+                self.assertEqual(list(response.context["cl"].result_list), [laptop])
+
+
+class AssetAvailabilityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.ali = User.objects.create_user("ali")
+        cls.sara = User.objects.create_user("sara")
+        cls.laptop = Asset.objects.create(name="حاسب محمول")
+        cls.projector = Asset.objects.create(name="جهاز عرض")
+        cls.chairs = Asset.objects.create(name="كراسي", quantity=2)
+        AssetAssignment.objects.create(
+            asset=cls.laptop, assigned_to=cls.ali, start_date=date(2025, 1, 1), end_date=date(2025, 1, 31)
+        )
+        AssetAssignment.objects.create(asset=cls.projector, assigned_to=cls.sara, start_date=date(2025, 3, 1))
+        AssetAssignment.objects.create(asset=cls.chairs, assigned_to=cls.ali, start_date=date(2025, 1, 1))
+
+    def test_assignments_overlapping(self):
+        overlapping = AssetAssignment.objects.assignments_overlapping
+        self.assertTrue(overlapping(self.laptop, date(2025, 1, 31), date(2025, 2, 10)).exists())
+        self.assertFalse(overlapping(self.laptop, date(2025, 2, 1), date(2025, 2, 10)).exists())
+        # تسليم مفتوح يتقاطع مع أي فترة بعد بدايته
+        self.assertTrue(overlapping(self.projector, date(2030, 1, 1)).exists())
+        self.assertFalse(overlapping(self.projector, date(2025, 1, 1), date(2025, 2, 28)).exists())
+
+    def test_holders_on(self):
+        holders = AssetAssignment.objects.holders_on(self.laptop, date(2025, 1, 15))
+        self.assertEqual([a.assigned_to for a in holders], [self.ali])
+
+    def test_free_between(self):
+        with self.assertNumQueries(1):
+            free = set(Asset.objects.free_between(date(2025, 1, 10), date(2025, 1, 20)))
+        self.assertEqual(free, {self.projector, self.chairs})
+        free = set(Asset.objects.free_between(date(2025, 3, 10)))
+        self.assertEqual(free, {self.laptop, self.chairs})
+
+    def test_overlapping_assignment_is_rejected(self):
+        assignment = AssetAssignment(asset=self.laptop, assigned_to=self.sara, start_date=date(2025, 1, 20))
+        with self.assertRaises(ValidationError):
+            assignment.full_clean()
+        with self.assertRaises(ValidationError):
+            assignment.save()
+        AssetAssignment.objects.create(asset=self.laptop, assigned_to=self.sara, start_date=date(2025, 2, 1))
+        # الأصول ذات الكمية الأكبر من 1 تقبل تسليمات متزامنة
+        AssetAssignment.objects.create(asset=self.chairs, assigned_to=self.sara, start_date=date(2025, 1, 5))
+
+
+class AdminQueryBudgetTests(AdminQueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        rows = ADMIN_BUDGET_ROWS
+        users = User.objects.bulk_create([User(username=f"user{i}") for i in range(rows)])
+        departments = Department.objects.bulk_create([Department(name=f"إدارة {i}", code=f"D{i}") for i in range(rows)])
+        parent = None
+        categories = []
+        for i in range(rows):
+            # سلسلة متداخلة: كل تصنيف أب للتالي
+            parent = Category.objects.create(name=f"تصنيف {i}", parent=parent)
+            categories.append(parent)
+        assets = Asset.objects.bulk_create([
+            Asset(name=f"أصل {i}", serial_number=f"SN{i}", department=departments[i], category=categories[i])
+            for i in range(rows)
+        ])
+        Attachment.objects.bulk_create([
+            Attachment(asset=asset, title=f"مرفق {i}", file=f"uploads/attachments/{i}.pdf", uploaded_by=users[i])
+            for i, asset in enumerate(assets)
+        ])
+        AssetAssignment.objects.bulk_create([
+            AssetAssignment(asset=asset, assigned_to=users[i], start_date=date(2025, 1, 1))
+            for i, asset in enumerate(assets)
+        ])
+
+    def test_admin_pages_stay_within_query_budget(self):
+        self.assertAdminBudgets("APP2")
+
+
+@override_settings(FACETS={"TOP": 2, "REFRESH": 0, "MODELS": ["APP2.Asset"]})
+class AdminFacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.departments = Department.objects.bulk_create([Department(name=f"إدارة {i}", code=f"D{i}") for i in range(4)])
+        # إدارة 0: أربعة أصول، إدارة 1: ثلاثة، إدارة 2: واحد، إدارة 3: لا شيء
+        Asset.objects.bulk_create([
+            Asset(name=f"أصل {i}", serial_number=f"SN{i}", department=cls.departments[d])
+            for i, d in enumerate([0, 0, 0, 0, 1, 1, 1, 2])
+        ])
+
+    def setUp(self):
+        caches["default"].clear()
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        self.client.force_login(user)
+        self.url = reverse("admin:APP2_asset_changelist")
+
+    def department_choices(self, response):
+        spec = next(s for s in response.context["cl"].filter_specs if s.field_path == "department")
+        return spec, [choice["display"] for choice in spec.choices(response.context["cl"])]
+
+    def test_large_related_table_shows_top_values_and_selection(self):
+        response = self.client.get(self.url, {"_facets": "1", "department__id__exact": self.departments[3].pk})
+        spec, displays = self.department_choices(response)
+        self.assertTrue(spec.truncated)
+        self.assertEqual(displays[1:4], ["إدارة 0 (4)", "إدارة 1 (3)", "إدارة 3 (0)"])
+
+    def test_search_limits_choices_not_rows(self):
+        response = self.client.get(self.url, {"department__facet_q": "D3"})
+        _, displays = self.department_choices(response)
+        self.assertIn(str(self.departments[3]), displays)
+        self.assertEqual(response.context["cl"].result_count, 8)
+
+    def test_counts_are_cached_until_assets_change(self):
+        self.client.get(self.url, {"_facets": "1"})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {"_facets": "1"})
+        self.assertFalse([q for q in queries if "GROUP BY" in q["sql"] or "FILTER" in q["sql"]])
+
+        Asset.objects.create(name="جديد", department=self.departments[0])
+        response = self.client.get(self.url, {"_facets": "1"})
+        _, displays = self.department_choices(response)
+        self.assertIn("إدارة 0 (5)", displays)
+
+
+class ContentAddressedStorageTests(TemporaryMediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.assets = Asset.objects.bulk_create([Asset(name="طابعة"), Asset(name="ماسح")])
+
+    def attach(self, asset, content, name="manual.pdf"):
+        return Attachment.objects.create(asset=asset, file=ContentFile(content, name=name))
+
+    def test_identical_uploads_share_one_blob(self):
+        first = self.attach(self.assets[0], b"%PDF manual")
+        second = self.attach(self.assets[1], b"%PDF manual", name="copy.pdf")
+        digest = hashlib.sha256(b"%PDF manual").hexdigest()
+        self.assertEqual(first.file.name, blob_name(digest))
+        self.assertEqual(second.file.name, first.file.name)
+        self.assertEqual((second.original_name, Blob.objects.get().refcount), ("copy.pdf", 2))
+        with Attachment.objects.get(pk=first.pk).file.open("rb") as fh:
+            self.assertEqual(fh.read(), b"%PDF manual")
+        self.assertTrue(blob_storage.verify(first.file.name))
+
+    def test_replacing_and_deleting_release_references(self):
+        attachment = self.attach(self.assets[0], b"v1")
+        attachment = Attachment.objects.get(pk=attachment.pk)
+        attachment.file = ContentFile(b"v2", name="manual.pdf")
+        attachment.save()
+        counts = dict(Blob.objects.values_list("digest", "refcount"))
+        self.assertEqual(counts, {hashlib.sha256(b"v1").hexdigest(): 0, hashlib.sha256(b"v2").hexdigest(): 1})
+
+        attachment.delete()
+        self.assertFalse(Blob.objects.filter(refcount__gt=0).exists())
+        self.assertEqual(collect_garbage(), (0, 0))  # ما زالت ضمن مهلة السماح
+        self.assertEqual(collect_garbage(grace=0, batch_size=1), (2, 4))
+        self.assertFalse(Blob.objects.exists())
+        self.assertFalse(blob_storage.exists(attachment.file.name))
+
+    def test_file_of_rolled_back_save_is_collected(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.attach(self.assets[0], b"draft")
+            raise RuntimeError
+        name = blob_name(hashlib.sha256(b"draft").hexdigest())
+        self.assertTrue(blob_storage.exists(name))
+        self.assertFalse(Blob.objects.exists())
+        self.assertEqual(collect_garbage(), (0, 0))  # ما زال ضمن مهلة السماح
+        self.assertEqual(collect_garbage(grace=0), (1, 5))
+        self.assertFalse(blob_storage.exists(name))
+
+    def test_legacy_names_are_readable_until_backfilled(self):
+        legacy_root = os.path.join(self.media_root, "legacy")
+        name = "uploads/attachments/2024/05/manual.pdf"
+        path = os.path.join(legacy_root, name)
+        os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as fh:
+            fh.write(b"%PDF manual")
+        with override_settings(BLOB_STORAGE={"LEGACY_ROOT": legacy_root}):
+            legacy = Attachment.objects.create(asset=self.assets[0], file=name)
+            with Attachment.objects.get(pk=legacy.pk).file.open("rb") as fh:
+                self.assertEqual(fh.read(), b"%PDF manual")
+            copy = self.attach(self.assets[1], b"%PDF manual")
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("backfill_blobs", "--remove-legacy", stdout=io.StringIO())
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.file.name, copy.file.name)
+        self.assertEqual(Blob.objects.get().refcount, 2)
+        self.assertFalse(os.path.exists(path))
+
+    def test_verify_reports_corrupted_blob(self):
+        attachment = self.attach(self.assets[0], b"invoice")
+        with open(blob_storage.path(attachment.file.name), "wb") as fh:
+            fh.write(b"tampered")
+        self.assertEqual(list(verify_all()), [(attachment.file.name, "digest mismatch")])
+
+
+class AttachmentDownloadTests(TemporaryMediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.body = bytes(range(256)) * 40
+        self.attachment = Attachment.objects.create(
+            asset=Asset.objects.create(name="ماسح"), file=ContentFile(self.body, name="scan.pdf")
+        )
+        self.url = reverse("attachment-download", args=[self.attachment.pk])
+        self.client.force_login(get_user_model().objects.create_superuser("admin", "admin@example.com", "pass"))
+
+    def test_full_download_streams_with_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(b"".join(response.streaming_content), self.body)
+        self.assertEqual(response["ETag"], f'"{hashlib.sha256(self.body).hexdigest()}"')
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn('filename="scan.pdf"', response["Content-Disposition"])
+        self.assertIn("private", response["Cache-Control"])
+        response.close()
+
+    def test_range_and_conditional_requests(self):
+        response = self.client.get(self.url)
+        response.close()
+        etag = response["ETag"]
+        cases = [
+            ({"Range": "bytes=100-199"}, 206, self.body[100:200]),
+            ({"Range": "bytes=-10"}, 206, self.body[-10:]),
+            ({"Range": "bytes=10-", "If-Range": etag}, 206, self.body[10:]),
+            ({"Range": "bytes=10-", "If-Range": '"stale"'}, 200, self.body),
+            ({"Range": "bytes=0-1,5-6"}, 200, self.body),
+        ]
+        for headers, status, body in cases:
+            with self.subTest(headers=headers):
+                response = self.client.get(self.url, headers=headers)
+                self.assertEqual(response.status_code, status)
+                self.assertEqual(b"".join(response.streaming_content), body)
+                response.close()
+        response = self.client.get(self.url, headers={"Range": "bytes=100-199"})
+        self.assertEqual(response["Content-Range"], f"bytes 100-199/{len(self.body)}")
+        response.close()
+
+        self.assertEqual(self.client.get(self.url, headers={"If-None-Match": etag}).status_code, 304)
+        response = self.client.get(self.url, headers={"Range": f"bytes={len(self.body)}-"})
+        self.assertEqual((response.status_code, response["Content-Range"]), (416, f"bytes */{len(self.body)}"))
+
+    @override_settings(ATTACHMENT_DOWNLOADS={"SENDFILE": "X-Accel-Redirect", "SENDFILE_ROOT": "/protected/"})
+    def test_sendfile_offload(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected/{self.attachment.file.name}")
+        self.assertEqual(response.content, b"")
+
+    def test_requires_permission(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+        self.client.force_login(get_user_model().objects.create_user("guest"))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class ChunkedUploadTests(TemporaryMediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.body = bytes(range(256)) * 100
+        self.asset = Asset.objects.create(name="خادم")
+        self.client.force_login(get_user_model().objects.create_superuser("admin", "admin@example.com", "pass"))
+
+    def start(self, **extra):
+        response = self.client.post(
+            reverse("attachment-upload-start"),
+            {"asset": self.asset.pk, "filename": "backup.tar", "size": len(self.body), **extra},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()["url"]
+
+    def put(self, url, offset, chunk, digest=None):
+        digest = digest or hashlib.sha256(chunk).digest()
+        return self.client.put(
+            url,
+            chunk,
+            content_type="application/octet-stream",
+            headers={"Upload-Offset": str(offset), "Content-Digest": f"sha-256=:{base64.b64encode(digest).decode()}:"},
+        )
+
+    def test_upload_in_chunks_creates_attachment(self):
+        url = self.start(sha256=hashlib.sha256(self.body).hexdigest())
+        for offset in range(0, len(self.body), 10000):
+            response = self.put(url, offset, self.body[offset : offset + 10000])
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url).json()["offset"], len(self.body))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url + "complete/")
+        self.assertEqual(response.status_code, 201)
+        attachment = Attachment.objects.get(pk=response.json()["attachment"])
+        self.assertEqual(attachment.original_name, "backup.tar")
+        self.assertEqual(attachment.file.read(), self.body)
+        attachment.file.close()
+        self.assertEqual(Blob.objects.get(digest=hashlib.sha256(self.body).hexdigest()).refcount, 1)
+        # الإكمال مرة ثانية (بعد انقطاع الرد مثلًا) لا ينشئ مرفقًا آخر
+        self.assertEqual(self.client.post(url + "complete/").json()["attachment"], str(attachment.pk))
+        self.assertEqual(Attachment.objects.count(), 1)
+
+    def test_failed_completion_can_be_retried(self):
+        url = self.start()
+        self.assertEqual(self.put(url, 0, self.body).status_code, 200)
+        with mock.patch.object(Attachment, "save", side_effect=RuntimeError("db down")):
+            with self.captureOnCommitCallbacks(execute=True), self.assertRaises(RuntimeError):
+                self.client.post(url + "complete/")
+        # المعاملة تراجعت والملف الجزئي باقٍ في مكانه
+        session = UploadSession.objects.get()
+        self.assertEqual(session.status, UploadSession.Status.OPEN)
+        self.assertTrue(os.path.exists(uploads.partial_path(session)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url + "complete/")
+        self.assertEqual(response.status_code, 201)
+        attachment = Attachment.objects.get()
+        self.assertEqual(attachment.file.read(), self.body)
+        attachment.file.close()
+        self.assertFalse(os.path.exists(uploads.partial_path(session)))
+
+    def test_wrong_offset_or_digest_is_rejected(self):
+        url = self.start()
+        self.assertEqual(self.put(url, 0, self.body[:1000]).status_code, 200)
+
+        response = self.put(url, 0, self.body[:1000])
+        self.assertEqual((response.status_code, response.json()["offset"]), (409, 1000))
+
+        response = self.put(url, 1000, self.body[1000:2000], digest=hashlib.sha256(b"other").digest())
+        self.assertEqual((response.status_code, response.json()["offset"]), (400, 1000))
+        self.assertEqual(self.client.get(url).json()["offset"], 1000)
+        self.assertEqual(self.client.post(url + "complete/").status_code, 409)
+
+    def test_cleanup_removes_stale_sessions(self):
+        self.start()
+        session = UploadSession.objects.get()
+        path = uploads.partial_path(session)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(uploads.cleanup(), (0, 0))
+
+        UploadSession.objects.update(updated_at=timezone.now() - timedelta(days=2))
+        self.assertEqual(uploads.cleanup(), (1, 0))
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(os.path.exists(path))
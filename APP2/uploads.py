@@ -0,0 +1,240 @@
+# app2/uploads.py
+"""
+رفع المرفقات الكبيرة على قطع قابلة للاستئناف، بدل طلب multipart واحد يشغل العامل طوال النقل
+ويبدأ من الصفر عند أي انقطاع.
+
+    POST   /attachments/uploads/                 {"asset", "filename", "size", "sha256"?, "title"?}
+    PUT    /attachments/uploads/<id>/            جسم الطلب = القطعة، Upload-Offset وContent-Digest: sha-256=:…:
+    GET    /attachments/uploads/<id>/            الإزاحة الحالية للاستئناف
+    POST   /attachments/uploads/<id>/complete/   التحقق من الملف كاملًا وإنشاء Attachment
+
+- كل قطعة تُكتب من جسم الطلب مباشرة (request.read على دفعات) إلى ملف جزئي في UPLOADS["DIR"]
+  عند إزاحتها، وتُقارن خلاصتها بـ Content-Digest قبل تقديم الإزاحة؛ القطعة الفاسدة تُقص وتُعاد.
+- طلبات الجلسة الواحدة تتسلسل بقفل على الملف الجزئي (locked_partial).
+- الإكمال يقرأ الملف الجزئي على دفعات لحساب SHA-256 (ومقارنته بـ sha256 إن أُرسل)، ثم يُنشأ المرفق
+  في معاملة، وبعد التزامها يُنقل الملف إلى مخزن المحتوى دون نسخ.
+- الجلسات المتروكة وملفاتها يحذفها الأمر cleanup_uploads بعد UPLOADS["EXPIRE"] ثانية.
+"""
+import base64
+import contextlib
+import hashlib
+import os
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import locks
+from django.db import transaction
+from django.utils import timezone
+
+from config.db.transactions import atomic_immediate
+
+from .models import Attachment, UploadSession
+from .storage import blob_storage, digest_of
+
+DEFAULTS = {
+    # على نظام الملفات نفسه مع MEDIA_ROOT حتى ينقل adopt الملف بـ os.replace
+    "DIR": None,
+    "MAX_SIZE": 4 * 1024**3,
+    "MAX_CHUNK_SIZE": 16 * 1024**2,
+    "EXPIRE": 24 * 3600,
+}
+
+READ_SIZE = 64 * 1024
+DIGEST_RE = re.compile(r"sha-256=:([A-Za-z0-9+/]+=*):")
+
+
+class UploadError(Exception):
+    status = 400
+
+    def __init__(self, message, offset=None):
+        super().__init__(message)
+        self.offset = offset
+
+
+class OffsetMismatch(UploadError):
+    status = 409
+
+
+class ChunkTooLarge(UploadError):
+    status = 413
+
+
+class PartialFileMissing(UploadError):
+    status = 410
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "UPLOADS", {})}
+
+
+def upload_dir() -> str:
+    directory = get_config()["DIR"] or os.path.join(settings.MEDIA_ROOT, "partial-uploads")
+    os.makedirs(directory, exist_ok=True)
+    return str(directory)
+
+
+def partial_path(session) -> str:
+    return os.path.join(upload_dir(), f"{session.pk.hex}.part")
+
+
+def parse_digest(header):
+    """bytes من Content-Digest: sha-256=:base64: (RFC 9530)، أو None."""
+    match = DIGEST_RE.search(header or "")
+    if not match:
+        return None
+    try:
+        return base64.b64decode(match.group(1), validate=True)
+    except ValueError:
+        return None
+
+
+def start(user, asset, filename, size, sha256="", title=""):
+    if not 0 < size <= get_config()["MAX_SIZE"]:
+        raise ChunkTooLarge(f"size must be between 1 and {get_config()['MAX_SIZE']} bytes")
+    if sha256 and not re.fullmatch(r"[0-9a-f]{64}", sha256):
+        raise UploadError("sha256 must be 64 lowercase hex digits")
+    session = UploadSession.objects.create(
+        user=user, asset=asset, filename=os.path.basename(filename)[:255], size=size, sha256=sha256, title=title,
+    )
+    open(partial_path(session), "wb").close()
+    return session
+
+
+@contextlib.contextmanager
+def locked_partial(session):
+    """
+    الملف الجزئي مفتوحًا للقراءة والكتابة بقفل حصري: طلبات الجلسة الواحدة (قطع متزامنة عند الإزاحة
+    نفسها، أو إكمال يُعاد بعد انتهاء المهلة) تتسلسل، والحالة تُعاد قراءتها بعد أخذ القفل.
+    """
+    try:
+        fh = open(partial_path(session), "r+b")
+    except FileNotFoundError:
+        raise PartialFileMissing("partial upload file is missing; start a new upload", session.received) from None
+    with fh:
+        locks.lock(fh, locks.LOCK_EX)
+        try:
+            session.refresh_from_db(fields=["received", "status", "attachment", "updated_at"])
+            yield fh
+        finally:
+            locks.unlock(fh)
+
+
+def write_chunk(session, offset, length, stream, digest):
+    """
+    يكتب length بايت من stream عند offset ويتحقق من خلاصتها (digest: bytes).
+    الإزاحة يجب أن تساوي ما استُلم حتى الآن؛ الرد 409 يعيد الإزاحة الصحيحة للاستئناف.
+    """
+    if length > get_config()["MAX_CHUNK_SIZE"]:
+        raise ChunkTooLarge(f"chunks are limited to {get_config()['MAX_CHUNK_SIZE']} bytes", session.received)
+    if digest is None:
+        raise UploadError("Content-Digest: sha-256=:…: is required", session.received)
+    if session.status != UploadSession.Status.OPEN:
+        raise OffsetMismatch("upload is already complete", session.received)
+
+    with locked_partial(session) as fh:
+        if session.status != UploadSession.Status.OPEN:
+            raise OffsetMismatch("upload is already complete", session.received)
+        if offset != session.received:
+            raise OffsetMismatch(f"expected offset {session.received}", session.received)
+        if offset + length > session.size:
+            raise UploadError("chunk extends past the declared size", session.received)
+
+        hasher = hashlib.sha256()
+        written = 0
+        fh.seek(offset)
+        while written < length:
+            data = stream.read(min(READ_SIZE, length - written))
+            if not data:
+                break
+            hasher.update(data)
+            fh.write(data)
+            written += len(data)
+        if written != length or hasher.digest() != digest:
+            # قطعة ناقصة أو فاسدة: لا تُحتسب، ويعاد إرسالها من الإزاحة نفسها
+            fh.truncate(offset)
+            raise UploadError("chunk is incomplete or does not match Content-Digest", offset)
+
+        moved = UploadSession.objects.filter(pk=session.pk, received=offset, status=UploadSession.Status.OPEN).update(
+            received=offset + length, updated_at=timezone.now()
+        )
+        session.refresh_from_db(fields=["received", "status", "updated_at"])
+    if not moved:
+        raise OffsetMismatch("another request advanced this upload", session.received)
+    return session.received
+
+
+def complete(session):
+    """
+    يتحقق من الملف كاملًا وينشئ المرفق؛ استدعاؤه مرة ثانية يعيد المرفق نفسه.
+    الملف الجزئي لا يُنقل إلى مخزن المحتوى إلا بعد التزام المعاملة، فإن فشلت بقي لإعادة المحاولة.
+    """
+    path = partial_path(session)
+    try:
+        with locked_partial(session) as fh:
+            if session.status == UploadSession.Status.COMPLETE:
+                if session.attachment is not None:
+                    # التزمت المعاملة وانقطع العامل قبل النقل
+                    blob_storage.place(path, digest_of(session.attachment.file.name))
+                return session.attachment
+            return _complete(session, path, fh)
+    except PartialFileMissing:
+        # نُقل الملف بعد إكمال سابق
+        session.refresh_from_db(fields=["status", "attachment"])
+        if session.status == UploadSession.Status.COMPLETE:
+            return session.attachment
+        raise
+
+
+def _complete(session, path, fh):
+    if session.received != session.size:
+        raise OffsetMismatch(f"{session.size - session.received} bytes missing", session.received)
+
+    hasher = hashlib.sha256()
+    while data := fh.read(1024 * 1024):
+        hasher.update(data)
+    digest = hasher.hexdigest()
+    if session.sha256 and digest != session.sha256:
+        raise UploadError("file does not match the declared sha256", session.received)
+
+    with atomic_immediate():
+        locked = UploadSession.objects.select_for_update().get(pk=session.pk)
+        if locked.status == UploadSession.Status.COMPLETE:
+            session.refresh_from_db(fields=["status", "attachment"])
+            return session.attachment
+        attachment = Attachment(
+            asset=session.asset, title=session.title, original_name=session.filename, uploaded_by=session.user,
+        )
+        attachment.file.name = blob_storage.register(digest, session.size)
+        attachment.save()
+        session.status = UploadSession.Status.COMPLETE
+        session.attachment = attachment
+        session.save(update_fields=["status", "attachment", "updated_at"])
+        transaction.on_commit(lambda: blob_storage.place(path, digest))
+    return attachment
+
+
+def cleanup(older_than=None, dry_run=False):
+    """يحذف الجلسات الأقدم من EXPIRE (المتروكة والمكتملة) وملفاتها الجزئية؛ يعيد (الجلسات، البايتات)."""
+    expire = get_config()["EXPIRE"] if older_than is None else older_than
+    cutoff = timezone.now() - timedelta(seconds=expire)
+    stale = UploadSession.objects.filter(updated_at__lt=cutoff)
+    sessions = freed = 0
+    for session in list(stale):
+        path = partial_path(session)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        sessions += 1
+        freed += size
+        if not dry_run:
+            if os.path.exists(path):
+                os.remove(path)
+            session.delete()
+    if not dry_run:
+        # ملفات بلا جلسة (حُذفت الجلسة مع أصلها مثلًا)
+        known = {pk.hex for pk in UploadSession.objects.values_list("pk", flat=True)}
+        limit = cutoff.timestamp()
+        for entry in os.scandir(upload_dir()):
+            if entry.name.endswith(".part") and entry.name[:-5] not in known and entry.stat().st_mtime < limit:
+                freed += entry.stat().st_size
+                os.remove(entry.path)
+    return sessions, freed
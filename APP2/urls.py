@@ -1,4 +1,11 @@
 # app2/urls.py
 from django.urls import path
 
-urlpatterns = []
+from . import views
+
+urlpatterns = [
+    path("attachments/<uuid:pk>/download/", views.download_attachment, name="attachment-download"),
+    path("attachments/uploads/", views.upload_start, name="attachment-upload-start"),
+    path("attachments/uploads/<uuid:pk>/", views.upload_chunk, name="attachment-upload"),
+    path("attachments/uploads/<uuid:pk>/complete/", views.upload_complete, name="attachment-upload-complete"),
+]
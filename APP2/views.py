@@ -1,3 +1,243 @@
-from django.shortcuts import render
+# app2/views.py
+"""
+تنزيل المرفقات: الملف يُبث على قطع ثابتة الحجم (ATTACHMENT_DOWNLOADS["CHUNK_SIZE"]) مهما كبر،
+مع دعم Range والطلبات الشرطية.
 
-# Create your views here.
+- ETag: خلاصة SHA-256 للملفات في مخزن المحتوى (APP2.storage)، وإلا الحجم ووقت التعديل.
+- If-None-Match وIf-Modified-Since → 304، وIf-Range يقرر إن كان Range يُحترم.
+- Range: نطاق واحد (bytes=a-b أو bytes=a- أو bytes=-n)؛ النطاقات المتعددة تُخدم بالملف كاملًا.
+- الملف الكامل يمر إلى wsgi.file_wrapper (sendfile في gunicorn). مع SENDFILE = "X-Sendfile" أو
+  "X-Accel-Redirect" يتولى خادم الويب الإرسال والنطاقات، ويبقى التحقق من الصلاحية هنا.
+
+الرفع على قطع قابلة للاستئناف في النصف الثاني من الملف (البروتوكول في APP2.uploads).
+"""
+import json
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_http_methods, require_POST, require_safe
+
+from . import uploads
+from .models import Asset, Attachment, UploadSession
+from .storage import digest_of, is_legacy
+
+DEFAULTS = {
+    "CHUNK_SIZE": 64 * 1024,
+    "MAX_AGE": 3600,
+    # None أو "X-Sendfile" (Apache/lighttpd: مسار الملف) أو "X-Accel-Redirect" (nginx: SENDFILE_ROOT + الاسم)
+    "SENDFILE": None,
+    "SENDFILE_ROOT": "/protected/",
+}
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "ATTACHMENT_DOWNLOADS", {})}
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """(البداية، النهاية) شاملتين لنطاق واحد، أو None لتجاهل الترويسة وإرسال الملف كاملًا."""
+    match = RANGE_RE.match(header.replace(" ", ""))
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        # bytes=-n: آخر n بايت
+        if int(last) == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def if_range_matches(request, etag, last_modified) -> bool:
+    value = request.headers.get("If-Range")
+    if not value:
+        return True
+    if value.startswith(('"', "W/")):
+        # مقارنة قوية: ETag ضعيف لا يطابق أبدًا
+        return value == etag and not etag.startswith("W/")
+    return parse_http_date_safe(value) == last_modified
+
+
+class RangeFile:
+    """جزء من ملف مفتوح: FileResponse يقرأ منه block_size في كل مرة حتى نهاية النطاق."""
+
+    def __init__(self, fh, start, length):
+        fh.seek(start)
+        self.fh = fh
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fh.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.fh.close()
+
+
+@login_required
+@require_safe
+def download_attachment(request, pk):
+    attachment = get_object_or_404(Attachment.active, pk=pk)
+    if not (request.user.has_perm("APP2.view_attachment") or attachment.uploaded_by_id == request.user.pk):
+        raise PermissionDenied
+    config = get_config()
+    name = attachment.file.name
+    path = attachment.file.storage.path(name)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404
+    etag = quote_etag(digest_of(name) or f"{stat.st_size:x}-{stat.st_mtime_ns:x}")
+    last_modified = int(stat.st_mtime)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = file_response(request, attachment, path, stat.st_size, etag, last_modified, config)
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(last_modified)
+    response.headers["Accept-Ranges"] = "bytes"
+    patch_cache_control(response, private=True, max_age=config["MAX_AGE"])
+    return response
+
+
+def file_response(request, attachment, path, size, etag, last_modified, config):
+    filename = attachment.original_name or os.path.basename(attachment.file.name)
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    # مسار nginx الداخلي (SENDFILE_ROOT) يقابل MEDIA_ROOT؛ الأسماء القديمة تُبث من هنا حتى backfill_blobs
+    accel_legacy = is_legacy(attachment.file.name) and (config["SENDFILE"] or "").lower() == "x-accel-redirect"
+    if config["SENDFILE"] and not accel_legacy:
+        response = HttpResponse(content_type=content_type)
+        response.headers["Content-Disposition"] = content_disposition_header(True, filename)
+        if config["SENDFILE"].lower() == "x-accel-redirect":
+            response.headers["X-Accel-Redirect"] = quote(config["SENDFILE_ROOT"] + attachment.file.name)
+        else:
+            response.headers[config["SENDFILE"]] = path
+        return response
+
+    byte_range = None
+    if "Range" in request.headers and if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.headers["Range"], size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response.headers["Content-Range"] = f"bytes */{size}"
+            return response
+
+    fh = open(path, "rb")
+    if byte_range is None:
+        response = FileResponse(fh, as_attachment=True, filename=filename, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            RangeFile(fh, start, end - start + 1),
+            status=206,
+            as_attachment=True,
+            filename=filename,
+            content_type=content_type,
+        )
+        response.headers["Content-Length"] = str(end - start + 1)
+        response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response.block_size = config["CHUNK_SIZE"]
+    return response
+
+
+# ---------- الرفع على قطع (APP2.uploads) ----------
+
+
+def upload_state(session):
+    return {
+        "id": str(session.pk),
+        "offset": session.received,
+        "size": session.size,
+        "status": session.status,
+        "chunk_size": uploads.get_config()["MAX_CHUNK_SIZE"],
+        "url": reverse("attachment-upload", args=[session.pk]),
+    }
+
+
+def upload_error(exc):
+    return JsonResponse({"error": str(exc), "offset": exc.offset}, status=exc.status)
+
+
+@login_required
+@require_POST
+def upload_start(request):
+    if not request.user.has_perm("APP2.add_attachment"):
+        raise PermissionDenied
+    try:
+        data = json.loads(request.body or b"{}")
+        asset = Asset.active.filter(pk=data["asset"]).first()
+        filename, size = str(data["filename"]), int(data["size"])
+    except (ValueError, KeyError, TypeError, ValidationError):
+        return JsonResponse({"error": "asset, filename and size are required"}, status=400)
+    if asset is None:
+        raise Http404
+    try:
+        session = uploads.start(
+            request.user, asset, filename, size, sha256=str(data.get("sha256", "")), title=str(data.get("title", ""))
+        )
+    except uploads.UploadError as exc:
+        return upload_error(exc)
+    return JsonResponse(upload_state(session), status=201)
+
+
+@login_required
+@require_http_methods(["GET", "HEAD", "PUT"])
+def upload_chunk(request, pk):
+    session = get_object_or_404(UploadSession, pk=pk, user=request.user)
+    if request.method == "PUT":
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers["Content-Length"])
+        except (KeyError, ValueError):
+            return JsonResponse({"error": "Upload-Offset and Content-Length are required"}, status=400)
+        digest = uploads.parse_digest(request.headers.get("Content-Digest"))
+        try:
+            # القطعة تُقرأ من جسم الطلب مباشرة دون request.body
+            uploads.write_chunk(session, offset, length, request, digest)
+        except uploads.UploadError as exc:
+            return upload_error(exc)
+    return JsonResponse(upload_state(session))
+
+
+@login_required
+@require_POST
+def upload_complete(request, pk):
+    session = get_object_or_404(UploadSession.objects.select_related("asset", "user"), pk=pk, user=request.user)
+    try:
+        attachment = uploads.complete(session)
+    except uploads.UploadError as exc:
+        return upload_error(exc)
+    return JsonResponse(
+        {
+            **upload_state(session),
+            "attachment": str(attachment.pk),
+            "download": reverse("attachment-download", args=[attachment.pk]),
+        },
+        status=201,
+    )
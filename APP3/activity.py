@@ -0,0 +1,270 @@
+# app3/activity.py
+"""
+كاتب سجل النشاط (ActivityLog) المُخزَّن مؤقتًا.
+
+بدل إدراج صف واحد متزامن في كل طلب، تُضاف السجلات إلى طابور داخل العملية
+ويقوم خيط خلفي بكتابتها عبر bulk_create على دفعات محدودة بالحجم أو بالزمن.
+
+    from APP3.activity import log_activity
+    log_activity(ActivityLog.Action.LOGIN, "تسجيل دخول", actor=request.user)
+
+ملاحظة: created_at يُضبط لحظة التفريغ (ضمن FLUSH_INTERVAL من لحظة الإضافة).
+
+الدفعة التي تفشل كتابتها ("database is locked" بعد busy_timeout مثلًا) تُعاد RETRIES مرة بانتظار
+متضاعف، ثم تُكتب صفًا صفًا؛ ما يفشل بعدها يُعدّ في writer.dropped ويُسجَّل في السجل.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+
+from config.db.transactions import atomic_immediate
+
+from .models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "SYNC": False,  # كتابة متزامنة (للاختبارات)
+    "BATCH_SIZE": 500,  # أقصى عدد صفوف في الدفعة الواحدة
+    "FLUSH_INTERVAL": 1.0,  # أقصى زمن (ثوانٍ) يبقى فيه سجل في الطابور
+    "MAX_QUEUE_SIZE": 10000,  # حجم الطابور قبل تفعيل الضغط العكسي
+    "PUT_TIMEOUT": 5.0,  # زمن انتظار المُنتِج عند امتلاء الطابور قبل الكتابة المباشرة
+    "RETRIES": 3,  # إعادة محاولة الدفعة الفاشلة قبل كتابتها صفًا صفًا
+    "RETRY_BACKOFF": 0.2,  # ثوانٍ قبل أول إعادة، وتتضاعف بعدها
+}
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "ACTIVITY_LOG_WRITER", {})}
+
+
+class ActivityLogWriter:
+    _STOP = object()
+
+    def __init__(
+        self, sync=None, batch_size=None, flush_interval=None, max_queue_size=None, put_timeout=None, using=None,
+        retries=None, retry_backoff=None,
+    ):
+        config = get_config()
+        self.using = using
+        self.sync = config["SYNC"] if sync is None else sync
+        self.batch_size = batch_size or config["BATCH_SIZE"]
+        self.flush_interval = config["FLUSH_INTERVAL"] if flush_interval is None else flush_interval
+        self.put_timeout = config["PUT_TIMEOUT"] if put_timeout is None else put_timeout
+        self.retries = config["RETRIES"] if retries is None else retries
+        self.retry_backoff = config["RETRY_BACKOFF"] if retry_backoff is None else retry_backoff
+        # سجلات تعذرت كتابتها حتى صفًا صفًا
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue_size or config["MAX_QUEUE_SIZE"])
+        # الخيط الخلفي لا يُوقَظ مع كل سجل (تبديل خيوط لكل حفظ على معالج واحد)، بل عند امتلاء دفعة،
+        # أو انتظار مُنتِج لمساحة في الطابور، أو عند flush/close، أو بانقضاء FLUSH_INTERVAL
+        self._wake = threading.Event()
+        self._flushing = 0
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    # ---------- الواجهة العامة ----------
+
+    def log(self, action, message, actor=None, metadata=None, **extra):
+        entry = ActivityLog(
+            action=action,
+            message=message[:500],
+            actor=actor,
+            metadata=metadata or {},
+            **extra,
+        )
+        self.enqueue(entry)
+        return entry
+
+    def enqueue(self, entry) -> None:
+        """entry كائن ActivityLog أو قاموس حقوله؛ القاموس يُبنى كائنًا في الخيط الخلفي لا في الطلب."""
+        if self.sync:
+            ActivityLog.objects.db_manager(self.using).bulk_create([self._build(entry)])
+            return
+        if self._closed:
+            self._write([entry])
+            return
+
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            if self.put_timeout:
+                self._wake.set()
+            try:
+                # الضغط العكسي: ينتظر المُنتِج حتى تتوفر مساحة في الطابور
+                self._queue.put(entry, timeout=self.put_timeout)
+            except queue.Full:
+                logger.warning("ActivityLog queue is full; writing entry synchronously.")
+                self._write([entry])
+                return
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def flush(self, timeout=None) -> None:
+        """ينتظر حتى تُكتب كل السجلات الموجودة في الطابور."""
+        if self._thread is None or not self._thread.is_alive():
+            self._drain()
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._flushing += 1
+        self._wake.set()
+        try:
+            with self._queue.all_tasks_done:
+                while self._queue.unfinished_tasks:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        break
+                    self._queue.all_tasks_done.wait(remaining)
+        finally:
+            with self._lock:
+                self._flushing -= 1
+
+    def close(self) -> None:
+        """يوقف الخيط الخلفي بعد تفريغ الطابور بالكامل (يُستدعى تلقائيًا عند الإغلاق)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._wake.set()
+            self._queue.put(self._STOP)
+            thread.join()
+        self._drain()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    # ---------- التنفيذ الداخلي ----------
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            while True:
+                batch, stop = self._collect()
+                if batch:
+                    close_old_connections()
+                    self._write(batch)
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            connections[self.using or DEFAULT_DB_ALIAS].close()
+
+    def _collect(self):
+        """يجمع دفعة حتى BATCH_SIZE أو انقضاء FLUSH_INTERVAL من أول عنصر."""
+        batch = []
+        first = self._queue.get()
+        if first is self._STOP:
+            return batch, True
+        batch.append(first)
+        if not (self._closed or self._flushing):
+            self._wake.wait(self.flush_interval)
+        self._wake.clear()
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is self._STOP:
+                return batch, True
+            batch.append(item)
+        if self._queue.qsize() >= self.batch_size or (self._flushing and self._queue.qsize()):
+            self._wake.set()
+        return batch, False
+
+    def _drain(self) -> None:
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not self._STOP:
+                batch.append(item)
+            self._queue.task_done()
+        for start in range(0, len(batch), self.batch_size):
+            self._write(batch[start:start + self.batch_size])
+
+    @staticmethod
+    def _build(entry) -> ActivityLog:
+        return entry if isinstance(entry, ActivityLog) else ActivityLog(**entry)
+
+    def _insert(self, objs) -> None:
+        with atomic_immediate(using=self.using):
+            ActivityLog.objects.db_manager(self.using).bulk_create(objs, batch_size=self.batch_size)
+
+    def _write(self, batch) -> None:
+        objs = []
+        for entry in batch:
+            try:
+                objs.append(self._build(entry))
+            except Exception:
+                logger.exception("Invalid ActivityLog entry dropped.")
+                self._drop(1)
+        for attempt in range(self.retries + 1):
+            try:
+                self._insert(objs)
+                return
+            except Exception as exc:
+                if attempt == self.retries:
+                    logger.warning("Writing %d ActivityLog entries failed (%s); writing them one by one.", len(objs), exc)
+                    break
+                time.sleep(self.retry_backoff * 2 ** attempt)
+        # صف فاسد واحد لا يُسقط بقية الدفعة
+        for obj in objs:
+            try:
+                self._insert([obj])
+            except Exception:
+                logger.exception("Failed to write ActivityLog entry %s.", obj.pk)
+                self._drop(1)
+
+    def _drop(self, count) -> None:
+        with self._lock:
+            self.dropped += count
+
+
+_writers = {}
+_writer_lock = threading.Lock()
+
+
+def get_writer(using=None) -> ActivityLogWriter:
+    """كاتب واحد لكل قاعدة بيانات (السجلات تُكتب في قاعدة الكائن المدقَّق نفسها)."""
+    using = using or DEFAULT_DB_ALIAS
+    writer = _writers.get(using)
+    if writer is None:
+        with _writer_lock:
+            writer = _writers.get(using)
+            if writer is None:
+                writer = _writers[using] = ActivityLogWriter(using=using)
+                atexit.register(writer.close)
+    return writer
+
+
+def close_writer(using=None) -> None:
+    """يفرغ كاتب قاعدة ويزيله (قبل حذف قاعدة مؤقتة مثلًا)."""
+    with _writer_lock:
+        writer = _writers.pop(using or DEFAULT_DB_ALIAS, None)
+    if writer is not None:
+        writer.close()
+
+
+def log_activity(action, message, actor=None, metadata=None, **extra) -> ActivityLog:
+    return get_writer().log(action, message, actor=actor, metadata=metadata, **extra)
@@ -1,41 +1,82 @@
 # app3/admin.py
 from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
 
+from config.export import ExportActionsMixin
+from config.facets import ActiveListFilter, ChoicesFacetListFilter, RelatedFacetListFilter
+from config.pagination import KeysetPaginationMixin
+from config.search import FullTextSearchMixin
+
+from . import audit
 from .models import Project, Task, Comment, ActivityLog
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ("name", "owner", "is_active", "created_at")
+    list_select_related = ("owner",)
     search_fields = ("name", "owner__username", "owner__email")
-    list_filter = ("is_active",)
+    list_filter = (ActiveListFilter,)
     ordering = ("name",)
     readonly_fields = ("id", "created_at", "updated_at")
-    filter_horizontal = ("members",)
+    autocomplete_fields = ("owner", "members")
 
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(KeysetPaginationMixin, FullTextSearchMixin, ExportActionsMixin, admin.ModelAdmin):
     list_display = ("title", "project", "status", "priority", "assigned_to", "due_date", "progress", "is_active")
-    list_filter = ("status", "priority", "project", "is_active")
+    list_select_related = ("project", "assigned_to")
+    list_filter = (
+        ("status", ChoicesFacetListFilter),
+        ("priority", ChoicesFacetListFilter),
+        ("project", RelatedFacetListFilter),
+        ActiveListFilter,
+    )
     search_fields = ("title", "project__name", "assigned_to__username", "assigned_to__email")
+    fulltext_related = ("project",)
+    autocomplete_fields = ("project", "created_by", "assigned_to")
+    export_fields = (
+        "id", "title", "project__name", "status", "priority", "assigned_to__username",
+        "created_by__username", "due_date", "progress", "is_active", "created_at",
+    )
     ordering = ("-created_at",)
     readonly_fields = ("id", "created_at", "updated_at")
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(KeysetPaginationMixin, FullTextSearchMixin, admin.ModelAdmin):
     list_display = ("task", "author", "created_at", "is_active")
-    list_filter = ("created_at", "is_active")
+    list_select_related = ("task", "author")
+    list_filter = ("created_at", ActiveListFilter)
     search_fields = ("task__title", "author__username", "author__email", "body")
+    fulltext_related = ("task",)
+    autocomplete_fields = ("task", "author")
     ordering = ("-created_at",)
     readonly_fields = ("id", "created_at", "updated_at")
 
 
+class AuditedModelListFilter(admin.SimpleListFilter):
+    """الخيارات من سجل التدقيق لا من SELECT DISTINCT على ملايين الصفوف؛ التصفية تستخدم فهرس metadata_model."""
+
+    title = _("النموذج")
+    parameter_name = "metadata_model"
+
+    def lookups(self, request, model_admin):
+        return [(model._meta.label_lower, model._meta.verbose_name) for model in audit.registered_models()]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(metadata_model=self.value())
+        return queryset
+
+
 @admin.register(ActivityLog)
-class ActivityLogAdmin(admin.ModelAdmin):
-    list_display = ("action", "actor", "message", "created_at")
-    list_filter = ("action", "created_at")
+class ActivityLogAdmin(KeysetPaginationMixin, ExportActionsMixin, admin.ModelAdmin):
+    # سجل كائن واحد: ?metadata_pk=<المعرف> (فهرس metadata_pk)
+    list_display = ("action", "actor", "message", "metadata_model", "created_at")
+    list_select_related = ("actor",)
+    list_filter = ("action", AuditedModelListFilter, "created_at")
     search_fields = ("message", "actor__username", "actor__email")
+    export_fields = ("id", "created_at", "action", "actor__username", "message", "metadata")
     ordering = ("-created_at",)
     readonly_fields = ("id", "created_at", "updated_at")
@@ -7,3 +7,8 @@ class App3Config(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "APP3"
     verbose_name = _("التطبيق الثالث")
+
+    def ready(self):
+        from . import audit, search  # noqa: F401  (تسجيل فهرس البحث وإشاراته)
+
+        audit.autodiscover()
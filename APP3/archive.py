@@ -0,0 +1,317 @@
+# app3/archive.py
+"""
+أرشفة البيانات الباردة: سجلات النشاط القديمة، والمهام المنتهية (DONE/CANCELED) مع تعليقاتها.
+
+الصفوف الأقدم من ARCHIVE["RETENTION_DAYS"] تُنقل على دفعات إلى ملفات JSONL مضغوطة مقسمة بالشهر:
+
+    ARCHIVE["DIR"]/APP3.task/2024/2024-03.jsonl.gz
+
+كل دفعة تُلحق بالملف كعضو gzip مستقل (الملف يبقى صالحًا لـ zcat)، وموضع بدايته يُحفظ في
+ArchivedRecord مع معرف الصف، فقراءة صف واحد تفك عضوًا واحدًا لا الملف كله.
+
+كل دفعة:
+1. تُقرأ الصفوف وتُكتب إلى الملف (fsync) خارج أي معاملة.
+2. في معاملة قصيرة: يُعاد فحص الأهلية (مهمة أُعيد فتحها، أو أُضيف لها تعليق بعد القراءة، لا تُحذف)،
+   وتُضاف مدخلات الفهرس وتُحذف الصفوف.
+الانقطاع بين الخطوتين يترك أسطرًا يتيمة في الملف لا يشير إليها الفهرس، والتشغيل التالي يكمل من حيث توقف.
+لا يُحتفظ بقفل الكتابة إلا أثناء الخطوة الثانية، مع استراحة بين الدفعات (PAUSE) للكتّاب الآخرين.
+كل القراءات أثناء الأرشفة من default لا من نسخة القراءة.
+
+الحذف لا يُدقَّق (ليس حذفًا من مستخدم)، ويحدّث فهرس البحث وإحصاءات المشاريع (ProjectStats تعدّ المهام الحية فقط)،
+وبعده تُحدَّث إحصاءات المخطِّط (ANALYZE) للجداول المؤرشفة.
+
+القراءة: get(model, pk) لصف حي أو مؤرشف، وiter_archived() للمؤرشف، و
+ActivityLog.objects.for_object(label, pk, include_archived=True) لسجل تدقيق كائن كاملًا.
+"""
+import gzip
+import itertools
+import json
+import os
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import timedelta, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import locks
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from config.db.transactions import atomic_immediate
+from config.routers import use_primary
+
+from . import audit
+from .models import ActivityLog, ArchivedRecord, Comment, Task
+
+DEFAULTS = {
+    "DIR": None,  # الافتراضي: BASE_DIR/var/archive
+    "RETENTION_DAYS": {"APP3.ActivityLog": 180, "APP3.Task": 365},
+    "BATCH_SIZE": 1000,
+    "PAUSE": 0.05,  # ثوانٍ بين الدفعات
+}
+
+_READ_CHUNK = 64 * 1024
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "ARCHIVE", {})}
+
+
+def archive_dir(config=None) -> Path:
+    config = config or get_config()
+    return Path(config["DIR"] or Path(settings.BASE_DIR) / "var" / "archive")
+
+
+@dataclass(frozen=True)
+class Policy:
+    model: type
+    # عمر الصف يُحسب بهذا الحقل؛ التقسيم على الملفات بـ created_at دائمًا
+    age_field: str = "created_at"
+    condition: Q = field(default_factory=Q)
+    # مرجع يُفهرس للبحث بغير المعرف: (عمود، مفتاح داخل JSON أو None)
+    ref: tuple = (None, None)
+    # نماذج تابعة تُؤرشف وتُحذف قبل الأب: (النموذج، حقل المفتاح الأجنبي، ref)
+    children: tuple = ()
+
+    @property
+    def label(self) -> str:
+        return self.model._meta.label
+
+    def eligible(self, cutoff):
+        return self.model._base_manager.filter(self.condition, **{f"{self.age_field}__lt": cutoff})
+
+
+POLICIES = {
+    policy.label: policy
+    for policy in (
+        Policy(ActivityLog, ref=("metadata", "pk")),
+        Policy(
+            Task,
+            age_field="updated_at",
+            condition=Q(status__in=[Task.Status.DONE, Task.Status.CANCELED]),
+            ref=("project_id", None),
+            children=((Comment, "task_id", ("task_id", None)),),
+        ),
+    )
+}
+
+
+# ---------- الكتابة ----------
+
+
+def _fields(model):
+    return [f for f in model._meta.concrete_fields if not f.generated]
+
+
+def _ref_value(row, ref):
+    column, key = ref
+    if column is None:
+        return ""
+    value = row[column]
+    if key is not None:
+        value = value.get(key) if isinstance(value, dict) else None
+    return "" if value is None else str(value)
+
+
+def _partition(model, created) -> str:
+    created = created.astimezone(dt_timezone.utc)
+    return f"{model._meta.label_lower}/{created:%Y}/{created:%Y-%m}.jsonl.gz"
+
+
+def _append(root, rows_by_partition) -> dict:
+    """يكتب كل مجموعة عضو gzip في ملفها؛ يعيد {partition: موضع بداية العضو}."""
+    offsets = {}
+    for partition, rows in rows_by_partition.items():
+        path = root / partition
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n" for row in rows)
+        with open(path, "ab") as fh:
+            offsets[partition] = fh.tell()
+            fh.write(gzip.compress(payload.encode("utf-8")))
+            fh.flush()
+            os.fsync(fh.fileno())
+    return offsets
+
+
+def _write_rows(root, model, rows, ref):
+    """يكتب صفوف نموذج ويعيد مدخلات الفهرس (غير محفوظة) لكل صف."""
+    by_partition = {}
+    for row in rows:
+        by_partition.setdefault(_partition(model, row["created_at"]), []).append(row)
+    offsets = _append(root, by_partition)
+    label = model._meta.label
+    return {
+        row["id"]: ArchivedRecord(
+            model=label,
+            object_id=str(row["id"]),
+            ref=_ref_value(row, ref),
+            created_at=row["created_at"],
+            path=partition,
+            offset=offsets[partition],
+        )
+        for partition, group in by_partition.items()
+        for row in group
+    }
+
+
+def _rows(model, queryset):
+    names = [f.attname for f in _fields(model)]
+    return list(queryset.order_by().values(*names))
+
+
+def archive_batch(policy, cutoff, batch_size, root) -> int:
+    """يؤرشف دفعة واحدة ويعيد عدد صفوف النموذج الأب المؤرشفة (0 = لا شيء متبقٍ)."""
+    eligible = policy.eligible(cutoff)
+    pks = list(eligible.order_by(policy.age_field, "pk").values_list("pk", flat=True)[:batch_size])
+    if not pks:
+        return 0
+
+    # 1) خارج المعاملة: قراءة الصفوف وكتابتها إلى الملفات
+    records = _write_rows(root, policy.model, _rows(policy.model, policy.model._base_manager.filter(pk__in=pks)), policy.ref)
+    child_records = []
+    for child, fk, ref in policy.children:
+        child_rows = _rows(child, child._base_manager.filter(**{f"{fk}__in": pks}))
+        child_records.append((child, fk, _write_rows(root, child, child_rows, ref)))
+
+    # 2) معاملة قصيرة: إعادة فحص الأهلية ثم الفهرس والحذف
+    with atomic_immediate(), audit.suspend():
+        still = set(eligible.filter(pk__in=pks).values_list("pk", flat=True))
+        for child, fk, child_index in child_records:
+            # تابع أُضيف بعد القراءة لم يُكتب في الملف، وحذف الأب يحذفه معه (CASCADE):
+            # يبقى الأب حيًا هذه المرة، والدفعة التالية تعيد قراءته مع توابعه
+            late = child._base_manager.filter(**{f"{fk}__in": still}).exclude(pk__in=list(child_index))
+            still -= set(late.values_list(fk, flat=True))
+        if not still:
+            return len(pks)
+        for child, fk, child_index in child_records:
+            archived = list(child._base_manager.filter(**{f"{fk}__in": still}).values_list("pk", flat=True))
+            ArchivedRecord.objects.bulk_create([child_index[pk] for pk in archived], ignore_conflicts=True)
+            child._base_manager.filter(pk__in=archived).delete()
+        ArchivedRecord.objects.bulk_create([records[pk] for pk in still], ignore_conflicts=True)
+        policy.model._base_manager.filter(pk__in=still).delete()
+    return len(pks)
+
+
+class ArchiveLocked(Exception):
+    pass
+
+
+def run(labels=None, batch_size=None, retention_days=None, max_batches=None, pause=None, now=None, stdout=None):
+    """يؤرشف كل السياسات (أو labels) حتى لا يبقى صف مؤهل؛ يعيد {label: عدد الصفوف}."""
+    config = get_config()
+    batch_size = batch_size or config["BATCH_SIZE"]
+    pause = config["PAUSE"] if pause is None else pause
+    now = now or timezone.now()
+    root = archive_dir(config)
+    root.mkdir(parents=True, exist_ok=True)
+    totals = {}
+    # الأهلية تُقرأ من default: صف قرأته نسخة متأخرة ربما أُرشف أو تغيّر
+    with open(root / ".lock", "wb") as lock_file, use_primary():
+        # تشغيل واحد في كل مرة: تشغيلان متوازيان قد يُلحقان بالملف نفسه
+        if not locks.lock(lock_file, locks.LOCK_EX | locks.LOCK_NB):
+            raise ArchiveLocked(f"Another archive run holds {root / '.lock'}")
+        try:
+            for label in labels or POLICIES:
+                policy = POLICIES[label]
+                days = retention_days if retention_days is not None else config["RETENTION_DAYS"][label]
+                cutoff = now - timedelta(days=days)
+                totals[label] = 0
+                for batch_no in itertools.count():
+                    if max_batches is not None and batch_no >= max_batches:
+                        break
+                    archived = archive_batch(policy, cutoff, batch_size, root)
+                    if not archived:
+                        break
+                    totals[label] += archived
+                    if stdout is not None:
+                        stdout.write(f"{label}: {totals[label]} rows archived")
+                    if pause:
+                        time.sleep(pause)
+                if totals[label]:
+                    refresh_statistics([policy.model, *(child for child, _, _ in policy.children)])
+        finally:
+            locks.unlock(lock_file)
+    return totals
+
+
+def refresh_statistics(models, using="default"):
+    """
+    ANALYZE للجداول بعد حذف صفوف كثيرة، حتى لا يبقى عدد صفوفها المقدَّر (estimate_table_rows في
+    قوائم الإدارة) على حجمها قبل الأرشفة. على SQLite يُحلَّل بعينة محدودة (analysis_limit) لا بمسح كامل.
+    """
+    connection = connections[using]
+    if connection.vendor not in ("sqlite", "postgresql"):
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("PRAGMA analysis_limit = 1000")
+        for model in models:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+
+# ---------- القراءة ----------
+
+
+def read_member(path, offset) -> list:
+    """يفك عضو gzip واحدًا من موضعه ويعيد صفوفه."""
+    decompressor = zlib.decompressobj(wbits=31)
+    chunks = []
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        while not decompressor.eof:
+            data = fh.read(_READ_CHUNK)
+            if not data:
+                break
+            chunks.append(decompressor.decompress(data))
+    return [json.loads(line) for line in b"".join(chunks).decode("utf-8").splitlines() if line]
+
+
+def _instance(model, row):
+    instance = model(**{f.attname: f.to_python(row.get(f.attname)) for f in _fields(model)})
+    instance._state.adding = False
+    instance.is_archived = True
+    return instance
+
+
+def load(records, root=None) -> list:
+    """كائنات المدخلات من ملفاتها؛ كل عضو يُفك مرة واحدة مهما كثرت صفوفه المطلوبة."""
+    root = root or archive_dir()
+    models_by_label = {label: policy.model for label, policy in POLICIES.items()}
+    for policy in POLICIES.values():
+        models_by_label.update({child._meta.label: child for child, _, _ in policy.children})
+    wanted = {}
+    for record in records:
+        wanted.setdefault((record.path, record.offset), []).append(record)
+    found = {}
+    for (path, offset), group in wanted.items():
+        rows = {str(row["id"]): row for row in read_member(root / path, offset)}
+        for record in group:
+            row = rows.get(record.object_id)
+            if row is not None:
+                found[record.pk] = _instance(models_by_label[record.model], row)
+    return [found[record.pk] for record in records if record.pk in found]
+
+
+def iter_archived(model, **filters):
+    """الكائنات المؤرشفة لنموذج، بترتيب created_at؛ filters على حقول ArchivedRecord (ref، created_at__gte...)."""
+    records = ArchivedRecord.objects.filter(model=model._meta.label, **filters).order_by("created_at", "pk")
+    for chunk in iter(lambda it=records.iterator(chunk_size=500): list(itertools.islice(it, 500)), []):
+        yield from load(chunk)
+
+
+def get(model, pk):
+    """الصف الحي إن وُجد، وإلا المؤرشف؛ DoesNotExist إن لم يوجد في أي منهما."""
+    try:
+        return model._default_manager.get(pk=pk)
+    except model.DoesNotExist:
+        pass
+    object_id = str(model._meta.pk.to_python(pk))
+    record = ArchivedRecord.objects.filter(model=model._meta.label, object_id__in={object_id, str(pk)}).first()
+    instances = load([record]) if record is not None else []
+    if not instances:
+        raise model.DoesNotExist(f"{model._meta.object_name} {pk} is neither live nor archived.")
+    return instances[0]
+
@@ -0,0 +1,204 @@
+# app3/audit.py
+"""
+تدقيق التغييرات على النماذج المسجلة في AUDIT["MODELS"] (من APP1 وAPP2 وAPP3).
+
+- عند تحميل الكائن (post_init) تُحفظ لقطة من قيم الحقول المتتبعة.
+- عند الحفظ يُقارن الكائن باللقطة، وتُكتب الحقول المتغيرة فقط في ActivityLog.metadata:
+      {"model": "APP3.task", "pk": "...", "changes": {"status": ["todo", "done"]}}
+  الحفظ بلا تغيير لا يُسجَّل. الإنشاء والحذف يُسجلان بلا changes.
+- السجل لا يُكتب داخل الطلب: يُسلَّم بعد نجاح المعاملة (on_commit) إلى ActivityLogWriter
+  الذي يكتب على دفعات من خيط خلفي.
+- المنفّذ (actor) من AuditMiddleware (مستخدم الطلب) أو audit_actor(user) في الأوامر والمهام.
+
+ما لا يمر بالإشارات لا يُدقَّق: QuerySet.update وbulk_create والحفظ الخام (loaddata).
+الأمر bench_audit يقيس كلفة التدقيق على Task.save() مقابل AUDIT["BUDGET_US"].
+"""
+import contextlib
+import contextvars
+import functools
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_in
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .activity import get_writer
+from .models import ActivityLog
+
+DEFAULTS = {
+    "ENABLED": True,
+    # {"APP3.Task": {"exclude": ["description"]}}؛ fields يحدد الحقول صراحةً بدل كل الحقول
+    "MODELS": {},
+    # الحد الأعلى لكلفة التدقيق على حفظ واحد (ميكروثانية)، يتحقق منه bench_audit والاختبارات
+    "BUDGET_US": 150,
+}
+
+# تتغير في كل حفظ فلا معنى لتسجيلها
+ALWAYS_EXCLUDED = {"created_at", "updated_at"}
+
+_registry = {}
+_labels = {}
+_actor = contextvars.ContextVar("audit_actor", default=None)
+_suspended = contextvars.ContextVar("audit_suspended", default=False)
+_encoder = DjangoJSONEncoder()
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "AUDIT", {})}
+
+
+def register(model, fields=None, exclude=()):
+    """يتتبع الحقول المحلية غير المتعددة للنموذج (attname، مثل project_id) ويربط الإشارات."""
+    excluded = ALWAYS_EXCLUDED | set(exclude)
+    attnames = tuple(
+        field.attname
+        for field in model._meta.concrete_fields
+        if not field.primary_key and field.name not in excluded and (fields is None or field.name in fields)
+    )
+    # الاسم المعروض يُترجم مرة واحدة هنا لا في كل حفظ
+    _registry[model] = attnames
+    _labels[model] = (model._meta.label_lower, str(model._meta.verbose_name))
+    for signal, handler in receivers():
+        signal.connect(handler, sender=model, dispatch_uid=dispatch_uid(model))
+
+
+def receivers():
+    return ((post_init, _take_snapshot), (post_save, _audit_save), (post_delete, _audit_delete))
+
+
+def dispatch_uid(model) -> str:
+    return f"audit-{model._meta.label_lower}"
+
+
+def autodiscover() -> None:
+    for label, options in get_config()["MODELS"].items():
+        register(apps.get_model(label), **options)
+
+
+def registered_models():
+    return tuple(_registry)
+
+
+# ---------- المنفّذ ----------
+
+
+@contextlib.contextmanager
+def audit_actor(user):
+    """ينسب كل التغييرات داخل الكتلة إلى user (للأوامر والمهام الخلفية)."""
+    token = _actor.set(lambda: user)
+    try:
+        yield
+    finally:
+        _actor.reset(token)
+
+
+@contextlib.contextmanager
+def suspend():
+    """يوقف التدقيق داخل الكتلة (الاستيراد والترحيل والقياس)."""
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def current_actor_id():
+    resolve = _actor.get()
+    user = resolve() if resolve is not None else None
+    if user is None or not getattr(user, "is_authenticated", False):
+        return None
+    return user.pk
+
+
+class AuditMiddleware:
+    """يُوضع بعد AuthenticationMiddleware؛ request.user لا يُحمَّل إلا إن حدث تغيير مدقَّق."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _actor.set(lambda: getattr(request, "user", None))
+        try:
+            return self.get_response(request)
+        finally:
+            _actor.reset(token)
+
+
+# ---------- الإشارات ----------
+
+
+def _values(instance, attnames):
+    values = instance.__dict__
+    # الحقول المؤجلة (only/defer) غير موجودة في __dict__ فلا تُقارن
+    return {name: values[name] for name in attnames if name in values}
+
+
+def _jsonable(value):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    try:
+        return _encoder.default(value)
+    except TypeError:
+        return str(value)
+
+
+def _take_snapshot(sender, instance, **kwargs):
+    instance._audit_snapshot = _values(instance, _registry[sender])
+
+
+def _audit_save(sender, instance, created, raw=False, using=None, update_fields=None, **kwargs):
+    attnames = _registry[sender]
+    old = instance.__dict__.get("_audit_snapshot")
+    new = instance._audit_snapshot = _values(instance, attnames)
+    if raw or _suspended.get() or not get_config()["ENABLED"]:
+        return
+    if created:
+        _record(ActivityLog.Action.CREATE, sender, instance.pk, None, using)
+        return
+    if old is None:
+        return
+    if update_fields is not None:
+        names = {sender._meta.get_field(name).attname for name in update_fields}
+        new = {name: value for name, value in new.items() if name in names}
+    changes = {
+        name: [_jsonable(old[name]), _jsonable(value)]
+        for name, value in new.items()
+        if name in old and old[name] != value
+    }
+    if changes:
+        _record(ActivityLog.Action.UPDATE, sender, instance.pk, changes, using)
+
+
+def _audit_delete(sender, instance, using=None, origin=None, **kwargs):
+    if _suspended.get() or not get_config()["ENABLED"]:
+        return
+    _record(ActivityLog.Action.DELETE, sender, instance.pk, None, using)
+
+
+def _record(action, model, pk, changes, using):
+    label, verbose_name = _labels[model]
+    pk = str(pk)
+    metadata = {"model": label, "pk": pk}
+    if changes:
+        metadata["changes"] = changes
+    # قاموس لا كائن: بناء ActivityLog (والمعرف والقيم الافتراضية) يتم في الخيط الخلفي
+    entry = {
+        "action": action,
+        "message": f"{verbose_name} {pk}"[:500],
+        "actor_id": current_actor_id(),
+        "metadata": metadata,
+    }
+    # لا يُسجَّل تغيير لم يُثبَّت؛ وخارج المعاملات يُنفذ on_commit فورًا
+    transaction.on_commit(functools.partial(get_writer(using).enqueue, entry), using=using)
+
+
+@receiver(user_logged_in, dispatch_uid="audit-login")
+def _audit_login(sender, request, user, **kwargs):
+    if _suspended.get() or not get_config()["ENABLED"]:
+        return
+    ip = request.META.get("REMOTE_ADDR") if request is not None else None
+    metadata = {"ip": ip} if ip else {}
+    get_writer().log(ActivityLog.Action.LOGIN, user.get_username(), actor=user, metadata=metadata)
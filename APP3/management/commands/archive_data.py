@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from APP3 import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "نقل سجلات النشاط القديمة والمهام المنتهية (مع تعليقاتها) إلى ملفات JSONL مضغوطة في ARCHIVE['DIR'] "
+        "على دفعات قصيرة. آمن للإيقاف وإعادة التشغيل: كل دفعة تُثبَّت مستقلة."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", action="append", choices=list(archive.POLICIES), help="الافتراضي: كل السياسات")
+        parser.add_argument("--batch-size", type=int, help="الافتراضي: ARCHIVE['BATCH_SIZE']")
+        parser.add_argument("--older-than-days", type=int, help="بدل ARCHIVE['RETENTION_DAYS'] لكل النماذج")
+        parser.add_argument("--max-batches", type=int, help="الحد الأقصى للدفعات لكل نموذج في هذا التشغيل")
+        parser.add_argument("--pause", type=float, help="ثوانٍ بين الدفعات؛ الافتراضي: ARCHIVE['PAUSE']")
+        parser.add_argument("--dry-run", action="store_true", help="عدّ الصفوف المؤهلة دون نقلها")
+
+    def handle(self, *args, **options):
+        labels = options["model"] or list(archive.POLICIES)
+        if options["dry_run"]:
+            config = archive.get_config()
+            now = timezone.now()
+            for label in labels:
+                days = options["older_than_days"]
+                days = config["RETENTION_DAYS"][label] if days is None else days
+                count = archive.POLICIES[label].eligible(now - timedelta(days=days)).count()
+                self.stdout.write(f"{label}: {count} rows eligible (older than {days} days)")
+            return
+        try:
+            totals = archive.run(
+                labels,
+                batch_size=options["batch_size"],
+                retention_days=options["older_than_days"],
+                max_batches=options["max_batches"],
+                pause=options["pause"],
+                stdout=self.stdout if options["verbosity"] > 1 else None,
+            )
+        except archive.ArchiveLocked as exc:
+            raise CommandError(str(exc)) from exc
+        for label, count in totals.items():
+            self.stdout.write(f"{label}: {count} rows archived to {archive.archive_dir()}")
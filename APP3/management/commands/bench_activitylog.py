@@ -0,0 +1,61 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from APP3.activity import ActivityLogWriter
+from APP3.models import ActivityLog
+
+
+class Command(BaseCommand):
+    help = "قياس أداء كتابة سجل النشاط: إدراج صف بصف مقابل الكاتب المُجمّع (bulk_create)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=100_000)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--flush-interval", type=float, default=1.0)
+        parser.add_argument("--skip-per-row", action="store_true", help="تخطي قياس الإدراج صفًا بصف")
+        parser.add_argument("--keep", action="store_true", help="عدم حذف الصفوف بعد القياس")
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        run_id = uuid.uuid4().hex
+        results = []
+
+        if not options["skip_per_row"]:
+            started = time.perf_counter()
+            for i in range(count):
+                ActivityLog.objects.create(
+                    action=ActivityLog.Action.OTHER,
+                    message=f"benchmark per-row {i}",
+                    metadata={"benchmark": run_id},
+                )
+            results.append(("per-row", count, time.perf_counter() - started, None))
+
+        writer = ActivityLogWriter(
+            sync=False,
+            batch_size=options["batch_size"],
+            flush_interval=options["flush_interval"],
+        )
+        started = time.perf_counter()
+        for i in range(count):
+            writer.log(ActivityLog.Action.OTHER, f"benchmark batched {i}", metadata={"benchmark": run_id})
+        enqueued = time.perf_counter() - started
+        writer.close()
+        results.append(("batched", count, time.perf_counter() - started, enqueued))
+
+        written = ActivityLog.objects.filter(metadata__benchmark=run_id).count()
+        expected = count * len(results)
+
+        for name, rows, elapsed, producer in results:
+            line = f"{name:>8}: {rows} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)"
+            if producer is not None:
+                line += f", producer time {producer:.2f}s ({producer / rows * 1e6:.1f} µs/entry)"
+            self.stdout.write(line)
+        if len(results) == 2:
+            self.stdout.write(f" speedup: {results[0][2] / results[1][2]:.1f}x")
+        if written != expected:
+            self.stderr.write(f"expected {expected} rows, found {written}")
+
+        if not options["keep"]:
+            ActivityLog.objects.filter(metadata__benchmark=run_id).delete()
@@ -0,0 +1,118 @@
+import contextlib
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.signals import post_init, post_save
+from django.test.utils import override_settings
+
+from APP3 import audit
+from APP3.activity import close_writer
+from APP3.models import ActivityLog, Project, Task
+from config.dbstats import temporary_sqlite_database
+
+
+@contextlib.contextmanager
+def timed_receivers(model, spent):
+    """يستبدل مستقبلات التدقيق للنموذج بنسخ تجمع زمنها في spent[signal]."""
+
+    def timed(signal, handler):
+        def receiver(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                spent[signal] += time.perf_counter() - started
+
+        return receiver
+
+    uid = audit.dispatch_uid(model)
+    for signal, handler in audit.receivers():
+        spent[signal] = 0.0
+        signal.disconnect(sender=model, dispatch_uid=uid)
+        signal.connect(timed(signal, handler), sender=model, dispatch_uid=uid, weak=False)
+    try:
+        yield spent
+    finally:
+        for signal, handler in audit.receivers():
+            signal.disconnect(sender=model, dispatch_uid=uid)
+            signal.connect(handler, sender=model, dispatch_uid=uid)
+
+
+class Command(BaseCommand):
+    help = (
+        "قياس كلفة التدقيق على Task.save(): زمن مستقبلات التدقيق داخل الحفظ مقارنة بـ AUDIT['BUDGET_US']، "
+        "والفرق الكلي مقابل الحفظ مع audit.suspend() للاطلاع. الكاتب الخلفي لا يُفرَّغ أثناء القياس "
+        "(على معالج واحد ينافس الطلب على المعالج وقفل SQLite)، وتُقاس كلفته بعده."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=200)
+        parser.add_argument("--rounds", type=int, default=10, help="جولات متناوبة لكل وضع")
+        parser.add_argument("--budget-us", type=float, help="الافتراضي: AUDIT['BUDGET_US']")
+
+    def handle(self, *args, **options):
+        budget = options["budget_us"] or audit.get_config()["BUDGET_US"]
+        if Task not in audit.registered_models():
+            raise CommandError("APP3.Task is not registered in AUDIT['MODELS'].")
+        saves = options["tasks"] * options["rounds"]
+        # دفعة واحدة تتسع لكل السجلات: لا كتابة قبل انتهاء القياس
+        deferred = {
+            **getattr(settings, "ACTIVITY_LOG_WRITER", {}),
+            "SYNC": False,
+            "FLUSH_INTERVAL": 3600,
+            "BATCH_SIZE": saves + 1,
+            "MAX_QUEUE_SIZE": saves + 1,
+        }
+        with temporary_sqlite_database("bench_audit") as alias, override_settings(ACTIVITY_LOG_WRITER=deferred):
+            try:
+                results = self.run(alias, options)
+                started = time.perf_counter()
+                close_writer(alias)
+                drain = time.perf_counter() - started
+                logged = ActivityLog.objects.using(alias).filter(action=ActivityLog.Action.UPDATE).count()
+            finally:
+                close_writer(alias)
+
+        handler_us = results["receivers"] / saves * 1e6
+        # أفضل جولة لكل وضع: الضجيج (جدولة، ذاكرة مؤقتة) يضيف وقتًا ولا ينقصه
+        plain, audited = min(results["suspended"]), min(results["audited"])
+        self.stdout.write(f"Task.save() without audit: {plain:8.1f} µs (best of {options['rounds']} rounds)")
+        self.stdout.write(f"Task.save() with audit:    {audited:8.1f} µs (difference {audited - plain:+.1f} µs, noisy)")
+        self.stdout.write(f"audit receivers per save:  {handler_us:8.1f} µs (budget {budget:.0f} µs)")
+        self.stdout.write(f"snapshot per loaded row:   {results['snapshot'] * 1e6:8.1f} µs")
+        self.stdout.write(f"background writer:         {drain / max(logged, 1) * 1e6:8.1f} µs per entry (off-request)")
+        self.stdout.write(f"update entries written:    {logged} / {saves}")
+        if logged != saves:
+            raise CommandError(f"expected {saves} audit entries, found {logged}")
+        if handler_us > budget:
+            raise CommandError(f"audit overhead {handler_us:.1f} µs exceeds budget {budget:.0f} µs")
+
+    def run(self, alias, options):
+        with audit.suspend():
+            project = Project.objects.using(alias).create(name="قياس التدقيق")
+            Task.objects.using(alias).bulk_create_with_stats(
+                [Task(project=project, title=f"مهمة {i}") for i in range(options["tasks"])]
+            )
+        results = {"audited": [], "suspended": [], "receivers": 0.0}
+        spent = {}
+        with timed_receivers(Task, spent):
+            tasks = list(Task.objects.using(alias).all())
+            results["snapshot"] = spent[post_init] / len(tasks)
+            for round_no in range(options["rounds"] * 2):
+                # تناوب الوضعين حتى لا يتحيز القياس لتسخين الذاكرة أو نمو قاعدة البيانات
+                mode = "audited" if round_no % 2 == 0 else "suspended"
+                before = spent[post_save]
+                started = time.perf_counter()
+                with audit.suspend() if mode == "suspended" else contextlib.nullcontext():
+                    self.save_all(tasks, round_no)
+                results[mode].append((time.perf_counter() - started) / len(tasks) * 1e6)
+                if mode == "audited":
+                    results["receivers"] += spent[post_save] - before
+        return results
+
+    @staticmethod
+    def save_all(tasks, round_no):
+        for task in tasks:
+            task.progress = round_no % 100 + 1
+            task.save()
@@ -0,0 +1,52 @@
+import os
+import time
+import tracemalloc
+
+from django.contrib import admin
+from django.core.management.base import BaseCommand
+
+from APP3.models import ActivityLog
+from config.dbstats import temporary_sqlite_database
+from config.export import export_fields_for, export_to_file
+
+
+class Command(BaseCommand):
+    help = "قياس التصدير المتدفق لسجل النشاط: الزمن وذروة الذاكرة عند أحجام متزايدة (يجب أن تبقى الذاكرة ثابتة)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10000,100000,1000000", help="أحجام مفصولة بفواصل")
+        parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument("--insert-batch", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options["sizes"].split(","))
+        fields = export_fields_for(ActivityLog, admin.site._registry.get(ActivityLog))
+
+        with temporary_sqlite_database("export_bench") as alias:
+            inserted = 0
+            for size in sizes:
+                while inserted < size:
+                    batch = min(options["insert_batch"], size - inserted)
+                    ActivityLog.objects.using(alias).bulk_create([
+                        ActivityLog(
+                            action=ActivityLog.Action.OTHER,
+                            message=f"benchmark export row {inserted + i}",
+                            metadata={"n": inserted + i, "source": "bench"},
+                        )
+                        for i in range(batch)
+                    ])
+                    inserted += batch
+
+                queryset = ActivityLog.objects.using(alias).order_by("-created_at")
+                tracemalloc.start()
+                started = time.perf_counter()
+                with open(os.devnull, "w", encoding="utf-8") as fh:
+                    rows = export_to_file(queryset, fields, fh, options["format"], options["chunk_size"])
+                elapsed = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.stdout.write(
+                    f"{rows:>9} rows: {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s), peak memory {peak / 1024 / 1024:.1f} MiB"
+                )
+
@@ -0,0 +1,84 @@
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+from django.db import connections, models, transaction
+
+from APP3.models import ActivityLog
+from config.dbstats import temporary_sqlite_database
+
+MODELS = ("APP3.task", "APP3.project", "APP2.asset", "APP2.assetassignment", "APP1.profile", "APP1.address")
+
+
+class Command(BaseCommand):
+    help = (
+        "قياس البحث في سجل النشاط بمعرف الكائن: json_extract على metadata (QuerySet عادي) "
+        "مقابل العمود المولّد المفهرس metadata_pk (ActivityLog.objects)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--objects", type=int, default=200_000, help="عدد الكائنات المختلفة (سجلات لكل كائن = rows / objects)")
+        parser.add_argument("--lookups", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=50_000)
+
+    def handle(self, *args, **options):
+        with temporary_sqlite_database("bench_metadata") as alias:
+            object_ids = self.populate(alias, options)
+            rng = random.Random(1)
+            targets = [rng.choice(object_ids) for _ in range(options["lookups"])]
+            indexed = ActivityLog.objects.using(alias)
+            # QuerySet عادي بلا إعادة كتابة: JSON_EXTRACT("metadata", '$."pk"') لكل صف
+            plain = models.QuerySet(ActivityLog, using=alias)
+            for name, queryset in (("json_extract", plain), ("generated", indexed)):
+                self.report(name, queryset, targets, alias)
+
+    def populate(self, alias, options):
+        connection = connections[alias]
+        ops = connection.ops
+        rng = random.Random(0)
+        object_ids = [uuid.UUID(int=rng.getrandbits(128)).hex for _ in range(options["objects"])]
+        fields = ("id", "is_active", "created_at", "updated_at", "action", "message", "metadata", "actor_id")
+        sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            ops.quote_name(ActivityLog._meta.db_table),
+            ", ".join(ops.quote_name(name) for name in fields),
+            ", ".join(["%s"] * len(fields)),
+        )
+        started = time.perf_counter()
+        moment = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        step = timedelta(seconds=3)
+        for offset in range(0, options["rows"], options["batch_size"]):
+            rows = []
+            for i in range(offset, min(offset + options["batch_size"], options["rows"])):
+                created = ops.adapt_datetimefield_value(moment + step * i)
+                metadata = {"model": rng.choice(MODELS), "pk": rng.choice(object_ids), "changes": {"progress": [i % 100, i % 100 + 1]}}
+                if i % 10 == 0:
+                    metadata["ip"] = f"10.{i % 250}.{i // 250 % 250}.{i % 7}"
+                rows.append((uuid.UUID(int=rng.getrandbits(128)).hex, True, created, created, "update", f"سجل {i}",
+                             json.dumps(metadata), None))
+            with transaction.atomic(using=alias), connection.cursor() as cursor:
+                cursor.executemany(sql, rows)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        self.stdout.write(f"populated {options['rows']:,} rows in {time.perf_counter() - started:.1f}s")
+        return object_ids
+
+    def report(self, name, queryset, targets, alias):
+        sample = queryset.filter(metadata__pk=targets[0]).order_by("-created_at")
+        sql, params = sample.query.sql_with_params()
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = "; ".join(row[-1] for row in cursor.fetchall())
+        timings, found = [], 0
+        for target in targets:
+            started = time.perf_counter()
+            found += len(list(queryset.filter(metadata__pk=target).order_by("-created_at").values_list("pk", flat=True)))
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        self.stdout.write(
+            f"{name:>12}: median {timings[len(timings) // 2] * 1000:9.2f} ms, max {timings[-1] * 1000:9.2f} ms, "
+            f"{found / len(targets):.1f} rows/lookup\n{'':>14}plan: {plan}"
+        )
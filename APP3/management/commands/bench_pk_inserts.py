@@ -0,0 +1,64 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from APP3.models import ActivityLog, Comment, Project, Task
+from config.dbstats import btree_stats, table_index_names, temporary_sqlite_database
+from config.ids import uuid7
+
+STRATEGIES = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+class Command(BaseCommand):
+    help = "قياس أداء الإدراج وحالة الفهارس لـ Task وComment وActivityLog مع uuid4 مقابل uuid7."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000, help="عدد الصفوف لكل نموذج")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--projects", type=int, default=100)
+
+    def handle(self, *args, **options):
+        for strategy, make_id in STRATEGIES.items():
+            with temporary_sqlite_database(f"bench_{strategy}") as alias:
+                self.stdout.write(self.style.MIGRATE_HEADING(f"== {strategy} =="))
+                self.run(alias, make_id, options)
+
+    def run(self, alias, make_id, options):
+        rows, batch_size = options["rows"], options["batch_size"]
+        projects = [Project(id=make_id(), name=f"مشروع {i}") for i in range(options["projects"])]
+        Project.objects.using(alias).bulk_create(projects)
+
+        task_ids = []
+
+        def tasks(start, stop):
+            for i in range(start, stop):
+                task = Task(id=make_id(), project=projects[i % len(projects)], title=f"مهمة {i}")
+                task_ids.append(task.id)
+                yield task
+
+        def comments(start, stop):
+            for i in range(start, stop):
+                yield Comment(id=make_id(), task_id=task_ids[(i * 7919) % len(task_ids)], body=f"تعليق {i}")
+
+        def logs(start, stop):
+            for i in range(start, stop):
+                yield ActivityLog(id=make_id(), message=f"سجل {i}", metadata={"i": i})
+
+        for model, factory in ((Task, tasks), (Comment, comments), (ActivityLog, logs)):
+            manager = model.objects.using(alias)
+            started = time.perf_counter()
+            for start in range(0, rows, batch_size):
+                manager.bulk_create(factory(start, min(start + batch_size, rows)), batch_size=batch_size)
+            elapsed = time.perf_counter() - started
+
+            names = table_index_names(model, alias)
+            stats = btree_stats(alias, set(names))
+            self.stdout.write(f"{model.__name__}: {rows} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s)")
+            for name in names:
+                entry = stats.get(name)
+                if entry:
+                    self.stdout.write(
+                        f"    {name:<45} pages={entry['pages']:>7} fill={entry['fill']:>4.0%} "
+                        f"frag={entry['fragmentation']:>4.0%}"
+                    )
@@ -0,0 +1,108 @@
+import multiprocessing
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from APP3.models import ActivityLog, Project, Task
+from config.db.transactions import atomic_immediate
+from config.dbstats import temporary_sqlite_database
+
+CONFIGS = {
+    # محرك Django الافتراضي: journal=DELETE، معاملات مؤجلة، اتصال جديد لكل طلب
+    "stock": {"ENGINE": "django.db.backends.sqlite3", "OPTIONS": {}, "CONN_MAX_AGE": 0},
+    # محرك المشروع: WAL + PRAGMA + إعادة استخدام الاتصال، والكتابة بـ atomic_immediate (BEGIN IMMEDIATE)
+    "tuned": {"ENGINE": "config.db.backends.sqlite3", "OPTIONS": {"timeout": 20}, "CONN_MAX_AGE": 600},
+}
+
+
+def _is_lock_error(exc):
+    message = str(exc).lower()
+    return "locked" in message or "busy" in message
+
+
+def run_worker(alias, worker, duration, write_ratio):
+    """يحاكي عامل WSGI: كتابة سجل نشاط (قراءة ثم كتابة في معاملة) أو قراءة قائمة مهام، مع إنهاء الطلب بعد كل عملية."""
+    rng = random.Random(worker)
+    stats = {"writes": 0, "reads": 0, "lock_errors": 0, "latencies": []}
+    connection = connections[alias]
+    tuned = connection.settings_dict["ENGINE"] == CONFIGS["tuned"]["ENGINE"]
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if rng.random() < write_ratio:
+                with (atomic_immediate if tuned else transaction.atomic)(using=alias):
+                    previous = ActivityLog.objects.using(alias).order_by("-created_at").values_list("pk", flat=True).first()
+                    ActivityLog.objects.using(alias).create(
+                        message=f"worker {worker}", metadata={"previous": str(previous) if previous else None}
+                    )
+                stats["writes"] += 1
+            else:
+                list(Task.objects.using(alias).select_related("project").order_by("-created_at")[:50])
+                stats["reads"] += 1
+        except OperationalError as exc:
+            if not _is_lock_error(exc):
+                raise
+            stats["lock_errors"] += 1
+        stats["latencies"].append(time.perf_counter() - started)
+        # ما يفعله Django عند request_finished: إغلاق الاتصال إن انتهى عمره (CONN_MAX_AGE)
+        connection.close_if_unusable_or_obsolete()
+    connection.close()
+    return stats
+
+
+class Command(BaseCommand):
+    help = "قياس التزامن على SQLite: عمال يكتبون ActivityLog ويقرؤون Task، بالمحرك الافتراضي مقابل المحرك المضبوط."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--mode", choices=["processes", "threads"], default="processes")
+        parser.add_argument("--duration", type=float, default=10.0, help="ثوانٍ لكل إعداد")
+        parser.add_argument("--write-ratio", type=float, default=0.3)
+        parser.add_argument("--tasks", type=int, default=2000)
+        parser.add_argument("--config", action="append", choices=sorted(CONFIGS), help="الافتراضي: الكل")
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{options['workers']} {options['mode']}, {options['duration']:.0f}s, write ratio {options['write_ratio']:.0%}"
+        )
+        self.stdout.write(f"{'config':>6} {'ops/s':>8} {'writes/s':>9} {'reads/s':>8} {'lock errors':>12} {'p50 ms':>7} {'p95 ms':>7}")
+        for name in options["config"] or CONFIGS:
+            with temporary_sqlite_database(f"concurrency_{name}", **CONFIGS[name]) as alias:
+                self.populate(alias, options["tasks"])
+                results = self.run(alias, options)
+            self.report(name, results, options["duration"])
+
+    def populate(self, alias, count):
+        projects = Project.objects.using(alias).bulk_create([Project(name=f"مشروع {i}") for i in range(max(count // 50, 1))])
+        Task.objects.using(alias).bulk_create(
+            [Task(project=projects[i % len(projects)], title=f"مهمة {i}") for i in range(count)], batch_size=500
+        )
+        connections[alias].close()
+
+    def run(self, alias, options):
+        args = [(alias, worker, options["duration"], options["write_ratio"]) for worker in range(options["workers"])]
+        if options["mode"] == "threads":
+            with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+                return list(pool.map(lambda a: run_worker(*a), args))
+        connections.close_all()
+        # fork: العمليات ترث تسجيل القاعدة المؤقتة في connections.settings
+        with multiprocessing.get_context("fork").Pool(options["workers"]) as pool:
+            return pool.starmap(run_worker, args)
+
+    def report(self, name, results, duration):
+        writes = sum(r["writes"] for r in results)
+        reads = sum(r["reads"] for r in results)
+        errors = sum(r["lock_errors"] for r in results)
+        latencies = sorted(latency for r in results for latency in r["latencies"])
+        attempts = writes + reads + errors
+        p50 = statistics.median(latencies) * 1000 if latencies else 0
+        p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0
+        self.stdout.write(
+            f"{name:>6} {(writes + reads) / duration:>8.0f} {writes / duration:>9.0f} {reads / duration:>8.0f} "
+            f"{errors:>5} ({errors / attempts if attempts else 0:>5.1%}) {p50:>7.1f} {p95:>7.1f}"
+        )
@@ -0,0 +1,44 @@
+from django.apps import apps
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+
+from config.export import DEFAULT_CHUNK_SIZE, FORMATS, export_fields_for, export_to_file
+
+
+class Command(BaseCommand):
+    help = "تصدير متدفق لنموذج إلى CSV/JSONL بذاكرة ثابتة (نفس حقول إجراء التصدير في لوحة الإدارة)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="مثال: APP3.Task")
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument("--output", "-o", help="مسار الملف (الافتراضي: stdout)")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--filter", action="append", default=[], metavar="FIELD=VALUE", help="يمكن تكراره")
+        parser.add_argument("--fields", help="قائمة حقول مفصولة بفواصل (تدعم العلاقات مثل project__name)")
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options["model"])
+        except (LookupError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        filters = {}
+        for item in options["filter"]:
+            key, sep, value = item.partition("=")
+            if not sep:
+                raise CommandError(f"Invalid filter (expected FIELD=VALUE): {item}")
+            filters[key] = value
+
+        if options["fields"]:
+            fields = tuple(name.strip() for name in options["fields"].split(",") if name.strip())
+        else:
+            fields = export_fields_for(model, admin.site._registry.get(model))
+        queryset = model._default_manager.filter(**filters).order_by(*model._meta.ordering or ("pk",))
+
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as fh:
+                count = export_to_file(queryset, fields, fh, options["format"], options["chunk_size"])
+            self.stderr.write(f"exported {count} rows to {options['output']}")
+        else:
+            count = export_to_file(queryset, fields, self.stdout, options["format"], options["chunk_size"])
+            self.stderr.write(f"exported {count} rows")
@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import migrations
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+from django.test.utils import get_runner, override_settings
+
+from config.indexadvisor import QueryLog, advise, capture, load_log
+
+
+class Command(BaseCommand):
+    help = (
+        "اقتراح فهارس من استعلامات حقيقية: تُعاد بصمات الاستعلامات (من سجل أو من تشغيل الاختبارات) "
+        "بـ EXPLAIN QUERY PLAN، ولكل مسح كامل أو ترتيب في شجرة مؤقتة يُقترح Meta.indexes ويُجرَّب قبل عرضه."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--log", action="append", default=[], metavar="FILE",
+                            help="ملف JSON من --save-log أو سجل django.db.backends (DEBUG)؛ يتكرر")
+        parser.add_argument("--record-tests", nargs="*", metavar="LABEL",
+                            help="تشغيل الاختبارات (أو LABEL منها) والتقاط استعلاماتها")
+        parser.add_argument("--save-log", metavar="FILE", help="حفظ البصمات الملتقطة لإعادة استخدامها بـ --log")
+        parser.add_argument("--database", default="default", help="قاعدة البيانات التي تُشرح عليها الاستعلامات")
+        parser.add_argument("--live", action="store_true",
+                            help="تجربة الفهارس على القاعدة نفسها بدل لقطة مؤقتة منها (تأخذ قفل الكتابة أثناء البناء)")
+        parser.add_argument("--min-calls", type=int, default=1)
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--emit-migration", action="store_true",
+                            help="كتابة ترحيل AddIndex لكل تطبيق (أضف التعريفات المطبوعة إلى Meta.indexes)")
+
+    def handle(self, *args, **options):
+        log = QueryLog()
+        for path in options["log"]:
+            load_log(path, log)
+        if options["record_tests"] is not None:
+            self.record_tests(options["record_tests"], log)
+        if not len(log):
+            raise CommandError("No queries to analyse: pass --log FILE or --record-tests.")
+        if options["save_log"]:
+            log.save(options["save_log"])
+            self.stdout.write(f"saved {len(log)} fingerprints to {options['save_log']}")
+
+        try:
+            proposals = advise(log, options["database"], options["min_calls"], live=options["live"])[: options["limit"]]
+        except NotImplementedError as exc:
+            raise CommandError(exc)
+        self.stdout.write(f"{len(log)} fingerprints analysed, {len(proposals)} index proposals")
+        for proposal in proposals:
+            self.report(proposal)
+        if options["emit_migration"] and proposals:
+            self.emit_migrations(proposals)
+
+    def record_tests(self, labels, log):
+        runner = get_runner(settings)(verbosity=0, interactive=False, top_level=str(settings.BASE_DIR))
+        # كما في manage.py test: سجل النشاط يُكتب مباشرة لا من الخيط الخلفي
+        writer = {**getattr(settings, "ACTIVITY_LOG_WRITER", {}), "SYNC": True}
+        with override_settings(ACTIVITY_LOG_WRITER=writer), capture(log):
+            failures = runner.run_tests(labels)
+        self.stdout.write(f"captured {len(log)} fingerprints from the test run ({failures} failures)")
+
+    def report(self, proposal):
+        model = proposal.model
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n{model._meta.label}: {proposal.declaration()}"))
+        per_call = "" if proposal.rows_after is None else f", ~{proposal.rows_after} per call with the index"
+        self.stdout.write(
+            f"  {proposal.calls} calls, {proposal.seconds * 1000:.1f} ms captured; "
+            f"table {proposal.rows_before} rows{per_call}"
+            + ("; removes temp sort" if proposal.removes_sort else "")
+        )
+        if proposal.meta_ordering:
+            ordering = ", ".join(model._meta.ordering)
+            self.stdout.write(f"  ORDER BY comes from Meta.ordering ({ordering}) - add .order_by() where order is not needed")
+        self.stdout.write(f"  before: {proposal.before}")
+        self.stdout.write(f"  after:  {proposal.after}")
+        for example in proposal.examples:
+            self.stdout.write(f"  e.g. {example[:300]}")
+
+    def emit_migrations(self, proposals):
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        by_app = {}
+        for proposal in proposals:
+            by_app.setdefault(proposal.model._meta.app_label, []).append(proposal)
+        for app_label, app_proposals in by_app.items():
+            leaves = loader.graph.leaf_nodes(app_label)
+            number = max((int(name.split("_", 1)[0]) for _, name in leaves if name[:4].isdigit()), default=0) + 1
+            migration = migrations.Migration(f"{number:04d}_advised_indexes", app_label)
+            migration.dependencies = leaves
+            migration.operations = [
+                migrations.AddIndex(model_name=p.model._meta.model_name, index=p.index) for p in app_proposals
+            ]
+            writer = MigrationWriter(migration)
+            with open(writer.path, "w", encoding="utf-8") as fh:
+                fh.write(writer.as_string())
+            self.stdout.write(self.style.SUCCESS(f"wrote {writer.path}"))
+        self.stdout.write("Add the declarations above to each model's Meta.indexes, or makemigrations will remove them.")
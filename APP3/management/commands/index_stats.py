@@ -0,0 +1,57 @@
+import json
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from config.dbstats import btree_stats, table_index_names
+
+
+class Command(BaseCommand):
+    help = "تقرير عدد الصفحات ونسبة الامتلاء والتجزؤ لجداول النماذج وفهارسها (SQLite dbstat)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("models", nargs="*", help="app_label.Model (الافتراضي: كل نماذج APP1/APP2/APP3)")
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--save", metavar="FILE", help="حفظ اللقطة الحالية في ملف JSON")
+        parser.add_argument("--compare", metavar="FILE", help="مقارنة الحالة الحالية بلقطة محفوظة (قبل/بعد)")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if options["models"]:
+            try:
+                models = [apps.get_model(label) for label in options["models"]]
+            except (LookupError, ValueError) as exc:
+                raise CommandError(exc)
+        else:
+            models = [m for label in ("APP1", "APP2", "APP3") for m in apps.get_app_config(label).get_models()]
+
+        names = {name for model in models for name in table_index_names(model, using)}
+        try:
+            current = btree_stats(using, names)
+        except NotImplementedError as exc:
+            raise CommandError(exc)
+
+        before = None
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as fh:
+                before = json.load(fh)
+
+        header = f"{'name':<45} {'pages':>9} {'leaves':>9} {'fill':>6} {'frag':>6}"
+        if before is not None:
+            header += f" {'pages(before)':>14} {'frag(before)':>13}"
+        self.stdout.write(header)
+        for name in sorted(current):
+            entry = current[name]
+            line = (
+                f"{name:<45} {entry['pages']:>9} {entry['leaf_pages']:>9} "
+                f"{entry['fill']:>6.0%} {entry['fragmentation']:>6.0%}"
+            )
+            if before is not None:
+                old = before.get(name)
+                line += f" {old['pages']:>14} {old['fragmentation']:>13.0%}" if old else f" {'-':>14} {'-':>13}"
+            self.stdout.write(line)
+
+        if options["save"]:
+            with open(options["save"], "w", encoding="utf-8") as fh:
+                json.dump(current, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"saved snapshot to {options['save']}"))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from config.search import registered_indexes
+
+
+class Command(BaseCommand):
+    help = "إعادة بناء فهارس البحث النصي الكامل (FTS5) لكل النماذج المسجلة."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        for index in registered_indexes():
+            if not index.available(options["database"]):
+                self.stderr.write(f"{index.table}: FTS5 غير متاح على هذه القاعدة، تم التخطي.")
+                continue
+            count = index.rebuild(batch_size=options["batch_size"], using=options["database"])
+            self.stdout.write(self.style.SUCCESS(f"{index.table}: {count} وثيقة"))
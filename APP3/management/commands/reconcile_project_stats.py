@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+
+from APP3.models import COUNTER_FIELDS, Project, ProjectDueBucket, ProjectStats
+
+
+class Command(BaseCommand):
+    help = "مطابقة إحصاءات المشاريع مع جدول المهام: يعرض الانحراف ثم يعيد البناء من الصفر."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="عرض الانحراف فقط دون إعادة البناء")
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--verbose-drift", type=int, default=20, help="أقصى عدد مشاريع تُعرض تفاصيلها")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        expected, expected_buckets = ProjectStats.objects.using(using).compute()
+        stored = {
+            row.pop("project_id"): row
+            for row in ProjectStats.objects.using(using).values("project_id", *COUNTER_FIELDS)
+        }
+        stored_buckets = {
+            (project_id, due_date): count
+            for project_id, due_date, count in ProjectDueBucket.objects.using(using)
+            .filter(open_count__gt=0)
+            .values_list("project_id", "due_date", "open_count")
+        }
+
+        zero = dict.fromkeys(COUNTER_FIELDS, 0)
+        drifted = {}
+        for project_id in Project.objects.using(using).values_list("pk", flat=True).iterator():
+            want = {**zero, **expected.get(project_id, {})}
+            have = stored.get(project_id)
+            if have is None:
+                if want != zero:
+                    drifted[project_id] = "missing"
+                continue
+            diff = {name: (have[name], want[name]) for name in COUNTER_FIELDS if have[name] != want[name]}
+            if diff:
+                drifted[project_id] = diff
+        bucket_drift = {
+            key for key in expected_buckets.keys() | stored_buckets.keys()
+            if expected_buckets.get(key, 0) != stored_buckets.get(key, 0)
+        }
+
+        for project_id, diff in list(drifted.items())[: options["verbose_drift"]]:
+            self.stdout.write(f"{project_id}: {diff}")
+        self.stdout.write(
+            f"projects with drift: {len(drifted)}, due buckets with drift: {len(bucket_drift)}"
+        )
+        if options["dry_run"]:
+            return
+        ProjectStats.objects.using(using).recompute(using=using)
+        self.stdout.write(self.style.SUCCESS(f"rebuilt stats for {Project.objects.using(using).count()} projects"))
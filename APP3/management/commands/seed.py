@@ -0,0 +1,477 @@
+import contextlib
+import datetime
+import hashlib
+import itertools
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.utils import timezone
+
+# أعداد المقياس 1 (~380 ألف صف)؛ --scale 27 ينتج قرابة 10 ملايين
+BASE_COUNTS = {
+    "users": 1000,
+    "departments": 30,
+    "categories": 400,
+    "assets": 20_000,
+    "projects": 500,
+    "tasks": 40_000,
+    "comments": 80_000,
+    "activity": 200_000,
+}
+CHUNK_ITEMS = {"profiles": 2000, "assets": 2000, "projects": 20, "activity": 20_000}
+
+AR_WORDS = (
+    "تحديث نظام تقرير الميزانية صيانة الشبكة طابعة حاسب محمول شاشة خادم مراجعة العقود تدريب الموظفين "
+    "توريد أجهزة برنامج قاعدة البيانات الأمن السيبراني خطة المشروع اجتماع الإدارة تطوير الموقع إعداد دليل "
+    "المستخدم نقل مكتب أثاث كرسي طاولة جهاز عرض تكييف مستودع جرد فاتورة شراء اعتماد طلب متابعة تسليم اختبار "
+    "الربع السنوي العملاء الجودة المخاطر التوظيف الرواتب البريد الإلكتروني النسخ الاحتياطي الترخيص"
+).split()
+EN_WORDS = (
+    "update system report budget maintenance network printer laptop monitor server review contract training "
+    "staff supply hardware software database security plan project meeting migration website setup guide user "
+    "office furniture chair desk projector inventory invoice purchase approval request follow-up delivery "
+    "testing quarterly customer quality risk hiring payroll email backup license dashboard integration"
+).split()
+AR_FIRST = "محمد أحمد عبدالله خالد فهد سعد سلمان عبدالرحمن ناصر يوسف عمر علي نورة سارة فاطمة ريم هند منيرة لمى مها".split()
+AR_FAMILY = "العتيبي القحطاني الشمري الدوسري الغامدي الزهراني المطيري الحربي السبيعي العنزي النمر الشهري".split()
+EN_FIRST = "John Sarah Michael Emily David Anna James Laura Daniel Maria Omar Lina".split()
+EN_FAMILY = "Smith Johnson Brown Taylor Wilson Clark Lewis Walker Hall Young".split()
+CITIES = ("الرياض", "جدة", "مكة المكرمة", "المدينة المنورة", "الدمام", "الخبر", "أبها", "تبوك", "بريدة", "حائل")
+CITY_WEIGHTS = (35, 20, 8, 6, 9, 5, 4, 4, 5, 4)
+DEPARTMENTS = (
+    "تقنية المعلومات", "الموارد البشرية", "المالية", "المشتريات", "الشؤون القانونية",
+    "خدمة العملاء", "التسويق", "العمليات", "الجودة", "الأمن والسلامة",
+)
+
+
+def _zipf(words):
+    # توزيع زيبف تقريبي: الكلمات الأولى أكثر تكرارًا كما في النصوص الحقيقية
+    return words, list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+
+
+AR_TEXT, EN_TEXT = _zipf(AR_WORDS), _zipf(EN_WORDS)
+
+
+class Plan:
+    """كل القيم مشتقة من (seed، النوع، الفهرس)، فتنتج العمال المتوازية والعملية الواحدة البيانات نفسها."""
+
+    def __init__(self, seed, counts, start, end, user_ids, time_ordered, arabic_ratio):
+        self.seed = seed
+        self.counts = counts
+        self.start = start
+        self.span = (end - start).total_seconds()
+        self.user_ids = user_ids
+        self.time_ordered = time_ordered
+        self.arabic_ratio = arabic_ratio
+
+    def rng(self, kind, index):
+        return random.Random(f"{self.seed}:{kind}:{index}")
+
+    def _digest(self, kind, index):
+        return int.from_bytes(hashlib.blake2b(f"{self.seed}:{kind}:{index}".encode(), digest_size=16).digest(), "big")
+
+    def moment(self, kind, index, total=None):
+        """تاريخ الإنشاء: موزع على الفترة بترتيب الفهرس مع تذبذب صغير."""
+        total = total or self.counts.get(kind) or 1
+        jitter = (self._digest(kind, index) % 3600) - 1800
+        seconds = min(max(self.span * index / total + jitter, 0), self.span)
+        return self.start + datetime.timedelta(seconds=seconds)
+
+    def pk(self, kind, index, total=None, created=None):
+        """created: تاريخ إنشاء الصف لطابع uuid7 إن لم يكن الفهرس رقمًا متسلسلًا (مهام المشروع وتعليقاتها)."""
+        value = self._digest(kind, index)
+        if not self.time_ordered:
+            return uuid.UUID(int=value, version=4)
+        ms = int((created or self.moment(kind, index, total)).timestamp() * 1000)
+        return uuid.UUID(int=(ms << 80) | (0x7 << 76) | (value & (0xFFF << 64)) | (0b10 << 62) | (value & ((1 << 62) - 1)))
+
+    def text(self, rng, low, high, arabic=None):
+        arabic = rng.random() < self.arabic_ratio if arabic is None else arabic
+        words, weights = AR_TEXT if arabic else EN_TEXT
+        return " ".join(rng.choices(words, cum_weights=weights, k=rng.randint(low, high)))
+
+    def person(self, rng):
+        if rng.random() < self.arabic_ratio:
+            return f"{rng.choice(AR_FIRST)} {rng.choice(AR_FIRST)} {rng.choice(AR_FAMILY)}"
+        return f"{rng.choice(EN_FIRST)} {rng.choice(EN_FAMILY)}"
+
+    def user(self, rng):
+        return rng.choice(self.user_ids)
+
+
+@contextlib.contextmanager
+def historic_timestamps(*models):
+    """يعطّل auto_now/auto_now_add مؤقتًا حتى تُحفظ تواريخ الإنشاء المولّدة بدل الوقت الحالي."""
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+# ---------- مولدات الدفعات (تعمل في العمال) ----------
+
+
+def build_profiles(plan, start, stop):
+    Profile = apps.get_model("APP1", "Profile")
+    Address = apps.get_model("APP1", "Address")
+    roles = ("user", "user", "user", "staff", "staff", "manager", "admin")
+    profiles, addresses = [], []
+    for i in range(start, stop):
+        rng = plan.rng("profile", i)
+        created = plan.moment("users", i)
+        arabic = rng.random() < plan.arabic_ratio
+        pk = plan.pk("profile", i, plan.counts["users"])
+        profiles.append(Profile(
+            id=pk, user_id=plan.user_ids[i], created_at=created, updated_at=created,
+            full_name=plan.person(rng), phone=f"+9665{rng.randrange(10**8):08d}", role=rng.choice(roles),
+            gender=rng.choice(("male", "female")), preferred_language="ar" if arabic else "en",
+            birth_date=datetime.date(1960, 1, 1) + datetime.timedelta(days=rng.randrange(365 * 45)),
+        ))
+        for n in range(rng.choice((0, 1, 1, 1, 2, 2, 3))):
+            addresses.append(Address(
+                id=plan.pk("address", i * 4 + n, plan.counts["users"] * 4), profile_id=pk,
+                created_at=created, updated_at=created, label=("المنزل", "العمل", "أخرى")[n % 3],
+                city=rng.choices(CITIES, weights=CITY_WEIGHTS)[0], district=f"حي {plan.text(rng, 1, 1, True)}",
+                street=plan.text(rng, 1, 3, True), postal_code=f"{rng.randrange(10000, 99999)}", is_default=n == 0,
+            ))
+    return [(Profile, profiles), (Address, addresses)]
+
+
+def build_assets(plan, start, stop):
+    Asset = apps.get_model("APP2", "Asset")
+    Attachment = apps.get_model("APP2", "Attachment")
+    AssetAssignment = apps.get_model("APP2", "AssetAssignment")
+    conditions = ("new", "good", "good", "good", "fair", "poor")
+    assets, attachments, assignments = [], [], []
+    end_date = (plan.start + datetime.timedelta(seconds=plan.span)).date()
+    for i in range(start, stop):
+        rng = plan.rng("asset", i)
+        created = plan.moment("assets", i)
+        pk = plan.pk("assets", i)
+        quantity = 1 if rng.random() < 0.85 else rng.randint(2, 50)
+        assets.append(Asset(
+            id=pk, created_at=created, updated_at=created, name=plan.text(rng, 2, 4),
+            department_id=plan.pk("departments", rng.randrange(plan.counts["departments"])),
+            category_id=plan.pk("categories", rng.randrange(plan.counts["categories"])),
+            serial_number=f"SN-{rng.randrange(16**10):010X}", quantity=quantity,
+            condition=rng.choice(conditions), notes=plan.text(rng, 0, 12),
+        ))
+        for n in range(rng.choice((0, 0, 1, 1, 2))):
+            attachments.append(Attachment(
+                id=plan.pk("attachment", i * 2 + n, plan.counts["assets"] * 2), asset_id=pk,
+                created_at=created, updated_at=created, title=plan.text(rng, 1, 3),
+                file=f"uploads/attachments/{created:%Y/%m}/{pk.hex[:12]}-{n}.pdf", uploaded_by_id=plan.user(rng),
+            ))
+        # تسليمات متتالية غير متقاطعة، وآخرها مفتوح أحيانًا
+        day = created.date()
+        for n in range(rng.choice((0, 1, 1, 2, 3))):
+            day += datetime.timedelta(days=rng.randint(1, 60))
+            if day > end_date:
+                break
+            last = day + datetime.timedelta(days=rng.randint(30, 240))
+            open_ended = n == 2 or (last > end_date and rng.random() < 0.5)
+            assignments.append(AssetAssignment(
+                id=plan.pk("assignment", i * 3 + n, plan.counts["assets"] * 3), asset_id=pk,
+                created_at=created, updated_at=created, assigned_to_id=plan.user(rng),
+                assigned_by_id=plan.user(rng), start_date=day, end_date=None if open_ended else last,
+            ))
+            if open_ended:
+                break
+            day = last
+    return [(Asset, assets), (Attachment, attachments), (AssetAssignment, assignments)]
+
+
+def build_projects(plan, start, stop):
+    Project = apps.get_model("APP3", "Project")
+    Task = apps.get_model("APP3", "Task")
+    Comment = apps.get_model("APP3", "Comment")
+    Membership = Project.members.through
+    statuses = ("todo", "in_progress", "done", "done", "canceled")
+    tasks_avg = plan.counts["tasks"] / plan.counts["projects"]
+    comments_avg = plan.counts["comments"] / max(plan.counts["tasks"], 1)
+    projects, members, tasks, comments = [], [], [], []
+    for i in range(start, stop):
+        rng = plan.rng("project", i)
+        created = plan.moment("projects", i)
+        pk = plan.pk("projects", i)
+        projects.append(Project(
+            id=pk, created_at=created, updated_at=created, name=plan.text(rng, 2, 5),
+            description=plan.text(rng, 5, 40), owner_id=plan.user(rng),
+        ))
+        team = sorted(set(rng.sample(plan.user_ids, min(len(plan.user_ids), rng.randint(2, 9)))))
+        members.extend(Membership(project_id=pk, user_id=user_id) for user_id in team)
+        for t in range(int(rng.uniform(0.5, 1.5) * tasks_avg)):
+            task_created = created + datetime.timedelta(hours=rng.randint(1, 24 * 90))
+            task_pk = plan.pk("task", f"{i}:{t}", created=task_created)
+            status = rng.choice(statuses)
+            progress = {"todo": 0, "done": 100}.get(status, rng.randrange(0, 100, 5))
+            due = task_created.date() + datetime.timedelta(days=rng.randint(3, 120)) if rng.random() < 0.7 else None
+            tasks.append(Task(
+                id=task_pk, created_at=task_created, updated_at=task_created, project_id=pk,
+                title=plan.text(rng, 2, 6), description=plan.text(rng, 0, 60), status=status,
+                priority=rng.choices((1, 2, 3, 4), weights=(3, 5, 3, 1))[0], created_by_id=plan.user(rng),
+                assigned_to_id=rng.choice(team) if rng.random() < 0.85 else None, due_date=due, progress=progress,
+            ))
+            for c in range(int(rng.expovariate(1 / comments_avg)) if comments_avg else 0):
+                moment = task_created + datetime.timedelta(minutes=rng.randint(5, 60 * 24 * 30))
+                comments.append(Comment(
+                    id=plan.pk("comment", f"{i}:{t}:{c}", created=moment), created_at=moment, updated_at=moment, task_id=task_pk,
+                    author_id=rng.choice(team), body=plan.text(rng, 3, 50),
+                ))
+    return [(Project, projects), (Membership, members), (Task, tasks), (Comment, comments)]
+
+
+def build_activity(plan, start, stop):
+    ActivityLog = apps.get_model("APP3", "ActivityLog")
+    actions = ("create", "update", "update", "update", "delete", "login", "login", "other")
+    paths = ("/admin/APP3/task/", "/admin/APP2/asset/", "/admin/APP1/profile/", "/search/", "/admin/")
+    logs = []
+    for i in range(start, stop):
+        rng = plan.rng("activity", i)
+        created = plan.moment("activity", i)
+        logs.append(ActivityLog(
+            id=plan.pk("activity", i), created_at=created, updated_at=created,
+            actor_id=plan.user(rng) if rng.random() < 0.95 else None, action=rng.choice(actions),
+            message=plan.text(rng, 3, 12),
+            metadata={"ip": f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}", "path": rng.choice(paths)},
+        ))
+    return [(ActivityLog, logs)]
+
+
+BUILDERS = {"profiles": build_profiles, "assets": build_assets, "projects": build_projects, "activity": build_activity}
+
+
+def _init_worker():
+    if not apps.ready:
+        django.setup()
+    # الكتابة من عدة عمليات على SQLite تتسلسل؛ مهلة القفل الطويلة تمنع "database is locked"
+    options = connections["default"].settings_dict.setdefault("OPTIONS", {})
+    options.setdefault("timeout", 300)
+
+
+def _insert_fields(model):
+    # الأعمدة المولّدة (ActivityLog.metadata_*) يحسبها SQLite ولا تقبل قيمًا
+    return [field for field in model._meta.concrete_fields if not field.generated]
+
+
+def _converters(model, connection):
+    """محوّلات القيم إلى صيغة SQLite لكل عمود، تُحسب مرة واحدة لكل نموذج."""
+    ops = connection.ops
+    converters = []
+    for field in _insert_fields(model):
+        target = field.target_field if field.is_relation else field
+        internal = target.get_internal_type()
+        if internal == "UUIDField":
+            converters.append(lambda value: value.hex if value is not None else None)
+        elif internal == "DateTimeField":
+            converters.append(ops.adapt_datetimefield_value)
+        elif internal == "DateField":
+            converters.append(ops.adapt_datefield_value)
+        elif internal in ("CharField", "TextField", "IntegerField", "PositiveIntegerField",
+                          "PositiveSmallIntegerField", "BigIntegerField", "AutoField", "BigAutoField"):
+            converters.append(None)
+        else:
+            converters.append(lambda value, field=field: field.get_db_prep_save(value, connection))
+    return converters
+
+
+def insert_objects(model, objs, batch_size):
+    """
+    إدراج مباشر بـ executemany على SQLite دون تجميع SQL لكل دفعة كما يفعل bulk_create
+    (أسرع بعدة أضعاف عند ملايين الصفوف)، وbulk_create على بقية القواعد.
+    """
+    connection = connections[model.objects.db]
+    if connection.vendor != "sqlite" or connection.features.has_native_uuid_field:
+        model.objects.bulk_create(objs, batch_size=batch_size)
+        return
+    fields = _insert_fields(model)
+    converters = _converters(model, connection)
+    names = [field.attname for field in fields]
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        connection.ops.quote_name(model._meta.db_table),
+        ", ".join(connection.ops.quote_name(field.column) for field in fields),
+        ", ".join(["%s"] * len(fields)),
+    )
+    rows = (
+        [value if convert is None else convert(value) for value, convert in zip(map(obj.__dict__.get, names), converters)]
+        for obj in objs
+    )
+    with connection.cursor() as cursor:
+        for batch in iter(lambda: list(itertools.islice(rows, batch_size)), []):
+            cursor.executemany(sql, batch)
+
+
+def seed_chunk(plan, kind, start, stop, batch_size):
+    """يبني دفعة ويكتبها في معاملة واحدة؛ يعيد {label: عدد الصفوف}."""
+    written = {}
+    batches = BUILDERS[kind](plan, start, stop)
+    models = [model for model, _ in batches]
+    with historic_timestamps(*models), transaction.atomic():
+        for model, objs in batches:
+            insert_objects(model, objs, batch_size)
+            written[model._meta.label] = len(objs)
+    return written
+
+
+class Command(BaseCommand):
+    help = (
+        "توليد بيانات اصطناعية حتمية (حسب --seed) لكل النماذج بأحجام قابلة للتوسع لاختبارات الحمل والقياس؛ "
+        "نصوص عربية وإنجليزية بتوزيع قريب من الحقيقي."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--scale", type=float, default=1.0, help="مضاعف الأعداد الأساسية (27 ≈ 10 ملايين صف)")
+        parser.add_argument("--count", action="append", default=[], metavar="KIND=N", help=f"تجاوز عدد: {', '.join(BASE_COUNTS)}")
+        parser.add_argument("--workers", type=int, default=0, help="عمليات متوازية (0 = داخل العملية)")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--arabic-ratio", type=float, default=0.7)
+        parser.add_argument("--start", default="2023-01-01")
+        parser.add_argument("--end", default="2025-12-31")
+        parser.add_argument("--skip-search", action="store_true", help="عدم إعادة بناء فهارس البحث")
+
+    def handle(self, *args, **options):
+        counts = {kind: max(int(n * options["scale"]), 1) for kind, n in BASE_COUNTS.items()}
+        for item in options["count"]:
+            kind, _, value = item.partition("=")
+            if kind not in counts or not value.isdigit():
+                raise CommandError(f"Invalid --count: {item}")
+            counts[kind] = max(int(value), 1)
+
+        tz = timezone.get_current_timezone()
+        start = datetime.datetime.fromisoformat(options["start"]).replace(tzinfo=tz)
+        end = datetime.datetime.fromisoformat(options["end"]).replace(tzinfo=tz)
+        seed = options["seed"]
+        started = time.perf_counter()
+        totals = {}
+
+        user_ids = self.create_users(seed, counts["users"], start, end, options["batch_size"])
+        totals["auth.User"] = len(user_ids)
+        plan = Plan(seed, counts, start, end, user_ids, settings.TIME_ORDERED_PRIMARY_KEYS, options["arabic_ratio"])
+        self.add(totals, self.create_departments_and_categories(plan))
+
+        tasks = []
+        for kind, total in (("profiles", counts["users"]), ("assets", counts["assets"]),
+                            ("projects", counts["projects"]), ("activity", counts["activity"])):
+            size = CHUNK_ITEMS[kind]
+            tasks.extend((kind, lo, min(lo + size, total)) for lo in range(0, total, size))
+
+        for written in self.run_chunks(plan, tasks, options["workers"], options["batch_size"]):
+            self.add(totals, written)
+            rows = sum(totals.values())
+            self.stdout.write(f"{rows:>12,} rows ({rows / (time.perf_counter() - started):,.0f} rows/s)", ending="\r")
+        self.stdout.write("")
+
+        self.finalize(options["skip_search"])
+        elapsed = time.perf_counter() - started
+        for label, n in totals.items():
+            self.stdout.write(f"{label:>22}: {n:,}")
+        rows = sum(totals.values())
+        self.stdout.write(self.style.SUCCESS(f"seeded {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)"))
+
+    @staticmethod
+    def add(totals, written):
+        for label, n in written.items():
+            totals[label] = totals.get(label, 0) + n
+
+    def create_users(self, seed, count, start, end, batch_size):
+        User = get_user_model()
+        prefix = f"seed{seed}-"
+        if User.objects.filter(username__startswith=prefix).exists():
+            raise CommandError(f"Data for --seed {seed} already exists; use another seed or an empty database.")
+        password = make_password(None)
+        span = (end - start) / count
+        users = [
+            User(
+                username=f"{prefix}{i:07d}", email=f"{prefix}{i:07d}@example.com", password=password,
+                is_staff=i % 50 == 0, date_joined=start + span * i,
+            )
+            for i in range(count)
+        ]
+        User.objects.bulk_create(users, batch_size=batch_size)
+        return list(User.objects.filter(username__startswith=prefix).order_by("username").values_list("pk", flat=True))
+
+    def create_departments_and_categories(self, plan):
+        Department = apps.get_model("APP2", "Department")
+        Category = apps.get_model("APP2", "Category")
+        departments = []
+        for i in range(plan.counts["departments"]):
+            base = DEPARTMENTS[i % len(DEPARTMENTS)]
+            name = base if i < len(DEPARTMENTS) else f"{base} - فرع {i // len(DEPARTMENTS)}"
+            created = plan.moment("departments", i)
+            departments.append(Department(
+                id=plan.pk("departments", i), name=f"{name} ({plan.seed})", code=f"S{plan.seed}-D{i:04d}",
+                created_at=created, updated_at=created,
+            ))
+
+        # شجرة عميقة: كل عقدة تختار أبًا من العقد الحديثة غالبًا، فتتكون سلاسل بعمق يصل إلى 12
+        categories, names = [], set()
+        for i in range(plan.counts["categories"]):
+            rng = plan.rng("category", i)
+            pk = plan.pk("categories", i)
+            parent = None
+            if i and rng.random() > 0.08:
+                candidate = max(0, i - 1 - int(rng.expovariate(0.3)))
+                if categories[candidate].depth < 11:
+                    parent = categories[candidate]
+            path = f"{parent.path if parent else ''}{pk.hex}/"
+            created = plan.moment("categories", i)
+            # الاسم فريد ضمن الأب
+            name = plan.text(rng, 1, 2)
+            if (parent, name) in names:
+                name = f"{name} {i}"
+            names.add((parent, name))
+            categories.append(Category(
+                id=pk, name=name, parent_id=parent.pk if parent else None, path=path,
+                depth=parent.depth + 1 if parent else 0, created_at=created, updated_at=created,
+            ))
+
+        with historic_timestamps(Department, Category), transaction.atomic():
+            insert_objects(Department, departments, 5000)
+            insert_objects(Category, categories, 5000)
+        return {Department._meta.label: len(departments), Category._meta.label: len(categories)}
+
+    def run_chunks(self, plan, tasks, workers, batch_size):
+        if workers <= 0:
+            for kind, lo, hi in tasks:
+                yield seed_chunk(plan, kind, lo, hi, batch_size)
+            return
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(seed_chunk, plan, kind, lo, hi, batch_size) for kind, lo, hi in tasks]
+            for future in futures:
+                yield future.result()
+
+    def finalize(self, skip_search):
+        from APP1 import cache as profile_cache
+        from APP1.models import Profile
+        from APP3.models import ProjectStats
+        from config.search import registered_indexes
+
+        # bulk_create لا يرسل إشارات: تُبنى الإحصاءات وفهارس البحث دفعة واحدة
+        ProjectStats.objects.recompute()
+        profile_cache.invalidate_many(Profile.objects.values_list("user_id", flat=True).iterator(chunk_size=5000))
+        if not skip_search:
+            for index in registered_indexes():
+                if index.available():
+                    index.rebuild(batch_size=5000)
+        connection = connections["default"]
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
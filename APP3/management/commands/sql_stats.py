@@ -0,0 +1,48 @@
+import shutil
+
+from django.core.management.base import BaseCommand
+
+from config.sqlstats import DB_MS_BUCKETS, QUERY_BUCKETS, histogram_percentile, load_route_stats, stats_dir
+
+
+def _bound(value):
+    return ">max" if value is None else f"≤{value}"
+
+
+class Command(BaseCommand):
+    help = "عرض مدرجات الاستعلامات لكل مسار URL التي جمعتها وسيطة SQLInstrumentationMiddleware (كل العمليات)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", help="مجلد الإحصاءات (الافتراضي: SQL_INSTRUMENTATION['STATS_DIR'])")
+        parser.add_argument("--sort", choices=["requests", "queries", "db_ms"], default="db_ms")
+        parser.add_argument("--limit", type=int, default=30)
+        parser.add_argument("--reset", action="store_true", help="حذف الإحصاءات المجمعة")
+
+    def handle(self, *args, **options):
+        directory = options["dir"] or stats_dir()
+        if options["reset"]:
+            shutil.rmtree(directory, ignore_errors=True)
+            self.stdout.write("sql stats reset")
+            return
+
+        routes = load_route_stats(directory)
+        if not routes:
+            self.stdout.write(f"no stats in {directory}")
+            return
+
+        def sort_key(item):
+            entry = item[1]
+            return entry["requests"] if options["sort"] == "requests" else entry[options["sort"]] / entry["requests"]
+
+        self.stdout.write(f"{'requests':>8} {'avg q':>6} {'p50 q':>6} {'p95 q':>6} {'avg ms':>8} {'p95 ms':>7}  route")
+        for route, entry in sorted(routes.items(), key=sort_key, reverse=True)[: options["limit"]]:
+            requests = entry["requests"]
+            self.stdout.write(
+                f"{requests:>8} {entry['queries'] / requests:>6.1f} "
+                f"{_bound(histogram_percentile(entry['query_hist'], QUERY_BUCKETS, 0.5)):>6} "
+                f"{_bound(histogram_percentile(entry['query_hist'], QUERY_BUCKETS, 0.95)):>6} "
+                f"{entry['db_ms'] / requests:>8.1f} "
+                f"{_bound(histogram_percentile(entry['db_ms_hist'], DB_MS_BUCKETS, 0.95)):>7}  {route}"
+            )
+            for fp, n in sorted(entry["nplusone"].items(), key=lambda item: -item[1])[:3]:
+                self.stdout.write(self.style.WARNING(f"{'':>8} N+1 ×{n}: {fp[:160]}"))
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from config.replica import replica_lag, snapshot
+from config.routers import get_config
+
+
+class Command(BaseCommand):
+    help = "نسخ قاعدة default إلى نسخة القراءة المحلية (SQLite Backup API)، مرة واحدة أو دوريًا."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--alias", help="الافتراضي: DATABASE_ROUTING['READ_ALIAS']")
+        parser.add_argument("--interval", type=float, default=0, help="تكرار النسخ كل N ثانية (0 = مرة واحدة)")
+
+    def handle(self, *args, **options):
+        alias = options["alias"] or get_config()["READ_ALIAS"]
+        if not alias:
+            raise CommandError("No read alias configured.")
+        while True:
+            lag = replica_lag(alias)
+            started = time.perf_counter()
+            snapshot("default", alias)
+            self.stdout.write(
+                f"{alias}: snapshot in {time.perf_counter() - started:.2f}s (previous lag "
+                f"{'none' if lag == float('inf') else f'{lag:.1f}s'})"
+            )
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,107 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:21
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityLog',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='المعرف')),
+                ('is_active', models.BooleanField(db_index=True, default=True, verbose_name='نشط')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='تاريخ الإنشاء')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+                ('action', models.CharField(choices=[('create', 'إنشاء'), ('update', 'تحديث'), ('delete', 'حذف'), ('login', 'تسجيل دخول'), ('other', 'أخرى')], db_index=True, default='other', max_length=20, verbose_name='الحدث')),
+                ('message', models.CharField(max_length=500, verbose_name='الوصف')),
+                ('metadata', models.JSONField(blank=True, default=dict, verbose_name='بيانات إضافية')),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_logs', to=settings.AUTH_USER_MODEL, verbose_name='المنفّذ')),
+            ],
+            options={
+                'verbose_name': 'سجل النشاط',
+                'verbose_name_plural': 'سجلات النشاط',
+                'ordering': ('-created_at',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Project',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='المعرف')),
+                ('is_active', models.BooleanField(db_index=True, default=True, verbose_name='نشط')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='تاريخ الإنشاء')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+                ('name', models.CharField(db_index=True, max_length=200, verbose_name='اسم المشروع')),
+                ('description', models.TextField(blank=True, verbose_name='وصف المشروع')),
+                ('members', models.ManyToManyField(blank=True, related_name='projects', to=settings.AUTH_USER_MODEL, verbose_name='الأعضاء')),
+                ('owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='owned_projects', to=settings.AUTH_USER_MODEL, verbose_name='المالك')),
+            ],
+            options={
+                'verbose_name': 'مشروع',
+                'verbose_name_plural': 'المشاريع',
+                'ordering': ('-created_at',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='المعرف')),
+                ('is_active', models.BooleanField(db_index=True, default=True, verbose_name='نشط')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='تاريخ الإنشاء')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+                ('title', models.CharField(db_index=True, max_length=200, verbose_name='عنوان المهمة')),
+                ('description', models.TextField(blank=True, verbose_name='وصف المهمة')),
+                ('status', models.CharField(choices=[('todo', 'قيد الانتظار'), ('in_progress', 'قيد التنفيذ'), ('done', 'مكتملة'), ('canceled', 'ملغاة')], db_index=True, default='todo', max_length=20, verbose_name='الحالة')),
+                ('priority', models.IntegerField(choices=[(1, 'منخفضة'), (2, 'متوسطة'), (3, 'عالية'), (4, 'عاجلة')], db_index=True, default=2, verbose_name='الأولوية')),
+                ('due_date', models.DateField(blank=True, null=True, verbose_name='تاريخ الاستحقاق')),
+                ('progress', models.PositiveSmallIntegerField(default=0, help_text='من 0 إلى 100', validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)], verbose_name='نسبة الإنجاز')),
+                ('assigned_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tasks_assigned', to=settings.AUTH_USER_MODEL, verbose_name='مُسندة إلى')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tasks_created', to=settings.AUTH_USER_MODEL, verbose_name='أُنشئت بواسطة')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='APP3.project', verbose_name='المشروع')),
+            ],
+            options={
+                'verbose_name': 'مهمة',
+                'verbose_name_plural': 'المهام',
+                'ordering': ('-created_at',),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Comment',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='المعرف')),
+                ('is_active', models.BooleanField(db_index=True, default=True, verbose_name='نشط')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='تاريخ الإنشاء')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+                ('body', models.TextField(verbose_name='نص التعليق')),
+                ('author', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='task_comments', to=settings.AUTH_USER_MODEL, verbose_name='الكاتب')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='APP3.task', verbose_name='المهمة')),
+            ],
+            options={
+                'verbose_name': 'تعليق',
+                'verbose_name_plural': 'التعليقات',
+                'ordering': ('-created_at',),
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status'], name='APP3_task_project_d0dfeb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'status'], name='APP3_task_assigne_13651d_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:27
+
+import config.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP3', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activitylog',
+            name='id',
+            field=models.UUIDField(default=config.ids.default_pk, editable=False, primary_key=True, serialize=False, verbose_name='المعرف'),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='id',
+            field=models.UUIDField(default=config.ids.default_pk, editable=False, primary_key=True, serialize=False, verbose_name='المعرف'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='id',
+            field=models.UUIDField(default=config.ids.default_pk, editable=False, primary_key=True, serialize=False, verbose_name='المعرف'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='id',
+            field=models.UUIDField(default=config.ids.default_pk, editable=False, primary_key=True, serialize=False, verbose_name='المعرف'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP3', '0003_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectStats',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='APP3.project', verbose_name='المشروع')),
+                ('total', models.IntegerField(default=0, verbose_name='عدد المهام')),
+                ('todo_count', models.IntegerField(default=0, verbose_name='قيد الانتظار')),
+                ('in_progress_count', models.IntegerField(default=0, verbose_name='قيد التنفيذ')),
+                ('done_count', models.IntegerField(default=0, verbose_name='مكتملة')),
+                ('canceled_count', models.IntegerField(default=0, verbose_name='ملغاة')),
+                ('low_count', models.IntegerField(default=0, verbose_name='أولوية منخفضة')),
+                ('medium_count', models.IntegerField(default=0, verbose_name='أولوية متوسطة')),
+                ('high_count', models.IntegerField(default=0, verbose_name='أولوية عالية')),
+                ('urgent_count', models.IntegerField(default=0, verbose_name='أولوية عاجلة')),
+                ('progress_sum', models.BigIntegerField(default=0, verbose_name='مجموع نسب الإنجاز')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+            ],
+            options={
+                'verbose_name': 'إحصاءات مشروع',
+                'verbose_name_plural': 'إحصاءات المشاريع',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectDueBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('due_date', models.DateField(verbose_name='تاريخ الاستحقاق')),
+                ('open_count', models.IntegerField(default=0, verbose_name='المهام المفتوحة')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='due_buckets', to='APP3.project', verbose_name='المشروع')),
+            ],
+            options={
+                'verbose_name': 'دلو استحقاق',
+                'verbose_name_plural': 'دلاء الاستحقاق',
+                'constraints': [models.UniqueConstraint(fields=('project', 'due_date'), name='app3_due_bucket_unique')],
+            },
+        ),
+    ]
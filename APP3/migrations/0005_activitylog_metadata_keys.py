@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:10
+
+import config.jsonkeys
+import django.db.models.fields.json
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP3', '0004_project_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        config.jsonkeys.AddGeneratedField(
+            model_name='activitylog',
+            name='metadata_ip',
+            field=models.GeneratedField(db_persist=False, null=True, expression=django.db.models.fields.json.KeyTextTransform('ip', 'metadata'), output_field=models.CharField(max_length=45, null=True), verbose_name='عنوان IP'),
+        ),
+        config.jsonkeys.AddGeneratedField(
+            model_name='activitylog',
+            name='metadata_model',
+            field=models.GeneratedField(db_persist=False, null=True, expression=django.db.models.fields.json.KeyTextTransform('model', 'metadata'), output_field=models.CharField(max_length=100, null=True), verbose_name='النموذج'),
+        ),
+        config.jsonkeys.AddGeneratedField(
+            model_name='activitylog',
+            name='metadata_pk',
+            field=models.GeneratedField(db_persist=False, null=True, expression=django.db.models.fields.json.KeyTextTransform('pk', 'metadata'), output_field=models.CharField(max_length=64, null=True), verbose_name='معرف الكائن'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['metadata_pk'], name='APP3_activi_metadat_9798ff_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['metadata_model', 'created_at'], name='APP3_activi_metadat_71b042_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['metadata_ip'], name='APP3_activi_metadat_7634f5_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP3', '0005_activitylog_metadata_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRecord',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(max_length=100, verbose_name='النموذج')),
+                ('object_id', models.CharField(max_length=64, verbose_name='معرف الكائن')),
+                ('ref', models.CharField(blank=True, max_length=64, verbose_name='المرجع')),
+                ('created_at', models.DateTimeField(verbose_name='تاريخ الإنشاء')),
+                ('path', models.CharField(max_length=255, verbose_name='الملف')),
+                ('offset', models.BigIntegerField(verbose_name='موضع الدفعة في الملف')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='تاريخ الأرشفة')),
+            ],
+            options={
+                'verbose_name': 'سجل مؤرشف',
+                'verbose_name_plural': 'السجلات المؤرشفة',
+                'indexes': [models.Index(fields=['model', 'ref', 'created_at'], name='APP3_archiv_model_bb346c_idx')],
+                'constraints': [models.UniqueConstraint(fields=('model', 'object_id'), name='app3_archived_record_unique')],
+            },
+        ),
+    ]
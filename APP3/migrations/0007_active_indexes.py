@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:30
+
+import config.active
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('APP3', '0006_archived_record'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='APP3_task_project_d0dfeb_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='APP3_task_assigne_13651d_idx',
+        ),
+        config.active.AlterFieldIndex(
+            model_name='activitylog',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='نشط'),
+        ),
+        config.active.AlterFieldIndex(
+            model_name='comment',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='نشط'),
+        ),
+        config.active.AlterFieldIndex(
+            model_name='project',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='نشط'),
+        ),
+        config.active.AlterFieldIndex(
+            model_name='task',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='نشط'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='app3_activitylog_active'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='app3_comment_active'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['task', 'created_at'], name='app3_comment_active_task'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='app3_project_active'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='app3_task_active'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['project', 'status'], name='app3_task_active_status'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['assigned_to', 'status'], name='app3_task_active_assignee'),
+        ),
+    ]
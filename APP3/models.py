@@ -1,20 +1,35 @@
-import uuid
+from collections import Counter
 
+from django.apps import apps
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 
+from config.active import ActiveManager, active_index
+from config.db.transactions import atomic_immediate
+from config.ids import default_pk
+from config.jsonkeys import JSONKeyQuerySet, json_key_field
+
 
 class TimeStampedModel(models.Model):
-    id = models.UUIDField(_("المعرف"), primary_key=True, default=uuid.uuid4, editable=False)
-    is_active = models.BooleanField(_("نشط"), default=True, db_index=True)
+    id = models.UUIDField(_("المعرف"), primary_key=True, default=default_pk, editable=False)
+    # بلا فهرس منفرد: الاستعلامات على النشط تستخدم الفهارس الجزئية (config.active)
+    is_active = models.BooleanField(_("نشط"), default=True)
     created_at = models.DateTimeField(_("تاريخ الإنشاء"), auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(_("تاريخ التحديث"), auto_now=True)
 
+    objects = models.Manager()
+    active = ActiveManager()
+
     class Meta:
         abstract = True
         ordering = ("-created_at",)
+        indexes = [active_index("created_at", name="%(app_label)s_%(class)s_active")]
 
 
 class Project(TimeStampedModel):
@@ -43,6 +58,25 @@ class Project(TimeStampedModel):
         return self.name
 
 
+class TaskQuerySet(models.QuerySet):
+    def update_with_stats(self, **kwargs) -> int:
+        """update() لا يرسل إشارات؛ هذه النسخة تعيد حساب إحصاءات المشاريع المتأثرة في المعاملة نفسها."""
+        with atomic_immediate(using=self.db):
+            project_ids = set(self.values_list("project_id", flat=True).distinct())
+            if "project" in kwargs or "project_id" in kwargs:
+                target = kwargs.get("project_id", kwargs.get("project"))
+                project_ids.add(getattr(target, "pk", target))
+            updated = self.update(**kwargs)
+            ProjectStats.objects.recompute(project_ids, using=self.db)
+        return updated
+
+    def bulk_create_with_stats(self, objs, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = self.bulk_create(objs, **kwargs)
+            ProjectStats.objects.recompute({obj.project_id for obj in objs}, using=self.db)
+        return objs
+
+
 class Task(TimeStampedModel):
     class Status(models.TextChoices):
         TODO = "todo", _("قيد الانتظار")
@@ -87,17 +121,33 @@ class Task(TimeStampedModel):
         help_text=_("من 0 إلى 100"),
     )
 
+    objects = TaskQuerySet.as_manager()
+
     class Meta(TimeStampedModel.Meta):
         verbose_name = _("مهمة")
         verbose_name_plural = _("المهام")
         indexes = [
-            models.Index(fields=["project", "status"]),
-            models.Index(fields=["assigned_to", "status"]),
+            *TimeStampedModel.Meta.indexes,
+            active_index("project", "status", name="app3_task_active_status"),
+            active_index("assigned_to", "status", name="app3_task_active_assignee"),
         ]
 
     def __str__(self) -> str:
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._stats_snapshot = instance.stats_snapshot()
+        return instance
+
+    def stats_snapshot(self):
+        """القيم التي تدخل في ProjectStats، أو None إن كان بعضها مؤجلًا (only/defer)."""
+        values = self.__dict__
+        if any(name not in values for name in STATS_FIELDS):
+            return None
+        return tuple(values[name] for name in STATS_FIELDS)
+
 
 class Comment(TimeStampedModel):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="comments", verbose_name=_("المهمة"))
@@ -114,12 +164,39 @@ class Comment(TimeStampedModel):
     class Meta(TimeStampedModel.Meta):
         verbose_name = _("تعليق")
         verbose_name_plural = _("التعليقات")
+        indexes = [
+            *TimeStampedModel.Meta.indexes,
+            active_index("task", "created_at", name="app3_comment_active_task"),
+        ]
 
     def __str__(self) -> str:
         return f"تعليق {self.id}"
 
 
+class ActivityLogQuerySet(JSONKeyQuerySet):
+    def for_object(self, model, pk, include_archived=False) -> list:
+        """سجل كائن واحد، الأحدث أولًا؛ include_archived يضيف المدخلات المنقولة إلى الأرشيف (APP3.archive)."""
+        # بالصيغة التي يكتبها APP3.audit: label_lower ومعرف نصي
+        if isinstance(model, str):
+            model = apps.get_model(model)
+        label = model._meta.label_lower
+        pk = str(pk)
+        entries = list(self.filter(metadata_model=label, metadata_pk=pk))
+        if include_archived:
+            from . import archive
+
+            entries.extend(
+                entry
+                for entry in archive.iter_archived(ActivityLog, ref=pk)
+                if entry.metadata.get("model") == label
+            )
+            entries.sort(key=lambda entry: entry.created_at, reverse=True)
+        return entries
+
+
 class ActivityLog(TimeStampedModel):
+    """مفاتيح metadata المبحوث عنها كثيرًا مرقّاة إلى أعمدة مولّدة مفهرسة (config.jsonkeys)."""
+
     class Action(models.TextChoices):
         CREATE = "create", _("إنشاء")
         UPDATE = "update", _("تحديث")
@@ -138,10 +215,249 @@ class ActivityLog(TimeStampedModel):
     action = models.CharField(_("الحدث"), max_length=20, choices=Action.choices, default=Action.OTHER, db_index=True)
     message = models.CharField(_("الوصف"), max_length=500)
     metadata = models.JSONField(_("بيانات إضافية"), default=dict, blank=True)
+    metadata_model = json_key_field("metadata", "model", _("النموذج"), max_length=100)
+    metadata_pk = json_key_field("metadata", "pk", _("معرف الكائن"), max_length=64)
+    metadata_ip = json_key_field("metadata", "ip", _("عنوان IP"), max_length=45)
+
+    objects = ActivityLogQuerySet.as_manager()
 
     class Meta(TimeStampedModel.Meta):
         verbose_name = _("سجل النشاط")
         verbose_name_plural = _("سجلات النشاط")
+        indexes = [
+            *TimeStampedModel.Meta.indexes,
+            models.Index(fields=["metadata_pk"]),
+            models.Index(fields=["metadata_model", "created_at"]),
+            models.Index(fields=["metadata_ip"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.action}: {self.message[:40]}"
+
+
+class ArchivedRecord(models.Model):
+    """فهرس خفيف للصفوف المنقولة إلى الأرشيف البارد (APP3.archive): أين يقع كل صف في ملفات JSONL."""
+
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(_("النموذج"), max_length=100)
+    object_id = models.CharField(_("معرف الكائن"), max_length=64)
+    # مرجع للبحث بغير المعرف: معرف الكائن لسجل النشاط، المهمة للتعليق، المشروع للمهمة
+    ref = models.CharField(_("المرجع"), max_length=64, blank=True)
+    created_at = models.DateTimeField(_("تاريخ الإنشاء"))
+    path = models.CharField(_("الملف"), max_length=255)
+    offset = models.BigIntegerField(_("موضع الدفعة في الملف"))
+    archived_at = models.DateTimeField(_("تاريخ الأرشفة"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("سجل مؤرشف")
+        verbose_name_plural = _("السجلات المؤرشفة")
+        constraints = [
+            models.UniqueConstraint(fields=["model", "object_id"], name="app3_archived_record_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["model", "ref", "created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.model} {self.object_id}"
+
+
+# ---------- إحصاءات المشاريع ----------
+
+STATS_FIELDS = ("project_id", "is_active", "status", "priority", "due_date", "progress")
+OPEN_STATUSES = (Task.Status.TODO, Task.Status.IN_PROGRESS)
+STATUS_COUNT_FIELDS = {
+    Task.Status.TODO: "todo_count",
+    Task.Status.IN_PROGRESS: "in_progress_count",
+    Task.Status.DONE: "done_count",
+    Task.Status.CANCELED: "canceled_count",
+}
+PRIORITY_COUNT_FIELDS = {
+    Task.Priority.LOW: "low_count",
+    Task.Priority.MEDIUM: "medium_count",
+    Task.Priority.HIGH: "high_count",
+    Task.Priority.URGENT: "urgent_count",
+}
+COUNTER_FIELDS = ("total", *STATUS_COUNT_FIELDS.values(), *PRIORITY_COUNT_FIELDS.values(), "progress_sum")
+
+
+class ProjectStatsQuerySet(models.QuerySet):
+    def with_overdue(self, today):
+        """يضيف overdue_count (المهام المفتوحة المستحقة قبل today) كاستعلام فرعي؛ الكل في استعلام واحد."""
+        overdue = (
+            ProjectDueBucket.objects.filter(project_id=OuterRef("project_id"), due_date__lt=today)
+            .order_by()
+            .values("project_id")
+            .annotate(total=Sum("open_count"))
+            .values("total")
+        )
+        return self.annotate(overdue_count=Coalesce(Subquery(overdue), 0))
+
+    def compute(self, project_ids=None, using=None):
+        """يحسب الإحصاءات من جدول المهام مباشرة: ({project_id: {field: value}}, {(project_id, due_date): count})."""
+        using = using or self.db
+        tasks = Task.active.using(using).order_by()
+        if project_ids is not None:
+            tasks = tasks.filter(project_id__in=project_ids)
+        annotations = {"total": Count("pk"), "progress_sum": Coalesce(Sum("progress"), 0)}
+        for status, name in STATUS_COUNT_FIELDS.items():
+            annotations[name] = Count("pk", filter=Q(status=status))
+        for priority, name in PRIORITY_COUNT_FIELDS.items():
+            annotations[name] = Count("pk", filter=Q(priority=priority))
+        counters = {row.pop("project_id"): row for row in tasks.values("project_id").annotate(**annotations)}
+        buckets = {
+            (row["project_id"], row["due_date"]): row["open_count"]
+            for row in tasks.filter(status__in=OPEN_STATUSES, due_date__isnull=False)
+            .values("project_id", "due_date")
+            .annotate(open_count=Count("pk"))
+        }
+        return counters, buckets
+
+    def recompute(self, project_ids=None, using=None):
+        """يعيد بناء الإحصاءات (لكل المشاريع إن كانت project_ids = None)."""
+        using = using or self.db
+        if project_ids is not None:
+            project_ids = {pk for pk in project_ids if pk is not None}
+            if not project_ids:
+                return
+        counters, buckets = self.compute(project_ids, using=using)
+        stats = ProjectStats.objects.using(using)
+        due_buckets = ProjectDueBucket.objects.using(using)
+        projects = Project.objects.using(using)
+        if project_ids is not None:
+            projects = projects.filter(pk__in=project_ids)
+            stats = stats.filter(project_id__in=project_ids)
+            due_buckets = due_buckets.filter(project_id__in=project_ids)
+        zero = dict.fromkeys(COUNTER_FIELDS, 0)
+        with transaction.atomic(using=using):
+            stats.delete()
+            due_buckets.delete()
+            project_ids = set(projects.values_list("pk", flat=True))
+            ProjectStats.objects.using(using).bulk_create(
+                [ProjectStats(project_id=pk, **{**zero, **counters.get(pk, {})}) for pk in project_ids],
+                batch_size=500,
+            )
+            ProjectDueBucket.objects.using(using).bulk_create(
+                [
+                    ProjectDueBucket(project_id=project_id, due_date=due_date, open_count=count)
+                    for (project_id, due_date), count in buckets.items()
+                    if project_id in project_ids
+                ],
+                batch_size=500,
+            )
+
+
+class ProjectStats(models.Model):
+    """
+    إحصاءات مهام المشروع (المهام النشطة فقط) محدّثة تدريجيًا من إشارات Task،
+    وتُعاد مطابقتها بالأمر reconcile_project_stats.
+    """
+
+    project = models.OneToOneField(
+        Project, on_delete=models.CASCADE, primary_key=True, related_name="stats", verbose_name=_("المشروع")
+    )
+    total = models.IntegerField(_("عدد المهام"), default=0)
+    todo_count = models.IntegerField(_("قيد الانتظار"), default=0)
+    in_progress_count = models.IntegerField(_("قيد التنفيذ"), default=0)
+    done_count = models.IntegerField(_("مكتملة"), default=0)
+    canceled_count = models.IntegerField(_("ملغاة"), default=0)
+    low_count = models.IntegerField(_("أولوية منخفضة"), default=0)
+    medium_count = models.IntegerField(_("أولوية متوسطة"), default=0)
+    high_count = models.IntegerField(_("أولوية عالية"), default=0)
+    urgent_count = models.IntegerField(_("أولوية عاجلة"), default=0)
+    progress_sum = models.BigIntegerField(_("مجموع نسب الإنجاز"), default=0)
+    updated_at = models.DateTimeField(_("تاريخ التحديث"), auto_now=True)
+
+    objects = ProjectStatsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("إحصاءات مشروع")
+        verbose_name_plural = _("إحصاءات المشاريع")
+
+    def __str__(self) -> str:
+        return f"{self.project_id}: {self.total}"
+
+    @property
+    def average_progress(self) -> float:
+        return self.progress_sum / self.total if self.total else 0.0
+
+
+class ProjectDueBucket(models.Model):
+    """عدد المهام المفتوحة لكل (مشروع، تاريخ استحقاق)؛ المتأخرة = مجموع الدلاء قبل اليوم، فلا تتقادم الإحصاءات مع مرور الأيام."""
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="due_buckets", verbose_name=_("المشروع"))
+    due_date = models.DateField(_("تاريخ الاستحقاق"))
+    open_count = models.IntegerField(_("المهام المفتوحة"), default=0)
+
+    class Meta:
+        verbose_name = _("دلو استحقاق")
+        verbose_name_plural = _("دلاء الاستحقاق")
+        constraints = [
+            models.UniqueConstraint(fields=["project", "due_date"], name="app3_due_bucket_unique"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.project_id} {self.due_date}: {self.open_count}"
+
+
+def _stats_delta(snapshot, sign, counters, buckets):
+    # المهام غير النشطة لا تدخل في الإحصاءات
+    if snapshot is None or not snapshot[1]:
+        return
+    project_id, _is_active, status, priority, due_date, progress = snapshot
+    delta = counters.setdefault(project_id, Counter())
+    delta["total"] += sign
+    delta["progress_sum"] += sign * (progress or 0)
+    if status in STATUS_COUNT_FIELDS:
+        delta[STATUS_COUNT_FIELDS[status]] += sign
+    if priority in PRIORITY_COUNT_FIELDS:
+        delta[PRIORITY_COUNT_FIELDS[priority]] += sign
+    if status in OPEN_STATUSES and due_date is not None:
+        buckets[(project_id, due_date)] += sign
+
+
+def _apply_stats_delta(old, new, using, create):
+    """يطبّق الفرق بين لقطتين بتحديثات F() ذرّية؛ create=False عند الحذف حتى لا تُنشأ صفوف لمشروع يُحذف."""
+    counters, buckets = {}, Counter()
+    _stats_delta(old, -1, counters, buckets)
+    _stats_delta(new, +1, counters, buckets)
+    missing = set()
+    for project_id, delta in counters.items():
+        changes = {name: F(name) + value for name, value in delta.items() if value}
+        if not changes:
+            continue
+        if not ProjectStats.objects.using(using).filter(project_id=project_id).update(**changes):
+            missing.add(project_id)
+    for (project_id, due_date), value in buckets.items():
+        if not value or project_id in missing:
+            continue
+        bucket = ProjectDueBucket.objects.using(using).filter(project_id=project_id, due_date=due_date)
+        if bucket.update(open_count=F("open_count") + value):
+            if value < 0:
+                bucket.filter(open_count__lte=0).delete()
+        elif value > 0 and create:
+            ProjectDueBucket.objects.using(using).create(project_id=project_id, due_date=due_date, open_count=value)
+    if missing and create:
+        # لا يوجد صف إحصاءات بعد (مشروع جديد أو بيانات سابقة): حساب كامل لهذا المشروع فقط
+        ProjectStats.objects.using(using).recompute(missing)
+
+
+@receiver(post_save, sender=Task, dispatch_uid="project-stats-save")
+def _update_project_stats_on_save(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    new = instance.stats_snapshot()
+    old = None if created else getattr(instance, "_stats_snapshot", None)
+    if not created and old is None:
+        # الحالة السابقة غير معروفة (كائن لم يُحمّل من القاعدة أو بحقول مؤجلة): حساب كامل للمشروع
+        ProjectStats.objects.using(using).recompute({instance.project_id})
+    elif old != new:
+        with transaction.atomic(using=using):
+            _apply_stats_delta(old, new, using, create=True)
+    instance._stats_snapshot = new
+
+
+@receiver(post_delete, sender=Task, dispatch_uid="project-stats-delete")
+def _update_project_stats_on_delete(sender, instance, using=None, **kwargs):
+    old = getattr(instance, "_stats_snapshot", None) or instance.stats_snapshot()
+    _apply_stats_delta(old, None, using, create=False)
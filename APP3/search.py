@@ -0,0 +1,9 @@
+# app3/search.py
+from config.search import FullTextIndex
+
+from .models import Comment, Project, Task
+
+index = FullTextIndex("APP3_search")
+index.register(Project, title=("name",), body=("description",))
+index.register(Task, title=("title",), body=("description",))
+index.register(Comment, body=("body",))
@@ -1,3 +1,782 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models import Q
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.http import HttpResponse
+from django.urls import path, reverse
+from django.utils import timezone
+
+from config import indexadvisor, routers
+from config.db.transactions import atomic_immediate
+from config.ids import default_pk, uuid7
+from config.pagination import KeysetPaginator
+from config.search import normalize_arabic, search
+from config.sqlstats import fingerprint, load_route_stats, route_stats
+from config.testing import ADMIN_BUDGET_ROWS, AdminQueryBudgetMixin, query_plan
+
+from . import archive, audit
+from .activity import ActivityLogWriter
+from .admin import ActivityLogAdmin
+from .models import ActivityLog, ArchivedRecord, Comment, Project, ProjectStats, Task
+from .search import index as search_index
+
+
+def task_titles_view(request):
+    # عمدًا بدون select_related لاختبار كشف N+1
+    return HttpResponse(", ".join(f"{task.title} ({task.project.name})" for task in Task.objects.all()))
+
+
+urlpatterns = [path("tasks/", task_titles_view)]
+
+
+class ActivityLogWriterSyncTests(TestCase):
+    def test_sync_mode_writes_immediately(self):
+        writer = ActivityLogWriter(sync=True)
+        writer.log(ActivityLog.Action.LOGIN, "تسجيل دخول", metadata={"ip": "127.0.0.1"})
+        log = ActivityLog.objects.get()
+        self.assertEqual(log.action, ActivityLog.Action.LOGIN)
+        self.assertEqual(log.metadata, {"ip": "127.0.0.1"})
+
+
+class ActivityLogWriterBufferedTests(TransactionTestCase):
+    def test_batches_are_flushed(self):
+        writer = ActivityLogWriter(sync=False, batch_size=10, flush_interval=0.05)
+        for i in range(25):
+            writer.log(ActivityLog.Action.OTHER, f"entry {i}")
+        writer.flush(timeout=5)
+        self.assertEqual(ActivityLog.objects.count(), 25)
+        writer.close()
+
+    def test_close_flushes_pending_entries(self):
+        writer = ActivityLogWriter(sync=False, batch_size=1000, flush_interval=60)
+        for i in range(5):
+            writer.log(ActivityLog.Action.OTHER, f"entry {i}")
+        writer.close()
+        self.assertEqual(ActivityLog.objects.count(), 5)
+        writer.log(ActivityLog.Action.OTHER, "after close")
+        self.assertEqual(ActivityLog.objects.count(), 6)
+
+    def test_full_queue_falls_back_to_direct_write(self):
+        writer = ActivityLogWriter(sync=False, max_queue_size=1, put_timeout=0, flush_interval=60, batch_size=1000)
+        with self.assertLogs("APP3.activity", "WARNING"):
+            for i in range(5):
+                writer.log(ActivityLog.Action.OTHER, f"entry {i}")
+        writer.close()
+        self.assertEqual(ActivityLog.objects.count(), 5)
+
+    def test_failed_batches_are_retried_then_written_row_by_row(self):
+        real_bulk_create = ActivityLog.objects.bulk_create.__func__
+        failures = []
+
+        def flaky(manager, objs, **kwargs):
+            # أول محاولتين مقفلتان، ثم دفعات أكبر من صف تفشل دائمًا، والسجل "bad" لا يُكتب أبدًا
+            if len(failures) < 2 or len(objs) > 1 or objs[0].message == "bad":
+                failures.append(len(objs))
+                raise OperationalError("database is locked")
+            return real_bulk_create(manager, objs, **kwargs)
+
+        writer = ActivityLogWriter(sync=False, flush_interval=60, retries=2, retry_backoff=0)
+        for message in ("a", "bad", "b"):
+            writer.log(ActivityLog.Action.OTHER, message)
+        with mock.patch.object(type(ActivityLog.objects), "bulk_create", flaky), self.assertLogs("APP3.activity"):
+            writer.close()
+        self.assertEqual(failures[:3], [3, 3, 3])
+        self.assertEqual(sorted(ActivityLog.objects.values_list("message", flat=True)), ["a", "b"])
+        self.assertEqual(writer.dropped, 1)
+
+
+class TimeOrderedPrimaryKeyTests(TestCase):
+    def test_uuid7_is_monotonic(self):
+        ids = [uuid7() for _ in range(5000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual({i.version for i in ids}, {7})
+        self.assertEqual([i.hex for i in ids], sorted(i.hex for i in ids))
+
+    def test_default_pk_is_opt_in(self):
+        with self.settings(TIME_ORDERED_PRIMARY_KEYS=False):
+            self.assertEqual(default_pk().version, 4)
+        with self.settings(TIME_ORDERED_PRIMARY_KEYS=True):
+            self.assertEqual(default_pk().version, 7)
+            log = ActivityLog.objects.create(message="uuid7")
+        self.assertEqual(log.pk.version, 7)
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        ActivityLog.objects.bulk_create(ActivityLog(message=f"entry {i}") for i in range(23))
+        # نصف الصفوف بنفس created_at لاختبار كسر التعادل بالمعرف
+        now = timezone.now()
+        for i, log in enumerate(ActivityLog.objects.order_by("pk")):
+            ActivityLog.objects.filter(pk=log.pk).update(created_at=now - timedelta(seconds=i // 2))
+        cls.expected = list(ActivityLog.objects.order_by("-created_at", "-pk").values_list("pk", flat=True))
+
+    def paginator(self):
+        return KeysetPaginator(ActivityLog.objects.order_by("-created_at", "-pk"), 5)
+
+    def test_forward_and_backward_traversal(self):
+        paginator = self.paginator()
+        pages, page = [], paginator.keyset_page()
+        pages.append(page)
+        while page.has_next():
+            page = paginator.keyset_page(page.next_cursor())
+            pages.append(page)
+        self.assertEqual([obj.pk for p in pages for obj in p], self.expected)
+        self.assertEqual([len(p) for p in pages], [5, 5, 5, 5, 3])
+
+        back = paginator.keyset_page(pages[-1].previous_cursor())
+        self.assertEqual([obj.pk for obj in back], [obj.pk for obj in pages[-2]])
+        self.assertTrue(back.has_previous())
+        first = paginator.keyset_page(pages[1].previous_cursor())
+        self.assertFalse(first.has_previous())
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            self.paginator().keyset_page("not-a-cursor")
+
+    def test_estimated_count_avoids_exact_count(self):
+        archive.refresh_statistics([ActivityLog])
+        ActivityLog.objects.filter(pk__in=self.expected[:20]).delete()
+        paginator = KeysetPaginator(ActivityLog.objects.order_by("-created_at"), 5, estimated_count=True)
+        with CaptureQueriesContext(connection) as ctx:
+            # من الإحصاءات: حجم الجدول عند آخر ANALYZE
+            self.assertEqual((paginator.count, paginator.count_is_estimate), (23, True))
+        self.assertNotIn("COUNT(", " ".join(q["sql"].upper() for q in ctx.captured_queries))
+
+        archive.refresh_statistics([ActivityLog])
+        paginator = KeysetPaginator(ActivityLog.objects.order_by("-created_at"), 5, estimated_count=True)
+        self.assertEqual(paginator.count, 3)
+
+    def test_capped_count_is_estimate_only_at_the_cap(self):
+        filtered = ActivityLog.objects.filter(action=ActivityLog.Action.OTHER).order_by("-created_at")
+        exact = filtered.count()
+        paginator = KeysetPaginator(filtered, 5, estimated_count=True, count_limit=exact + 1)
+        self.assertEqual((paginator.count, paginator.count_is_estimate), (exact, False))
+        paginator = KeysetPaginator(filtered, 5, estimated_count=True, count_limit=exact - 1)
+        self.assertEqual((paginator.count, paginator.count_is_estimate), (exact - 1, True))
+
+    def test_admin_changelist_uses_cursor(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        with audit.suspend():  # سجل الدخول كان سيظهر أول القائمة
+            self.client.force_login(user)
+        url = reverse("admin:APP3_activitylog_changelist")
+        with mock.patch.object(ActivityLogAdmin, "list_per_page", 10):
+            cl = self.client.get(url).context["cl"]
+            self.assertEqual([obj.pk for obj in cl.result_list], self.expected[:10])
+            self.assertFalse(cl.keyset_page.has_previous())
+
+            response = self.client.get(url, {"cursor": cl.keyset_page.next_cursor()})
+            self.assertEqual([obj.pk for obj in response.context["cl"].result_list], self.expected[10:20])
+            self.assertContains(response, "cursor=")
+
+        response = self.client.get(url, {"cursor": "broken"})
+        self.assertEqual(response.status_code, 302)
+
+
+class FullTextSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = Project.objects.create(name="مشروع الصيانة")
+        cls.task = Task.objects.create(project=cls.project, title="إصلاح المكيّفات", description="في المبنى الرئيسي")
+        cls.other = Task.objects.create(project=cls.project, title="تقرير شهري", description="يتضمن إصلاح الأبواب")
+        cls.comment = Comment.objects.create(task=cls.task, body="تمت مُراجعة الطلبيّة")
+
+    def test_normalize_arabic(self):
+        self.assertEqual(normalize_arabic("أَحْمَد إلى مدرسةٌ آمـــال"), "احمد الي مدرسه امال")
+
+    def test_search_folds_alef_and_diacritics_and_ranks_titles_first(self):
+        results = search_index.search("اصلاح", models=[Task])
+        self.assertEqual([pk for _, pk, _ in results], [self.task.pk, self.other.pk])
+        self.assertEqual([obj for obj, _ in search("الطلبية")], [self.comment])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.other.title = "جرد المستودع"
+        self.other.save()
+        self.assertEqual([obj for obj, _ in search("المستودع")], [self.other])
+        self.other.delete()
+        self.assertEqual(search("المستودع"), [])
+
+    def test_admin_search_uses_index_and_related_project(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        self.client.force_login(user)
+        url = reverse("admin:APP3_task_changelist")
+        response = self.client.get(url, {"q": "المكيفات"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.task])
+        response = self.client.get(url, {"q": "الصيانه"})
+        self.assertEqual(set(response.context["cl"].result_list), {self.task, self.other})
+
+    def test_search_api(self):
+        user = get_user_model().objects.create_user("user", password="pass")
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(reverse("search"), {"q": "تقرير"}).status_code, 302)
+
+        user.is_staff = True
+        user.save()
+        response = self.client.get(reverse("search"), {"q": "تقرير"})
+        self.assertEqual(response.json()["results"], [])
+
+        user.user_permissions.add(Permission.objects.get(codename="view_task"))
+        response = self.client.get(reverse("search"), {"q": "اصلاح", "limit": -5})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r["id"] for r in response.json()["results"]], [str(self.task.pk)])
+
+    def test_admin_search_keeps_unindexed_fields(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        worker = get_user_model().objects.create_user("maintenance.crew")
+        Task.objects.filter(pk=self.other.pk).update(assigned_to=worker)
+        self.client.force_login(user)
+        response = self.client.get(reverse("admin:APP3_task_changelist"), {"q": "crew"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.other])
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        project = Project.objects.create(name="مشروع التصدير")
+        cls.tasks = [Task.objects.create(project=project, title=f"مهمة {i}", assigned_to=cls.user) for i in range(3)]
+
+    def test_admin_action_streams_csv_without_per_row_queries(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("admin:APP3_task_changelist"), {
+            "action": "export_csv",
+            "_selected_action": [str(task.pk) for task in self.tasks],
+        })
+        self.assertTrue(response.streaming)
+        with CaptureQueriesContext(connection) as queries:
+            content = b"".join(response.streaming_content).decode("utf-8-sig")
+        self.assertEqual(len(queries), 1)
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual({row["project__name"] for row in rows}, {"مشروع التصدير"})
+        self.assertEqual(rows[0]["assigned_to__username"], "admin")
+
+    def test_export_data_command_jsonl(self):
+        out = io.StringIO()
+        call_command("export_data", "APP3.Task", format="jsonl", filter=["title=مهمة 1"], stdout=out, stderr=io.StringIO())
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], str(self.tasks[1].pk))
+        self.assertEqual(rows[0]["project__name"], "مشروع التصدير")
+
+
+class ProjectStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alpha = Project.objects.create(name="ألفا")
+        cls.beta = Project.objects.create(name="بيتا")
+
+    def stats(self, project, today=date(2025, 6, 1)):
+        return ProjectStats.objects.with_overdue(today).get(project=project)
+
+    def assertMatchesRecompute(self):
+        expected, _ = ProjectStats.objects.compute()
+        for project_id, counters in expected.items():
+            self.assertEqual(ProjectStats.objects.filter(project_id=project_id).values(*counters).get(), counters)
+
+    def test_create_update_and_delete_maintain_counts(self):
+        task = Task.objects.create(project=self.alpha, title="أ", priority=Task.Priority.HIGH, progress=40, due_date=date(2025, 5, 1))
+        Task.objects.create(project=self.alpha, title="ب", progress=20, due_date=date(2025, 7, 1))
+        stats = self.stats(self.alpha)
+        self.assertEqual((stats.total, stats.todo_count, stats.high_count, stats.overdue_count), (2, 2, 1, 1))
+        self.assertEqual(stats.average_progress, 30)
+
+        task = Task.objects.get(pk=task.pk)
+        task.status = Task.Status.DONE
+        task.save()
+        stats = self.stats(self.alpha)
+        self.assertEqual((stats.todo_count, stats.done_count, stats.overdue_count), (1, 1, 0))
+        self.assertEqual(self.stats(self.alpha, today=date(2025, 8, 1)).overdue_count, 1)
+
+        task.project = self.beta
+        task.save()
+        self.assertEqual((self.stats(self.alpha).total, self.stats(self.beta).total), (1, 1))
+
+        task.delete()
+        self.assertEqual(self.stats(self.beta).total, 0)
+        self.assertMatchesRecompute()
+
+    def test_bulk_update_recomputes_affected_projects(self):
+        Task.objects.bulk_create_with_stats([Task(project=self.alpha, title=str(i)) for i in range(3)])
+        self.assertEqual(self.stats(self.alpha).total, 3)
+        Task.objects.filter(project=self.alpha).update_with_stats(project=self.beta, status=Task.Status.CANCELED)
+        self.assertEqual(self.stats(self.alpha).total, 0)
+        self.assertEqual(self.stats(self.beta).canceled_count, 3)
+
+    def test_reading_many_projects_is_one_query(self):
+        for project in (self.alpha, self.beta):
+            Task.objects.create(project=project, title="x", due_date=date(2025, 1, 1))
+        with self.assertNumQueries(1):
+            rows = {s.project_id: s.overdue_count for s in ProjectStats.objects.with_overdue(date(2025, 6, 1))}
+        self.assertEqual(rows, {self.alpha.pk: 1, self.beta.pk: 1})
+
+    def test_reconcile_reports_and_fixes_drift(self):
+        Task.objects.create(project=self.alpha, title="x")
+        ProjectStats.objects.filter(project=self.alpha).update(total=7)
+        out = io.StringIO()
+        call_command("reconcile_project_stats", stdout=out)
+        self.assertIn("projects with drift: 1", out.getvalue())
+        self.assertEqual(self.stats(self.alpha).total, 1)
+
+
+class SQLInstrumentationTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.addCleanup(route_stats.routes.clear)
+        for i in range(6):
+            Task.objects.create(project=Project.objects.create(name=f"م{i}"), title=f"مهمة {i}")
+
+    def test_fingerprint_collapses_values_and_in_lists(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) AND "n" = 5 AND "s" = \'x\''),
+            'SELECT * FROM "t" WHERE "id" IN (...) AND "n" = ? AND "s" = ?',
+        )
+
+    def test_middleware_reports_server_timing_and_flags_nplusone(self):
+        config = {"ENABLED": True, "NPLUSONE_THRESHOLD": 5, "BUDGET_QUERIES": 3, "STATS_DIR": self.tmp.name}
+        middleware = ["config.sqlstats.SQLInstrumentationMiddleware"]
+        with self.settings(SQL_INSTRUMENTATION=config, MIDDLEWARE=middleware, ROOT_URLCONF=__name__):
+            with self.assertLogs("config.sqlstats", "WARNING") as logs:
+                response = self.client.get("/tasks/")
+            route_stats.flush()
+        self.assertRegex(response["Server-Timing"], r'db;dur=[\d.]+;desc="7 queries"')
+        self.assertTrue(any("Possible N+1" in line and "APP3_project" in line for line in logs.output))
+        self.assertTrue(any("Query budget exceeded" in line for line in logs.output))
+        stats = load_route_stats(self.tmp.name)["tasks/"]
+        self.assertEqual((stats["requests"], stats["queries"]), (1, 7))
+        self.assertEqual(list(stats["nplusone"].values()), [6])
+
+
+class AdminQueryBudgetTests(AdminQueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        rows = ADMIN_BUDGET_ROWS
+        users = User.objects.bulk_create([User(username=f"user{i}") for i in range(rows)])
+        projects = Project.objects.bulk_create([Project(name=f"مشروع {i}", owner=users[i]) for i in range(rows)])
+        tasks = Task.objects.bulk_create_with_stats([
+            Task(project=projects[i], title=f"مهمة {i}", assigned_to=users[i], created_by=users[-i - 1])
+            for i in range(rows)
+        ])
+        Comment.objects.bulk_create([Comment(task=task, author=users[i], body=f"تعليق {i}") for i, task in enumerate(tasks)])
+        ActivityLog.objects.bulk_create([ActivityLog(actor=users[i], message=f"حدث {i}") for i in range(rows)])
+
+    def test_admin_pages_stay_within_query_budget(self):
+        self.assertAdminBudgets("APP3")
+
+    def test_task_form_renders_selected_users_only(self):
+        self.login_superuser()
+        task = Task.objects.first()
+        html = self.client.get(reverse("admin:APP3_task_change", args=[task.pk])).content.decode()
+        select = html[html.index('name="assigned_to"'):]
+        select = select[: select.index("</select>")]
+        # الخيار المختار فقط (مع الفارغ)؛ البقية تأتي من admin:autocomplete عند الكتابة
+        self.assertIn("admin-autocomplete", select)
+        self.assertLessEqual(select.count("<option"), 2)
+        self.assertIn(f'value="{task.assigned_to_id}" selected', select)
+
+
+class SeedCommandTests(TestCase):
+    COUNTS = ["users=20", "departments=3", "categories=15", "assets=40", "projects=4", "tasks=30", "comments=30", "activity=50"]
+
+    def test_seed_generates_consistent_dataset(self):
+        from APP2.models import Asset, Category
+
+        call_command("seed", seed=7, count=self.COUNTS, stdout=io.StringIO())
+        self.assertEqual(get_user_model().objects.count(), 20)
+        self.assertEqual(Asset.objects.count(), 40)
+        self.assertEqual(ActivityLog.objects.count(), 50)
+        self.assertTrue(Task.objects.exists())
+        # المسارات المولدة تطابق ما يبنيه rebuild_paths
+        paths = dict(Category.objects.values_list("pk", "path"))
+        Category.objects.rebuild_paths()
+        self.assertEqual(dict(Category.objects.values_list("pk", "path")), paths)
+        out = io.StringIO()
+        call_command("reconcile_project_stats", dry_run=True, stdout=out)
+        self.assertIn("projects with drift: 0", out.getvalue())
+        self.assertTrue(search("تحديث") or search("update"))
+
+    @override_settings(TIME_ORDERED_PRIMARY_KEYS=True)
+    def test_time_ordered_keys_follow_creation_time(self):
+        call_command("seed", seed=7, count=self.COUNTS, stdout=io.StringIO())
+        for model in (Task, Comment):
+            with self.subTest(model=model.__name__):
+                rows = list(model.objects.order_by("created_at", "pk").values_list("pk", "created_at"))
+                self.assertTrue(rows)
+                self.assertTrue(all(pk.version == 7 for pk, _ in rows))
+                # الطابع الزمني في أول 48 بتًا هو تاريخ الإنشاء بالميلي ثانية
+                self.assertEqual([pk.int >> 80 for pk, _ in rows], [int(at.timestamp() * 1000) for _, at in rows])
+
+    def test_same_seed_builds_same_rows(self):
+        from APP3.management.commands.seed import BASE_COUNTS, Plan, build_assets
+
+        def build():
+            start = timezone.make_aware(timezone.datetime(2024, 1, 1))
+            plan = Plan(3, dict(BASE_COUNTS), start, start + timedelta(days=365), [1, 2, 3], False, 0.7)
+            return [
+                [{f.attname: getattr(obj, f.attname) for f in model._meta.concrete_fields} for obj in objs]
+                for model, objs in build_assets(plan, 10, 20)
+            ]
+
+        self.assertEqual(build(), build())
+
+
+class TunedSQLiteBackendTests(TestCase):
+    def test_pragmas_and_deferred_transactions(self):
+        from config.db.backends.sqlite3.base import DatabaseWrapper
+
+        with tempfile.TemporaryDirectory() as directory:
+            settings_dict = {**connection.settings_dict, "NAME": f"{directory}/db.sqlite3", "OPTIONS": {"timeout": 3}}
+            wrapper = DatabaseWrapper(settings_dict, alias="pragma_test")
+            try:
+                with wrapper.cursor() as cursor:
+                    values = {
+                        name: cursor.execute(f"PRAGMA {name}").fetchone()[0]
+                        for name in ("journal_mode", "synchronous", "busy_timeout", "temp_store")
+                    }
+                self.assertEqual(values, {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 3000, "temp_store": 2})
+                # المعاملات مؤجلة افتراضيًا؛ atomic_immediate وحده يبدأ بـ BEGIN IMMEDIATE
+                connections["pragma_test"] = wrapper
+                with CaptureQueriesContext(wrapper) as ctx:
+                    with transaction.atomic(using="pragma_test"):
+                        pass
+                    with atomic_immediate(using="pragma_test"):
+                        with atomic_immediate(using="pragma_test"):
+                            pass
+                self.assertEqual([q["sql"] for q in ctx.captured_queries if q["sql"].startswith("BEGIN")],
+                                 ["BEGIN", "BEGIN IMMEDIATE"])
+                self.assertIsNone(wrapper.transaction_mode)
+            finally:
+                wrapper.close()
+                del connections["pragma_test"]
+
+
+class ReadReplicaRoutingTests(TransactionTestCase):
+    # TransactionTestCase لأن القراءة داخل معاملة على default تُوجَّه إليها دائمًا؛
+    # وQuerySet.db يكفي لمعرفة الوجهة دون فتح اتصال بالنسخة
+    def setUp(self):
+        patcher = mock.patch("config.routers.replica_lag", return_value=1.0)
+        self.lag = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.project = Project.objects.create(name="توجيه")
+
+    def read_db(self):
+        return Task.objects.all().db
+
+    def test_reads_go_to_replica_until_a_write_pins_primary(self):
+        token = routers._pinned.set(False)
+        self.addCleanup(routers._pinned.reset, token)
+        self.assertEqual(self.read_db(), "replica")
+        with routers.use_primary():
+            self.assertEqual(self.read_db(), "default")
+        self.assertEqual(self.read_db(), "replica")
+        with transaction.atomic():
+            self.assertEqual(self.read_db(), "default")
+        self.assertEqual(Project.objects.all().db, "default")  # نموذج غير موجّه
+        Task.objects.create(project=self.project, title="كتابة")
+        self.assertEqual(self.read_db(), "default")
+
+    def test_stale_replica_and_fresh_reads_use_primary(self):
+        token = routers._pinned.set(False)
+        self.addCleanup(routers._pinned.reset, token)
+        with routers.fresh_reads(max_lag=0.5):
+            self.assertEqual(self.read_db(), "default")
+        self.lag.return_value = float("inf")
+        self.assertEqual(self.read_db(), "default")
+
+    def test_write_request_sets_pin_cookie(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        self.client.force_login(user)
+        response = self.client.post(reverse("admin:APP3_task_add"), {
+            "project": self.project.pk, "title": "جديدة", "status": "todo", "priority": 2, "progress": 0,
+            "is_active": "on",
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(routers.PIN_COOKIE, response.cookies)
+
+
+class ReplicaSnapshotTests(TransactionTestCase):
+    def test_snapshot_copies_database_and_stamps_lag(self):
+        from django.db import connections
+
+        from config.replica import replica_lag, snapshot
+
+        Project.objects.create(name="لقطة")
+        with tempfile.TemporaryDirectory() as directory:
+            connections.settings["snapshot_test"] = {**connections.settings["default"], "NAME": f"{directory}/replica.sqlite3"}
+            self.addCleanup(connections.settings.pop, "snapshot_test")
+            self.assertEqual(replica_lag("snapshot_test"), float("inf"))
+            snapshot("default", "snapshot_test")
+            self.assertLess(replica_lag("snapshot_test"), 5)
+            copy = sqlite3.connect(f"{directory}/replica.sqlite3")
+            try:
+                self.assertEqual(copy.execute('SELECT name FROM "APP3_project"').fetchall(), [("لقطة",)])
+            finally:
+                copy.close()
+
+
+class AuditTests(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(name="تدقيق")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task = Task.objects.create(project=self.project, title="قبل")
+        self.task = Task.objects.get(pk=self.task.pk)
+
+    def entries(self, action):
+        return ActivityLog.objects.filter(action=action, metadata__model="APP3.task")
+
+    def test_update_records_only_changed_fields(self):
+        self.assertEqual(self.entries(ActivityLog.Action.CREATE).count(), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.status = Task.Status.DONE
+            self.task.progress = 100
+            self.task.save()
+            self.task.save()  # بلا تغيير: لا سجل
+        [entry] = self.entries(ActivityLog.Action.UPDATE)
+        self.assertEqual(entry.metadata, {
+            "model": "APP3.task",
+            "pk": str(self.task.pk),
+            "changes": {"status": ["todo", "done"], "progress": [0, 100]},
+        })
+
+    def test_rolled_back_change_is_not_logged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self.task.title = "بعد"
+                self.task.save()
+                raise RuntimeError
+        self.assertFalse(self.entries(ActivityLog.Action.UPDATE).exists())
+
+    def test_actor_from_context_and_request(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        with self.captureOnCommitCallbacks(execute=True), audit.audit_actor(user):
+            self.task.delete()
+        self.assertEqual(self.entries(ActivityLog.Action.DELETE).get().actor, user)
+
+        task = Task.objects.create(project=self.project, title="قبل")
+        self.client.force_login(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("admin:APP3_task_change", args=[task.pk]), {
+                "project": self.project.pk, "title": "بعد", "status": "todo", "priority": 2, "progress": 0,
+                "is_active": "on",
+            })
+        entry = self.entries(ActivityLog.Action.UPDATE).get()
+        self.assertEqual(entry.actor, user)
+        self.assertEqual(entry.metadata["changes"], {"title": ["قبل", "بعد"]})
+
+    def test_receiver_cost_within_budget(self):
+        # داخل معاملة الاختبار on_commit يؤجل التسليم للكاتب، فيُقاس عمل المستقبل وحده
+        runs = 2000
+        started = time.perf_counter()
+        for i in range(runs):
+            self.task.progress = i % 100
+            audit._audit_save(Task, self.task, created=False, using="default")
+        elapsed_us = (time.perf_counter() - started) / runs * 1e6
+        self.assertLess(elapsed_us, audit.get_config()["BUDGET_US"])
+
+
+class MetadataKeyColumnTests(TestCase):
+    def setUp(self):
+        ActivityLog.objects.bulk_create([
+            ActivityLog(message="أ", metadata={"model": "APP3.task", "pk": "abc", "ip": "10.0.0.1"}),
+            ActivityLog(message="ب", metadata={"model": "APP2.asset", "pk": "def"}),
+            ActivityLog(message="ج", metadata={"pk": 5}),
+        ])
+
+    def test_string_lookups_use_generated_columns(self):
+        queryset = ActivityLog.objects.filter(metadata__pk="abc")
+        self.assertIn('"metadata_pk"', str(queryset.query))
+        self.assertNotIn("JSON_EXTRACT", str(queryset.query).upper())
+        self.assertEqual(queryset.get().message, "أ")
+        either = ActivityLog.objects.filter(Q(metadata__model__in=["APP2.asset"]) | Q(metadata__ip="10.0.0.1"))
+        self.assertEqual(sorted(either.values_list("message", flat=True)), ["أ", "ب"])
+        self.assertEqual(ActivityLog.objects.exclude(metadata__model="APP3.task").count(), 2)
+
+    def test_non_string_lookups_keep_json_semantics(self):
+        queryset = ActivityLog.objects.filter(metadata__pk=5)
+        self.assertIn("JSON_EXTRACT", str(queryset.query).upper())
+        self.assertEqual(queryset.get().message, "ج")
+
+    def test_admin_filters_by_audited_model(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        self.client.force_login(user)
+        response = self.client.get(reverse("admin:APP3_activitylog_changelist"), {"metadata_model": "APP2.asset"})
+        self.assertEqual([obj.message for obj in response.context["cl"].result_list], ["ب"])
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.enterContext(override_settings(ARCHIVE={"DIR": tmp.name, "PAUSE": 0}))
+        old = timezone.now() - timedelta(days=400)
+        self.project = Project.objects.create(name="أرشفة")
+        self.done = Task.objects.create(project=self.project, title="قديمة", status=Task.Status.DONE)
+        self.open = Task.objects.create(project=self.project, title="مفتوحة")
+        self.comment = Comment.objects.create(task=self.done, body="تعليق قديم")
+        Task.objects.filter(pk__in=[self.done.pk, self.open.pk]).update(updated_at=old)
+        Comment.objects.filter(pk=self.comment.pk).update(created_at=old)
+        self.logs = ActivityLog.objects.bulk_create([
+            ActivityLog(message=f"سجل {i}", metadata={"model": "APP3.task", "pk": str(self.done.pk)}) for i in range(3)
+        ])
+        ActivityLog.objects.filter(pk__in=[log.pk for log in self.logs[:2]]).update(created_at=old)
+
+    def test_moves_cold_rows_and_keeps_them_readable(self):
+        totals = archive.run(batch_size=1)
+        self.assertEqual(totals, {"APP3.ActivityLog": 2, "APP3.Task": 1})
+        self.assertFalse(Task.objects.filter(pk=self.done.pk).exists())
+        self.assertFalse(Comment.objects.filter(pk=self.comment.pk).exists())
+        self.assertTrue(Task.objects.filter(pk=self.open.pk).exists())
+        self.assertEqual(ActivityLog.objects.count(), 1)
+
+        task = archive.get(Task, self.done.pk)
+        self.assertEqual((task.title, task.status, task.project_id), ("قديمة", Task.Status.DONE, self.project.pk))
+        self.assertEqual([c.body for c in archive.iter_archived(Comment, ref=str(self.done.pk))], ["تعليق قديم"])
+        history = ActivityLog.objects.for_object(Task, self.done.pk, include_archived=True)
+        self.assertEqual(sorted(log.message for log in history), ["سجل 0", "سجل 1", "سجل 2"])
+        self.assertEqual(len(ActivityLog.objects.for_object("APP3.Task", self.done.pk)), 1)
+        # الإحصاءات المحدثة تدريجيًا تطابق إعادة الحساب بعد الحذف
+        self.assertEqual(ProjectStats.objects.get(project=self.project).total, 1)
+        self.assertEqual(ProjectStats.objects.compute({self.project.pk})[0][self.project.pk]["total"], 1)
+
+        self.assertEqual(archive.run(), {"APP3.ActivityLog": 0, "APP3.Task": 0})
+        self.assertEqual(ArchivedRecord.objects.count(), 4)
+
+    def test_interrupted_batch_is_resumed(self):
+        with mock.patch.object(ArchivedRecord.objects, "bulk_create", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                archive.run(["APP3.Task"])
+        # الملف كُتب والمعاملة تراجعت: الصفوف باقية ولا فهرس لها
+        self.assertTrue(Task.objects.filter(pk=self.done.pk).exists())
+        self.assertFalse(ArchivedRecord.objects.exists())
+        self.assertEqual(archive.run(["APP3.Task"]), {"APP3.Task": 1})
+        self.assertEqual(archive.get(Task, self.done.pk).title, "قديمة")
+
+    def test_reopened_task_is_not_deleted(self):
+        real_write = archive._write_rows
+
+        def reopen_after_write(*args):
+            records = real_write(*args)
+            Task.objects.filter(pk=self.done.pk).update(status=Task.Status.TODO)
+            return records
+
+        with mock.patch.object(archive, "_write_rows", side_effect=reopen_after_write):
+            archive.run(["APP3.Task"], max_batches=1)
+        self.assertTrue(Task.objects.filter(pk=self.done.pk).exists())
+        self.assertTrue(Comment.objects.filter(pk=self.comment.pk).exists())
+        self.assertFalse(ArchivedRecord.objects.exists())
+
+
+    def test_comment_added_during_batch_is_not_lost(self):
+        real_write = archive._write_rows
+        late = []
+
+        def comment_after_write(root, model, rows, ref):
+            records = real_write(root, model, rows, ref)
+            if model is Comment and not late:
+                late.append(Comment.objects.create(task=self.done, body="تعليق متأخر"))
+            return records
+
+        with mock.patch.object(archive, "_write_rows", side_effect=comment_after_write):
+            archive.run(["APP3.Task"], max_batches=1)
+        # التعليق المتأخر لم يُكتب في الملف: المهمة وتعليقاتها تبقى حية للدفعة التالية
+        self.assertTrue(Task.objects.filter(pk=self.done.pk).exists())
+        self.assertTrue(Comment.objects.filter(pk=late[0].pk).exists())
+
+        self.assertEqual(archive.run(["APP3.Task"]), {"APP3.Task": 1})
+        self.assertEqual(archive.get(Comment, late[0].pk).body, "تعليق متأخر")
+        self.assertEqual(archive.get(Comment, self.comment.pk).body, "تعليق قديم")
+
+
+class ActiveRowsTests(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(name="نشط")
+        self.task = Task.objects.create(project=self.project, title="حية")
+        self.deleted = Task.objects.create(project=self.project, title="محذوفة", is_active=False)
+
+    def test_active_manager_keeps_queryset_methods(self):
+        self.assertEqual(list(Task.active.all()), [self.task])
+        self.assertEqual(Task.objects.count(), 2)
+        self.assertEqual(Task.active.all().update_with_stats(progress=50), 1)
+        self.assertEqual(ProjectStats.objects.get(project=self.project).progress_sum, 50)
+
+    def test_hot_paths_use_partial_indexes(self):
+        self.assertIn("app3_task_active ", query_plan(Task.active.order_by("-created_at")) + " ")
+        self.assertIn(
+            "app3_task_active_status",
+            query_plan(Task.active.filter(project=self.project, status=Task.Status.TODO)),
+        )
+        self.assertIn("app3_comment_active_task", query_plan(Comment.active.filter(task=self.task).order_by("-created_at")))
+        # بلا شرط is_active لا ينطبق الفهرس الجزئي
+        self.assertNotIn("app3_task_active", query_plan(Task.objects.order_by("-created_at")))
+
+    def test_admin_changelist_defaults_to_active_rows(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pass")
+        self.client.force_login(user)
+        url = reverse("admin:APP3_task_changelist")
+        self.assertEqual(list(self.client.get(url).context["cl"].result_list), [self.task])
+        self.assertEqual(list(self.client.get(url, {"active": "0"}).context["cl"].result_list), [self.deleted])
+        self.assertEqual(self.client.get(url, {"active": "all"}).context["cl"].result_count, 2)
+
+
+class IndexAdvisorTests(TransactionTestCase):
+    def setUp(self):
+        # التجارب تعمل على لقطة مؤقتة تُسجَّل باسم index_advisor أثناء advise() فقط
+        patcher = mock.patch.object(type(self), "databases", {"default", "index_advisor"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.project = Project.objects.create(name="فهارس")
+        self.task = Task.objects.create(project=self.project, title="مهمة")
+        Comment.objects.bulk_create([Comment(task=self.task, body=str(i)) for i in range(5)])
+
+    def test_proposes_index_for_inherited_ordering(self):
+        with indexadvisor.capture() as log:
+            list(self.task.comments.all())
+        [proposal] = indexadvisor.advise(log)
+        self.assertEqual((proposal.model, proposal.fields, proposal.partial), (Comment, ("task", "created_at"), False))
+        self.assertTrue(proposal.removes_sort and proposal.meta_ordering)
+        self.assertIn("USE TEMP B-TREE", proposal.before)
+        self.assertIn(proposal.index.name, proposal.after)
+        # الفهرس التجريبي أُلغي مع المعاملة
+        indexes = connection.introspection.get_constraints(connection.cursor(), Comment._meta.db_table)
+        self.assertNotIn(proposal.index.name, indexes)
+
+    def test_trials_run_on_a_snapshot_unless_live(self):
+        with indexadvisor.capture() as log:
+            list(self.task.comments.all())
+        for live in (False, True):
+            with self.subTest(live=live), CaptureQueriesContext(connection) as queries:
+                [proposal] = indexadvisor.advise(log, live=live)
+                created = [q["sql"] for q in queries if q["sql"].startswith("CREATE INDEX")]
+                self.assertEqual(len(created), int(live))
+                self.assertIn(proposal.index.name, proposal.after)
+
+    def test_served_queries_and_backend_log(self):
+        with indexadvisor.capture() as log:
+            list(Task.active.filter(project=self.project, status=Task.Status.TODO).order_by())
+        self.assertEqual(indexadvisor.advise(log), [])
+
+        with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as fh:
+            fh.write(
+                "(0.003) SELECT \"APP3_task\".\"id\" FROM \"APP3_task\" WHERE (\"APP3_task\".\"is_active\" "
+                "AND \"APP3_task\".\"due_date\" = '2025-01-01'); args=('2025-01-01',); alias=default\n"
+            )
+        self.addCleanup(os.unlink, fh.name)
+        [proposal] = indexadvisor.advise(indexadvisor.load_log(fh.name))
+        self.assertEqual((proposal.model, proposal.fields, proposal.partial), (Task, ("due_date",), True))
+        self.assertEqual(proposal.declaration(), f'active_index("due_date", name="{proposal.index.name}")')
@@ -0,0 +1,63 @@
+# config/active.py
+"""
+الحذف الناعم عبر TimeStampedModel.is_active: مدير للصفوف النشطة وفهارس جزئية لها.
+
+كل استعلام تقريبًا "الصفوف النشطة، الأحدث أولًا" أو "الصفوف النشطة لهذا المفتاح الأجنبي"،
+وفهرس is_active المنفرد لا يخدم أيًا منهما (قيمتان فقط). بدلًا منه فهارس جزئية بشرط is_active:
+
+    class Meta(TimeStampedModel.Meta):
+        indexes = [*TimeStampedModel.Meta.indexes, active_index("project", "status", name="app3_task_active_status")]
+
+SQLite يستخدم الفهرس الجزئي فقط إن تضمن الاستعلام الشرط نفسه، أي filter(is_active=True) أو
+Model.active، ولا يستخدمه لـ objects.all().
+
+في لوحة الإدارة يحل config.facets.ActiveListFilter محل فلتر is_active.
+
+في الترحيلات تُستخدم AlterFieldIndex لإزالة db_index: AlterField في SQLite يعيد بناء الجدول كاملًا.
+"""
+from django.db import migrations, models
+from django.db.models import Q
+
+ACTIVE = Q(is_active=True)
+
+
+def active_index(*fields, name):
+    return models.Index(fields=list(fields), condition=ACTIVE, name=name)
+
+
+class ActiveManager(models.Manager):
+    """Model.active: الصفوف النشطة بنوع QuerySet المدير الافتراضي (Task.active.all().update_with_stats())."""
+
+    def get_queryset(self):
+        queryset_class = self.model._default_manager._queryset_class
+        return queryset_class(self.model, using=self._db, hints=self._hints).filter(ACTIVE)
+
+
+class AlterFieldIndex(migrations.AlterField):
+    """AlterField لتغيير db_index وحده: إنشاء الفهرس أو حذفه في SQLite دون إعادة بناء الجدول."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        to_model = to_state.apps.get_model(app_label, self.model_name)
+        from_model = from_state.apps.get_model(app_label, self.model_name)
+        old_field = from_model._meta.get_field(self.name)
+        new_field = to_model._meta.get_field(self.name)
+        connection = schema_editor.connection
+        if (
+            connection.vendor != "sqlite"
+            or not self.allow_migrate_model(connection.alias, to_model)
+            or old_field.deconstruct()[1:] != _without_db_index(new_field, old_field.db_index)
+        ):
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        if new_field.db_index and not old_field.db_index:
+            schema_editor.execute(schema_editor._create_index_sql(to_model, fields=[new_field]))
+        elif old_field.db_index and not new_field.db_index:
+            for name in schema_editor._constraint_names(from_model, [old_field.column], index=True, unique=False):
+                schema_editor.execute(schema_editor._delete_index_sql(from_model, name))
+
+
+def _without_db_index(field, db_index):
+    name, path, args, kwargs = field.deconstruct()
+    kwargs = {**kwargs, "db_index": db_index}
+    if not db_index:
+        kwargs.pop("db_index")
+    return path, args, kwargs
@@ -0,0 +1,14 @@
+from django.contrib.admin.apps import AdminConfig as BaseAdminConfig
+
+
+class AdminConfig(BaseAdminConfig):
+    """django.contrib.admin بموقع إدارة يخزن نتائج autocomplete مؤقتًا (config.autocomplete) وأعداد الفلاتر (config.facets)."""
+
+    default_site = "config.autocomplete.AutocompleteAdminSite"
+
+    def ready(self):
+        super().ready()
+        from config import autocomplete, facets
+
+        autocomplete.connect_invalidation()
+        facets.connect_invalidation()
@@ -0,0 +1,127 @@
+# config/autocomplete.py
+"""
+حقول autocomplete في لوحة الإدارة: نموذج التعديل يعرض الخيار المختار فقط، والبقية تُجلب
+عند الكتابة من admin:autocomplete، فزمن عرض النموذج لا يتبع عدد المستخدمين أو الأصول.
+
+- AutocompleteAdminSite يستبدل عرض autocomplete بـ CachedAutocompleteJsonView:
+  - صفحات بلا COUNT: يُجلب per_page + 1 صفًا لمعرفة وجود صفحة تالية.
+  - النتائج تُخزن مؤقتًا (AUTOCOMPLETE["TIMEOUT"]) بمفتاح فيه إصدار للنموذج يتغير مع كل حفظ أو حذف
+    لنماذج AUTOCOMPLETE["MODELS"]. النتائج واحدة لكل من يملك صلاحية العرض: get_queryset في
+    هذه اللوحات لا يعتمد على المستخدم.
+- PrefixSearchMixin: بحث autocomplete بالبادئة على Lower(الحقل) كنطاق (>= و<) يخدمه فهرس
+  Index(Lower("full_name")) بدل icontains الذي يمسح الجدول. النماذج ذات فهرس FTS5
+  (config.search.FullTextSearchMixin) تبحث بالبادئة في فهرسها أصلًا.
+"""
+import hashlib
+import string
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.autocomplete import AutocompleteJsonView
+from django.core.cache import caches
+from django.core.exceptions import PermissionDenied
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.http import Http404, JsonResponse
+from django.utils.http import urlencode
+
+from config.cacheversion import ModelVersions
+
+DEFAULTS = {
+    "CACHE_ALIAS": "default",
+    "TIMEOUT": 60,
+    "MODELS": [],
+}
+
+# LOWER() في SQLite يحوّل ASCII فقط؛ البادئة تُحوّل بالطريقة نفسها
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "AUTOCOMPLETE", {})}
+
+
+def _cache():
+    return caches[get_config()["CACHE_ALIAS"]]
+
+
+def is_autocomplete(request) -> bool:
+    match = getattr(request, "resolver_match", None)
+    return match is not None and match.url_name == "autocomplete"
+
+
+def prefix_range(term):
+    """(الحد الأدنى، الحد الأعلى غير المشمول) لكل نص يبدأ بـ term بعد Lower()."""
+    low = term.translate(_ASCII_LOWER)
+    return low, low[:-1] + chr(ord(low[-1]) + 1)
+
+
+class PrefixSearchMixin:
+    """Mixin لـ ModelAdmin: بحث autocomplete بالبادئة على autocomplete_prefix_fields (بفهرس Lower)."""
+
+    autocomplete_prefix_fields = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term or not self.autocomplete_prefix_fields or not is_autocomplete(request):
+            return super().get_search_results(request, queryset, search_term)
+        low, high = prefix_range(term)
+        aliases = {f"{name}_lower": Lower(name) for name in self.autocomplete_prefix_fields}
+        condition = Q()
+        for alias in aliases:
+            condition |= Q(**{f"{alias}__gte": low, f"{alias}__lt": high})
+        queryset = queryset.alias(**aliases).filter(condition)
+        if len(aliases) == 1:
+            # الترتيب بترتيب الفهرس نفسه: لا فرز للمطابقات
+            queryset = queryset.order_by(*aliases, "pk")
+        return queryset, False
+
+
+# ---------- التخزين المؤقت ----------
+
+
+versions = ModelVersions("autocomplete", get_config)
+invalidate = versions.invalidate
+connect_invalidation = versions.connect
+
+
+def cache_key(model, params) -> str:
+    version = versions.current(model)
+    digest = hashlib.md5(urlencode(sorted(params.items())).encode(), usedforsecurity=False).hexdigest()
+    return f"autocomplete:{model._meta.label_lower}:{version}:{digest}"
+
+
+class CachedAutocompleteJsonView(AutocompleteJsonView):
+    def get(self, request, *args, **kwargs):
+        self.term, self.model_admin, self.source_field, to_field_name = self.process_request(request)
+        if not self.has_perm(request):
+            raise PermissionDenied
+
+        key = cache_key(self.model_admin.model, request.GET)
+        data = _cache().get(key)
+        if data is None:
+            self.object_list = self.get_queryset()
+            rows, more = self.page_rows(request)
+            data = {
+                "results": [self.serialize_result(obj, to_field_name) for obj in rows],
+                "pagination": {"more": more},
+            }
+            _cache().set(key, data, get_config()["TIMEOUT"])
+        return JsonResponse(data)
+
+    def page_rows(self, request):
+        """صفحة بلا COUNT(*): صف زائد يكفي لمعرفة وجود صفحة تالية."""
+        try:
+            number = int(request.GET.get(self.page_kwarg, 1))
+        except ValueError:
+            raise Http404
+        if number < 1:
+            raise Http404
+        start = (number - 1) * self.paginate_by
+        rows = list(self.object_list[start : start + self.paginate_by + 1])
+        return rows[: self.paginate_by], len(rows) > self.paginate_by
+
+
+class AutocompleteAdminSite(admin.AdminSite):
+    def autocomplete_view(self, request):
+        return CachedAutocompleteJsonView.as_view(admin_site=self)(request)
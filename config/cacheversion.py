@@ -0,0 +1,45 @@
+# config/cacheversion.py
+"""
+إصدار لكل نموذج في الذاكرة المؤقتة تُبنى عليه مفاتيح النتائج المخزنة (autocomplete وأعداد الفلاتر).
+
+حفظ صف أو حذفه (post_save/post_delete) يستبدل الإصدار، فلا تطابق النتائج القديمة أي مفتاح
+دون البحث عنها وحذفها، وتنتهي بمهلتها. bulk_create وupdate لا يرسلان إشارات؛ استدعِ invalidate بعدهما.
+
+    versions = ModelVersions("facets", get_config)   # get_config()["CACHE_ALIAS"] و["MODELS"]
+    versions.current(Task)                           # في مفتاح التخزين
+"""
+import uuid
+
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+
+
+class ModelVersions:
+    def __init__(self, namespace, get_config):
+        self.namespace = namespace
+        self.get_config = get_config
+
+    def cache(self):
+        return caches[self.get_config()["CACHE_ALIAS"]]
+
+    def key(self, model) -> str:
+        return f"{self.namespace}-version:{model._meta.label_lower}"
+
+    def current(self, model) -> str:
+        return self.cache().get_or_set(self.key(model), lambda: uuid.uuid4().hex, None)
+
+    def invalidate(self, model) -> None:
+        self.cache().set(self.key(model), uuid.uuid4().hex, None)
+
+    def _on_change(self, sender, **kwargs):
+        self.invalidate(sender)
+
+    def connect(self) -> None:
+        """يربط الإشارات لنماذج get_config()["MODELS"]؛ يُستدعى من AppConfig.ready()."""
+        from django.apps import apps
+
+        for label in self.get_config()["MODELS"]:
+            model = apps.get_model(label)
+            uid = f"{self.namespace}:{model._meta.label_lower}"
+            post_save.connect(self._on_change, sender=model, dispatch_uid=uid)
+            post_delete.connect(self._on_change, sender=model, dispatch_uid=uid)
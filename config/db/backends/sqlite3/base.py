@@ -0,0 +1,51 @@
+# config/db/backends/sqlite3/base.py
+"""
+محرك SQLite للمشروع مبني على محرك Django مع إعدادات مناسبة لعدة عمال WSGI:
+
+- WAL: القرّاء لا يحجبون الكاتب ولا العكس، وsynchronous=NORMAL يكفي معه دون فقدان سلامة القاعدة.
+- busy_timeout: انتظار القفل بدل "database is locked" الفوري.
+- المعاملات تبقى مؤجلة (DEFERRED)؛ مسارات الكتابة تستخدم config.db.transactions.atomic_immediate
+  لتأخذ قفل الكتابة من بدايتها، فلا تفشل عند ترقية قفل القراءة إلى كتابة في منتصفها. جعل IMMEDIATE
+  افتراضيًا كان سيحجب الكتّاب أثناء كل atomic للقراءة فقط (صفحات الإدارة مثلًا).
+- يعمل مع CONN_MAX_AGE: الإعدادات تُطبق مرة عند فتح الاتصال فقط.
+
+    DATABASES = {"default": {"ENGINE": "config.db.backends.sqlite3", "OPTIONS": {"pragmas": {...}}}}
+"""
+from django.db.backends.sqlite3 import base
+
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -64000,  # بالكيلوبايت عند السالب (64 ميجابايت)
+    "mmap_size": 268435456,  # 256 ميجابايت
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    @property
+    def pragmas(self) -> dict:
+        options = self.settings_dict["OPTIONS"]
+        pragmas = dict(DEFAULT_PRAGMAS)
+        if "timeout" in options:
+            # OPTIONS["timeout"] (بالثواني) هو المهلة نفسها؛ لا نتجاوزه بالقيمة الافتراضية
+            pragmas["busy_timeout"] = int(options["timeout"] * 1000)
+        return {**pragmas, **options.get("pragmas", {})}
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pragmas", None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            if value is None:
+                continue
+            if name == "journal_mode" and self.is_in_memory_db():
+                # القواعد في الذاكرة (الاختبارات) لا تدعم WAL
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
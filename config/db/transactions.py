@@ -0,0 +1,33 @@
+# config/db/transactions.py
+"""
+معاملات الكتابة على SQLite.
+
+المعاملة المؤجلة (الافتراضية) تبدأ بقفل قراءة وتُرقّيه عند أول كتابة؛ إن سبقها كاتب آخر فشلت
+الترقية فورًا بـ "database is locked" دون انتظار busy_timeout. atomic_immediate يبدأ المعاملة
+الخارجية بـ BEGIN IMMEDIATE فتنتظر قفل الكتابة من بدايتها، ويُستخدم لمسارات الكتابة الفعلية فقط
+(قراءة ثم كتابة): القراءات، ومنها صفحات الإدارة التي يلفها Django في atomic، تبقى مؤجلة ولا تحجب الكتّاب.
+
+على بقية القواعد، أو داخل معاملة قائمة، هو transaction.atomic نفسه.
+"""
+import contextlib
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+@contextlib.contextmanager
+def atomic_immediate(using=None, savepoint=True):
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    if connection.vendor != "sqlite" or connection.in_atomic_block:
+        with transaction.atomic(using=using, savepoint=savepoint):
+            yield
+        return
+    # الاتصال يُفتح أولًا: فتحه يعيد transaction_mode إلى قيمة OPTIONS
+    connection.ensure_connection()
+    previous = connection.transaction_mode
+    connection.transaction_mode = "IMMEDIATE"
+    try:
+        with transaction.atomic(using=using, savepoint=savepoint):
+            connection.transaction_mode = previous
+            yield
+    finally:
+        connection.transaction_mode = previous
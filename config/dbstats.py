@@ -0,0 +1,84 @@
+# config/dbstats.py
+"""
+أدوات قياس قاعدة البيانات المشتركة بين أوامر القياس (benchmarks) والتقارير.
+"""
+import contextlib
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.db import connections
+
+from config.replica import snapshot
+
+
+def btree_stats(using="default", names=None) -> dict:
+    """
+    إحصاءات صفحات كل جدول/فهرس في SQLite من الجدول الافتراضي dbstat:
+    عدد الصفحات، نسبة امتلاء الأوراق، ونسبة الأوراق المخزنة قبل سابقتها على القرص (التجزؤ).
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        raise NotImplementedError("btree_stats requires SQLite (dbstat).")
+
+    stats = {}
+    previous = {}
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name, pageno, pagetype, payload, unused, pgsize FROM dbstat")
+        for name, pageno, pagetype, payload, unused, pgsize in cursor.fetchall():
+            if names and name not in names:
+                continue
+            entry = stats.setdefault(name, {"pages": 0, "leaf_pages": 0, "used": 0, "size": 0, "out_of_order": 0})
+            entry["pages"] += 1
+            if pagetype != "leaf":
+                continue
+            entry["leaf_pages"] += 1
+            entry["used"] += pgsize - unused
+            entry["size"] += pgsize
+            # dbstat يمر على الصفحات بترتيب الشجرة؛ الرجوع إلى صفحة أقدم على القرص يعني انقسامًا في منتصف الفهرس
+            if name in previous and pageno < previous[name]:
+                entry["out_of_order"] += 1
+            previous[name] = pageno
+
+    for entry in stats.values():
+        leaves = entry["leaf_pages"]
+        entry["fill"] = entry["used"] / entry["size"] if entry["size"] else 0.0
+        entry["fragmentation"] = entry["out_of_order"] / (leaves - 1) if leaves > 1 else 0.0
+        del entry["used"], entry["size"]
+    return stats
+
+
+def table_index_names(model, using="default") -> list:
+    """اسم الجدول وكل فهارسه (بما فيها فهرس المفتاح الأساسي التلقائي)."""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s", [table])
+        return [table] + sorted(row[0] for row in cursor.fetchall())
+
+
+@contextlib.contextmanager
+def temporary_sqlite_database(alias="benchmark", copy_from=None, **options):
+    """
+    قاعدة SQLite مؤقتة مُرحّلة بالكامل ومسجّلة باسم alias، تُحذف عند الخروج.
+    تُستخدم في أوامر القياس حتى لا تتأثر قاعدة البيانات الفعلية.
+    copy_from: بدل الترحيل تُنسخ قاعدة قائمة (مخططها وبياناتها) عبر Backup API.
+    """
+    directory = tempfile.mkdtemp(prefix="bench-")
+    path = os.path.join(directory, "db.sqlite3")
+    settings_dict = {**connections.settings["default"], **options, "NAME": path}
+    settings_dict["ENGINE"] = options.get("ENGINE", connections.settings["default"]["ENGINE"])
+    connections.settings[alias] = settings_dict
+    try:
+        if copy_from is None:
+            call_command("migrate", database=alias, verbosity=0)
+        else:
+            snapshot(copy_from, alias)
+        yield alias
+    finally:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
@@ -0,0 +1,216 @@
+# config/facets.py
+"""
+أعداد الفلاتر (facets) في الشريط الجانبي للوحة الإدارة من ذاكرة مؤقتة بدل حسابها مع كل عرض.
+
+Django يحسب لكل فلتر استعلام aggregate على الجدول كله فيه Count(FILTER ...) لكل خيار، ويحمّل
+RelatedFieldListFilter كل صفوف الجدول المرتبط (كل الأقسام أو المشاريع) في كل صفحة.
+
+- CachedFacetsMixin: نتيجة get_facet_queryset تُخزن بمفتاح من SQL الاستعلام المفلتر (أي الفلاتر
+  الأخرى والبحث) لنماذج FACETS["MODELS"] فقط. حفظ أو حذف صف يغير إصدار النموذج، لكن النتيجة
+  القديمة تبقى مقبولة REFRESH ثانية من حسابها، فالجدول الكبير لا يُعدّ أكثر من مرة كل REFRESH
+  ثانية مهما كثر الحفظ. bulk_create وupdate لا يرسلان إشارات، وTIMEOUT يحد عمر النتيجة حينها.
+  ActiveListFilter وChoicesFacetListFilter (حقول choices) يستخدمانه.
+- RelatedFacetListFilter: بديل فلتر المفتاح الأجنبي. الأعداد من GROUP BY واحد (فهرس جزئي على
+  العمود) بدل عمود Count لكل خيار. إن زاد الجدول المرتبط على TOP صفًا تُعرض أكثر TOP قيمة تكرارًا
+  مع المختار، ومربع بحث يطابق search_fields في لوحة النموذج المرتبط:
+
+    list_filter = (("status", ChoicesFacetListFilter), ("department", RelatedFacetListFilter), ActiveListFilter)
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.exceptions import NotRegistered
+from django.contrib.admin.utils import get_last_value_from_parameters
+from django.contrib.admin.views.main import PAGE_VAR
+from django.db.models import Count
+from django.utils.translation import gettext_lazy as _
+
+from config.cacheversion import ModelVersions
+from config.pagination import CURSOR_VAR
+
+DEFAULTS = {
+    "CACHE_ALIAS": "default",
+    "TIMEOUT": 600,
+    "REFRESH": 30,
+    "TOP": 30,
+    "MODELS": [],
+}
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "FACETS", {})}
+
+
+versions = ModelVersions("facets", get_config)
+invalidate = versions.invalidate
+connect_invalidation = versions.connect
+
+
+def is_cached(model) -> bool:
+    return model._meta.label in get_config()["MODELS"]
+
+
+def cached_counts(queryset, name, compute):
+    """compute() لـ queryset من الذاكرة المؤقتة ما دام الإصدار نفسه أو لم تمض REFRESH ثانية."""
+    if not is_cached(queryset.model):
+        return compute()
+    config = get_config()
+    cache = versions.cache()
+    version = versions.current(queryset.model)
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(f"{name}\n{sql}\n{params!r}".encode(), usedforsecurity=False).hexdigest()
+    key = f"facets:{queryset.model._meta.label_lower}:{digest}"
+    entry = cache.get(key)
+    now = time.time()
+    if entry is not None and (entry["version"] == version or now - entry["at"] < config["REFRESH"]):
+        return entry["counts"]
+    counts = compute()
+    cache.set(key, {"version": version, "at": now, "counts": counts}, config["TIMEOUT"])
+    return counts
+
+
+def _filtered_queryset(spec, changelist):
+    return changelist.get_queryset(spec.request, exclude_parameters=spec.expected_parameters())
+
+
+class CachedFacetsMixin:
+    """Mixin لأي فلتر يدعم facets في Django (SimpleListFilter وFieldListFilter)."""
+
+    def get_facet_queryset(self, changelist):
+        filtered_qs = _filtered_queryset(self, changelist)
+        name = f"{type(self).__qualname__}:{'&'.join(self.expected_parameters())}"
+        return cached_counts(
+            filtered_qs,
+            name,
+            lambda: filtered_qs.aggregate(**self.get_facet_counts(changelist.pk_attname, filtered_qs)),
+        )
+
+
+class ChoicesFacetListFilter(CachedFacetsMixin, admin.ChoicesFieldListFilter):
+    pass
+
+
+class ActiveListFilter(CachedFacetsMixin, admin.SimpleListFilter):
+    """بديل "is_active" في list_filter (config.active): القائمة تعرض النشط افتراضيًا، و"الكل" يعرض المحذوف أيضًا."""
+
+    title = _("الحالة")
+    parameter_name = "active"
+
+    def lookups(self, request, model_admin):
+        return (("1", _("نشط")), ("0", _("غير نشط")), ("all", _("الكل")))
+
+    def value(self):
+        return super().value() or "1"
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value == "all":
+            return queryset
+        return queryset.filter(is_active=value == "1")
+
+    def choices(self, changelist):
+        value = self.value()
+        for lookup, title in self.lookup_choices:
+            yield {
+                "selected": value == lookup,
+                "query_string": changelist.get_query_string({self.parameter_name: lookup}),
+                "display": title,
+            }
+
+
+class RelatedFacetListFilter(admin.RelatedFieldListFilter):
+    template = "admin/facet_filter.html"
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.search_kwarg = f"{field_path}__facet_q"
+        self.search_term = (get_last_value_from_parameters(params, self.search_kwarg) or "").strip()
+        self.truncated = False
+        self._counts = None
+        super().__init__(field, request, params, model, model_admin, field_path)
+
+    def expected_parameters(self):
+        return [*super().expected_parameters(), self.search_kwarg]
+
+    def queryset(self, request, queryset):
+        # نص البحث يخص خيارات الفلتر لا صفوف القائمة
+        self.used_parameters.pop(self.search_kwarg, None)
+        return super().queryset(request, queryset)
+
+    def related_queryset(self, field, request, model_admin):
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        queryset = field.remote_field.model._default_manager.complex_filter(field.get_limit_choices_to())
+        return queryset.order_by(*ordering) if ordering else queryset
+
+    def field_choices(self, field, request, model_admin):
+        self.related_qs = self.related_queryset(field, request, model_admin)
+        top = get_config()["TOP"]
+        rows = list(self.related_qs[: top + 1])
+        if len(rows) <= top and not self.search_term:
+            return [(getattr(obj, field.target_field.attname), str(obj)) for obj in rows]
+        # الخيارات تُختار في choices() بعد معرفة الأعداد
+        self.truncated = True
+        return []
+
+    def has_output(self):
+        return self.truncated or super().has_output()
+
+    def value_counts(self, changelist):
+        """{قيمة المفتاح الأجنبي: عدد الصفوف} للقائمة المفلترة دون هذا الفلتر، وNone للفارغ."""
+        if self._counts is None:
+            filtered_qs = _filtered_queryset(self, changelist)
+            distinct = filtered_qs.query.distinct
+
+            def compute():
+                rows = filtered_qs.order_by().values_list(self.field_path).annotate(n=Count("pk", distinct=distinct))
+                return dict(rows)
+
+            self._counts = cached_counts(filtered_qs, f"{type(self).__qualname__}:{self.field_path}", compute)
+        return self._counts
+
+    def get_facet_queryset(self, changelist):
+        counts = self.value_counts(changelist)
+        facets = {f"{pk_val}__c": counts.get(pk_val, 0) for pk_val, _ in self.lookup_choices}
+        facets["__c"] = counts.get(None, 0)
+        return facets
+
+    def top_choices(self, changelist):
+        counts = self.value_counts(changelist)
+        top = get_config()["TOP"]
+        target = self.field.target_field
+        if self.search_term:
+            related_qs = self.related_qs
+            try:
+                related_admin = changelist.model_admin.admin_site.get_model_admin(related_qs.model)
+            except NotRegistered:
+                related_qs = related_qs.filter(pk=None)
+            else:
+                related_qs, _ = related_admin.get_search_results(self.request, related_qs, self.search_term)
+            objects = {getattr(obj, target.attname): obj for obj in related_qs[:top]}
+        else:
+            values = sorted((v for v in counts if v is not None), key=lambda v: -counts[v])[:top]
+            objects = self.related_qs.order_by().in_bulk(values, field_name=target.name)
+        selected = [target.to_python(v) for v in self.lookup_val or ()]
+        missing = [v for v in selected if v not in objects]
+        if missing:
+            objects.update(self.related_qs.order_by().in_bulk(missing, field_name=target.name))
+        ordered = sorted(objects.items(), key=lambda item: (-counts.get(item[0], 0), str(item[1])))
+        return [(value, str(obj)) for value, obj in ordered]
+
+    def choices(self, changelist):
+        if self.truncated:
+            self.lookup_choices = self.top_choices(changelist)
+            self.search_hidden = [
+                (name, value)
+                for name, values in self.request.GET.lists()
+                if name not in (self.search_kwarg, self.lookup_kwarg, self.lookup_kwarg_isnull, PAGE_VAR, CURSOR_VAR)
+                for value in values
+            ]
+        for choice in super().choices(changelist):
+            choice["query_string"] = self.without_search(choice["query_string"])
+            yield choice
+
+    def without_search(self, query_string):
+        parts = query_string.lstrip("?").split("&")
+        return "?" + "&".join(p for p in parts if p and not p.startswith(f"{self.search_kwarg}="))
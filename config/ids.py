@@ -0,0 +1,41 @@
+# config/ids.py
+"""
+مولّد المعرفات الأساسية لـ TimeStampedModel.
+
+uuid4 عشوائي تمامًا فيقع كل إدراج في موضع عشوائي من شجرة B للمفتاح الأساسي
+وفهارس المفاتيح الأجنبية. uuid7 يبدأ بطابع زمني بالمللي ثانية فتُلحق الإدراجات
+الجديدة بنهاية الفهرس. التفعيل اختياري عبر TIME_ORDERED_PRIMARY_KEYS.
+"""
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+_lock = threading.Lock()
+_last_ms = 0
+_last_seq = 0
+
+
+def uuid7() -> uuid.UUID:
+    """UUID إصدار 7 (RFC 9562) مرتب زمنيًا ومتزايد داخل العملية نفسها."""
+    global _last_ms, _last_seq
+    ms = time.time_ns() // 1_000_000
+    with _lock:
+        if ms > _last_ms:
+            # نترك بتًا علويًا فارغًا في العدّاد ليتسع لإدراجات نفس المللي ثانية
+            seq = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            ms, seq = _last_ms, _last_seq + 1
+            if seq > 0xFFF:
+                ms, seq = ms + 1, 0
+        _last_ms, _last_seq = ms, seq
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    return uuid.UUID(int=(ms << 80) | (0x7 << 76) | (seq << 64) | (0b10 << 62) | rand_b)
+
+
+def default_pk() -> uuid.UUID:
+    if getattr(settings, "TIME_ORDERED_PRIMARY_KEYS", False):
+        return uuid7()
+    return uuid.uuid4()
@@ -0,0 +1,343 @@
+# config/indexadvisor.py
+"""
+مستشار الفهارس: يعيد تشغيل بصمات الاستعلامات الملتقطة (config.sqlstats.fingerprint) بـ
+EXPLAIN QUERY PLAN على قاعدة البيانات، ويقترح Meta.indexes للاستعلامات التي تمسح الجدول كاملًا
+(SCAN) أو ترتب في شجرة مؤقتة (USE TEMP B-TREE FOR ORDER BY).
+
+مصادر البصمات:
+- capture(): execute_wrapper يعدّ البصمات وزمنها (تشغيل اختبارات أو أي كود)، وsave_log/load_log لحفظها JSON.
+- سجل django.db.backends بمستوى DEBUG: "(0.002) SELECT ...; args=(...); alias=default".
+
+الاقتراح لكل جدول في الاستعلام: أعمدة المساواة (= وIN وIS NULL وشروط الربط) أولًا، ثم أعمدة
+ORDER BY إن كانت كلها من الجدول نفسه، وإلا أول عمود مدى (< >). الترتيب الافتراضي من
+Meta.ordering (-created_at الموروث من TimeStampedModel) يُعامل كأي ORDER BY ويُذكر في التقرير:
+"مهام المشروع الأحدث أولًا" تحتاج (project, created_at) لا (project) وحده.
+شرط is_active في الاستعلام يجعل الاقتراح فهرسًا جزئيًا (config.active.active_index).
+
+كل اقتراح يُجرَّب قبل عرضه: يُنشأ الفهرس داخل معاملة ويُحلَّل (ANALYZE) ثم تُقارن الخطة وتقدير
+الصفوف لكل استدعاء، وتُلغى المعاملة. اقتراح لا يغيّر الخطة لا يُعرض. التجارب تعمل افتراضيًا على
+لقطة مؤقتة من القاعدة (config.dbstats.temporary_sqlite_database): CREATE INDEX وANALYZE يأخذان قفل
+الكتابة طوال البناء، ولا تُمسّ القاعدة الحية إلا بـ live=True.
+"""
+import contextlib
+import json
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.apps import apps
+from django.db import DatabaseError, connections, models, transaction
+
+from config.active import ACTIVE
+from config.dbstats import temporary_sqlite_database
+from config.sqlstats import fingerprint
+
+_STATEMENTS = ("SELECT", "UPDATE", "DELETE")
+_LOG_LINE = re.compile(r"^\((?P<seconds>\d+(?:\.\d+)?)\) (?P<sql>.*?); args=.*?(?:; alias=\w+)?$")
+_PLAN_TABLE = re.compile(r"^(?P<op>SCAN|SEARCH) (?P<table>\S+)(?: AS (?P<alias>\S+))?(?P<rest>.*)$")
+_ALIAS = re.compile(r'"(?P<table>\w+)" (?:AS )?(?P<alias>T\d+)\b')
+_ORDER_TERM = re.compile(r'^"?(?P<table>\w+)"?\."(?P<column>\w+)"(?:\s+(?:ASC|DESC))?(?:\s+NULLS\s+(?:FIRST|LAST))?$')
+_OPERATOR = r"\s*(?:=|<>|!=|<=|>=|<|>|IN\b|IS\b|LIKE\b|GLOB\b|BETWEEN\b|NOT\b)"
+
+
+# ---------- الالتقاط ----------
+
+
+class QueryLog:
+    """بصمة → (عدد مرات التنفيذ، الزمن الكلي بالثواني)."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.seconds = Counter()
+
+    def add(self, sql, seconds, count=1):
+        if not sql.lstrip().upper().startswith(_STATEMENTS):
+            return
+        key = fingerprint(sql)
+        self.counts[key] += count
+        self.seconds[key] += seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.add(sql, time.perf_counter() - started)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def items(self):
+        return ((key, self.counts[key], self.seconds[key]) for key, _ in self.counts.most_common())
+
+    def save(self, path):
+        data = {key: {"count": count, "seconds": seconds} for key, count, seconds in self.items()}
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, ensure_ascii=False, indent=1)
+
+
+def load_log(path, log=None) -> QueryLog:
+    """ملف JSON من QueryLog.save، أو سجل django.db.backends النصي."""
+    log = QueryLog() if log is None else log
+    with open(path, encoding="utf-8") as fh:
+        text = fh.read()
+    if text.lstrip().startswith("{"):
+        for key, entry in json.loads(text).items():
+            log.add(key, entry["seconds"], entry["count"])
+        return log
+    for line in text.splitlines():
+        match = _LOG_LINE.match(line.strip())
+        if match:
+            log.add(match["sql"], float(match["seconds"]))
+    return log
+
+
+@contextlib.contextmanager
+def capture(log=None):
+    log = QueryLog() if log is None else log
+    with contextlib.ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(log))
+        yield log
+
+
+# ---------- التحليل ----------
+
+
+@dataclass
+class Proposal:
+    model: type
+    fields: tuple
+    partial: bool
+    equality: int
+    before: str
+    after: str = ""
+    rows_before: int = 0
+    rows_after: int = None  # None: بلا أعمدة مساواة، التقدير غير متاح
+    removes_sort: bool = False
+    meta_ordering: bool = False
+    calls: int = 0
+    seconds: float = 0.0
+    examples: list = field(default_factory=list)
+
+    @property
+    def key(self):
+        return (self.model, self.fields, self.partial)
+
+    @property
+    def index(self) -> models.Index:
+        index = models.Index(fields=list(self.fields), name="")
+        index.set_name_with_model(self.model)
+        name = index.name.lower()
+        if self.partial:
+            return models.Index(fields=list(self.fields), condition=ACTIVE, name=f"{name[:-4]}_act")
+        return models.Index(fields=list(self.fields), name=name)
+
+    def declaration(self) -> str:
+        fields = ", ".join(f'"{name}"' for name in self.fields)
+        if self.partial:
+            return f'active_index({fields}, name="{self.index.name}")'
+        return f'models.Index(fields=[{fields}], name="{self.index.name}")'
+
+
+def _executable(key):
+    """البصمة كجملة قابلة لـ EXPLAIN: كل ثابت معامل يُربط بـ NULL (الخطة لا تعتمد على القيمة)."""
+    sql = key.replace("IN (...)", "IN (?)").replace("%s", "?")
+    return sql, [None] * sql.count("?")
+
+
+def explain(sql, params, using) -> list:
+    connection = connections[using]
+    with connection.cursor() as cursor, connection.wrap_database_errors:
+        # مؤشر SQLite مباشرة: الجملة فيها ? لا %s، ولا تُحسب ضمن الاستعلامات الملتقطة
+        cursor.cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def _split(sql):
+    """(FROM حتى ORDER BY، ما بعد WHERE، أعمدة ORDER BY): أعمدة SELECT لا تُعد شروطًا."""
+    upper = sql.upper()
+    position = upper.rfind(" ORDER BY ")
+    body, order_by = (sql, "") if position == -1 else (sql[:position], sql[position + len(" ORDER BY "):])
+    order_by = re.split(r"\s+(?:LIMIT|OFFSET)\b", order_by, flags=re.IGNORECASE)[0]
+    start = body.upper().find(" FROM ")
+    body = body[start:] if start != -1 else body
+    where = body.upper().find(" WHERE ")
+    return body, body[where:] if where != -1 else "", order_by
+
+
+def _predicates(body, where, name):
+    """(أعمدة المساواة، أعمدة المدى، هل الشرط is_active في WHERE) للجدول أو اسمه المستعار name."""
+    qualified = rf'"?{re.escape(name)}"?\."(\w+)"'
+    equality, ranges = [], []
+    for match in re.finditer(qualified + r"\s*(=|IN\b|IS NULL\b|<=|>=|<|>|BETWEEN\b)", body, re.IGNORECASE):
+        column, operator = match.group(1), match.group(2).upper()
+        target = ranges if operator in ("<", ">", "<=", ">=", "BETWEEN") else equality
+        if column not in equality and column not in ranges:
+            target.append(column)
+    # شروط الربط: "other"."id" = "name"."fk_id"
+    for match in re.finditer(r'=\s*' + qualified, body):
+        if match.group(1) not in equality:
+            equality.append(match.group(1))
+    active = re.search(r"(?<!NOT )" + qualified.replace(r"(\w+)", "(is_active)") + rf"(?!{_OPERATOR})", where) is not None
+    return equality, ranges, active
+
+
+def _order_columns(order_by, names):
+    columns = []
+    for term in (part.strip() for part in order_by.split(",") if part.strip()):
+        match = _ORDER_TERM.match(term)
+        if not match or match["table"] not in names:
+            return []
+        columns.append(match["column"])
+    return columns
+
+
+def _field_names(model, columns):
+    by_column = {f.column: f.name for f in model._meta.concrete_fields}
+    names = []
+    for column in columns:
+        if column not in by_column:
+            return None
+        if by_column[column] not in names:
+            names.append(by_column[column])
+    return tuple(names)
+
+
+def _row_count(table, using):
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM %s" % connections[using].ops.quote_name(table))
+        return cursor.fetchone()[0]
+
+
+def _is_meta_ordering(model, columns):
+    ordering = [name.lstrip("-") for name in model._meta.ordering if isinstance(name, str)]
+    return bool(columns) and _field_names(model, columns) == tuple(ordering)
+
+
+def analyze(key, using="default") -> list:
+    """الاقتراحات (غير المجربة بعد) لبصمة واحدة."""
+    sql, params = _executable(key)
+    try:
+        plan = explain(sql, params, using)
+    except DatabaseError:
+        # بصمة من قاعدة أخرى أو مخطط أقدم: لا يمكن شرحها هنا
+        return []
+    tables = {model._meta.db_table: model for model in apps.get_models()}
+    aliases = {match["alias"]: match["table"] for match in _ALIAS.finditer(sql)}
+    body, where, order_by = _split(sql)
+    sorts = any("USE TEMP B-TREE FOR ORDER BY" in line for line in plan)
+    proposals = []
+    for line in plan:
+        match = _PLAN_TABLE.match(line)
+        if not match:
+            continue
+        name = match["alias"] or match["table"]
+        table = aliases.get(name, match["table"])
+        model = tables.get(table)
+        if model is None:
+            continue
+        names = {name, table}
+        equality, ranges, active = _predicates(body, where, name)
+        order = _order_columns(order_by, names)
+        full_scan = match["op"] == "SCAN" and (equality or ranges)
+        if not full_scan and not (sorts and order):
+            continue
+        partial = active and any(f.name == "is_active" for f in model._meta.concrete_fields)
+        equality = [column for column in equality if not (partial and column == "is_active")]
+        columns = equality + (order or ranges[:1])
+        fields = _field_names(model, columns)
+        if not fields:
+            continue
+        proposals.append(Proposal(
+            model=model,
+            fields=fields,
+            partial=partial,
+            equality=len(_field_names(model, equality) or ()),
+            before="; ".join(plan),
+            removes_sort=sorts and bool(order),
+            meta_ordering=_is_meta_ordering(model, order),
+        ))
+    return proposals
+
+
+def _stat(index_name, using):
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT stat FROM sqlite_stat1 WHERE idx = %s", [index_name])
+        row = cursor.fetchone()
+    return [int(value) for value in row[0].split() if value.isdigit()] if row else []
+
+
+def _covered(proposal, using):
+    """فهرس قائم يبدأ بأعمدة الاقتراح نفسها: الخطة الجديدة لن تكون أفضل منه.
+    الفهرس الجزئي (شرطه من Meta.indexes) يغطي الاقتراح الجزئي فقط."""
+    meta = proposal.model._meta
+    columns = [meta.get_field(name).column for name in proposal.fields]
+    partial_names = {index.name for index in meta.indexes if index.condition is not None}
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, meta.db_table)
+    return any(
+        (c["index"] or c["unique"])
+        and c["columns"][: len(columns)] == columns
+        and (proposal.partial or name not in partial_names)
+        for name, c in constraints.items()
+    )
+
+
+def try_index(proposal, key, using="default") -> bool:
+    """ينشئ الفهرس مؤقتًا داخل معاملة تُلغى، ويملأ after وتقدير الصفوف؛ False إن لم تتغير الخطة."""
+    connection = connections[using]
+    index = proposal.index
+    sql, params = _executable(key)
+    # schema_editor() كسياق يرفض العمل داخل معاملة في SQLite؛ يكفي هنا لبناء جملة CREATE INDEX
+    create = str(index.create_sql(proposal.model, connection.schema_editor()))
+    with transaction.atomic(using=using):
+        with connection.cursor() as cursor:
+            cursor.execute(create)
+            cursor.execute("ANALYZE %s" % connection.ops.quote_name(index.name))
+        after = explain(sql, params, using)
+        stat = _stat(index.name, using)
+        transaction.set_rollback(True, using=using)
+    if not any(index.name in line for line in after):
+        return False
+    proposal.after = "; ".join(after)
+    proposal.rows_before = _row_count(proposal.model._meta.db_table, using)
+    # sqlite_stat1: "عدد صفوف الفهرس، متوسط الصفوف لكل قيمة من العمود الأول، لأول عمودين، ..."
+    if 0 < proposal.equality < len(stat):
+        proposal.rows_after = stat[proposal.equality]
+    return True
+
+
+def advise(log, using="default", min_calls=1, live=False) -> list:
+    """الاقتراحات المجربة مجمعة لكل (نموذج، حقول)، الأعلى زمنًا ثم تكرارًا أولًا."""
+    if connections[using].vendor != "sqlite":
+        raise NotImplementedError("index advisor requires SQLite (EXPLAIN QUERY PLAN).")
+    if live:
+        return _advise(log, using, min_calls)
+    with temporary_sqlite_database("index_advisor", copy_from=using) as alias:
+        return _advise(log, alias, min_calls)
+
+
+def _advise(log, using, min_calls):
+    merged = {}
+    rejected = set()
+    for key, calls, seconds in log.items():
+        if calls < min_calls:
+            continue
+        for proposal in analyze(key, using):
+            if proposal.key in rejected:
+                continue
+            existing = merged.get(proposal.key)
+            if existing is None:
+                if _covered(proposal, using) or not try_index(proposal, key, using):
+                    rejected.add(proposal.key)
+                    continue
+                existing = merged[proposal.key] = proposal
+            existing.calls += calls
+            existing.seconds += seconds
+            existing.meta_ordering |= proposal.meta_ordering
+            if len(existing.examples) < 3:
+                existing.examples.append(key)
+    return sorted(merged.values(), key=lambda p: (p.seconds, p.calls), reverse=True)
@@ -0,0 +1,92 @@
+# config/jsonkeys.py
+"""
+ترقية مفاتيح محددة من حقل JSON إلى أعمدة مولّدة مفهرسة.
+
+البحث في metadata__pk على JSONField يعني json_extract لكل صف. بدل ذلك يُعرَّف المفتاح
+عمودًا مولّدًا افتراضيًا (VIRTUAL: لا يُخزن في الصف، ويُحسب عند بناء الفهرس والقراءة)
+ويُفهرس عبر Meta.indexes، فتُنشئه الترحيلات كأي حقل:
+
+    metadata_pk = json_key_field("metadata", "pk", _("معرف الكائن"), max_length=64)
+    objects = JSONKeyQuerySet.as_manager()
+
+JSONKeyQuerySet يحوّل filter(metadata__pk="...") إلى filter(metadata_pk="...") تلقائيًا،
+لقيم نصية فقط (exact وin): العمود المولّد نصي، ومقارنة JSON لقيمة رقمية تختلف عن مقارنة النص.
+
+في الترحيلات تُستخدم AddGeneratedField بدل AddField: SQLite يضيف العمود الافتراضي بـ ALTER TABLE
+دون نسخ الجدول، بينما AddField يعيد بناء الجدول كاملًا لكل حقل (ملايين الصفوف في سجل النشاط).
+"""
+from django.db import migrations, models
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.fields.json import KT
+
+_SEQUENCES = (list, tuple, set, frozenset)
+
+
+def json_key_field(json_field, key, verbose_name=None, max_length=255):
+    field = models.GeneratedField(
+        expression=KT(f"{json_field}{LOOKUP_SEP}{key}"),
+        output_field=models.CharField(max_length=max_length, null=True),
+        db_persist=False,
+        # المفتاح قد يغيب: exclude() يجب أن يشمل الصفوف بلا مفتاح كما في بحث JSON
+        null=True,
+        verbose_name=verbose_name,
+    )
+    # يُقرأ في JSONKeyQuerySet؛ لا يدخل في الترحيلات
+    field.json_key = (json_field, key)
+    return field
+
+
+def json_key_columns(model) -> dict:
+    """{(حقل JSON، المفتاح): اسم العمود المولّد} للنموذج."""
+    columns = model._meta.__dict__.get("_json_key_columns")
+    if columns is None:
+        columns = model._meta._json_key_columns = {
+            field.json_key: field.name for field in model._meta.concrete_fields if getattr(field, "json_key", None)
+        }
+    return columns
+
+
+def _rewrite_lookup(lookup, value, columns):
+    parts = lookup.split(LOOKUP_SEP)
+    if len(parts) not in (2, 3) or (parts[0], parts[1]) not in columns:
+        return lookup, value
+    column = columns[(parts[0], parts[1])]
+    suffix = parts[2] if len(parts) == 3 else "exact"
+    if suffix == "exact" and isinstance(value, str):
+        return column, value
+    if suffix == "in" and isinstance(value, _SEQUENCES) and all(isinstance(item, str) for item in value):
+        return f"{column}{LOOKUP_SEP}in", value
+    return lookup, value
+
+
+def _rewrite_q(q, columns):
+    children = [
+        _rewrite_q(child, columns) if isinstance(child, Q) else _rewrite_lookup(*child, columns)
+        for child in q.children
+    ]
+    return Q(*children, _connector=q.connector, _negated=q.negated)
+
+
+class JSONKeyQuerySet(models.QuerySet):
+    def _filter_or_exclude_inplace(self, negate, args, kwargs):
+        columns = json_key_columns(self.model)
+        if columns:
+            args = tuple(_rewrite_q(arg, columns) if isinstance(arg, Q) else arg for arg in args)
+            kwargs = dict(_rewrite_lookup(lookup, value, columns) for lookup, value in kwargs.items())
+        super()._filter_or_exclude_inplace(negate, args, kwargs)
+
+
+class AddGeneratedField(migrations.AddField):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        field = model._meta.get_field(self.name)
+        connection = schema_editor.connection
+        if connection.vendor != "sqlite" or field.db_persist or not self.allow_migrate_model(connection.alias, model):
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        definition, params = schema_editor.column_sql(model, field)
+        schema_editor.execute(
+            f"ALTER TABLE {schema_editor.quote_name(model._meta.db_table)} "
+            f"ADD COLUMN {schema_editor.quote_name(field.column)} {definition}",
+            params,
+        )
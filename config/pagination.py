@@ -0,0 +1,254 @@
+# config/pagination.py
+"""
+ترقيم صفحات بالمؤشر (keyset/cursor) للقوائم المرتبة حسب created_at.
+
+بدل OFFSET يُحفظ في المؤشر آخر (created_at, id) معروض، وتبدأ الصفحة التالية
+بعده مباشرة عبر فهرس created_at، فتكلفة الصفحة العميقة مثل الصفحة الأولى.
+"""
+import base64
+import binascii
+import json
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+CURSOR_VAR = "cursor"
+
+
+def estimate_table_rows(model, using="default"):
+    """
+    تقدير رخيص لعدد صفوف الجدول دون COUNT(*) كامل، أو None إن تعذّر.
+
+    المصدر إحصاءات المخطِّط: sqlite_stat1 (SQLite) أو pg_class.reltuples (PostgreSQL)، فالتقدير
+    صحيح حتى آخر ANALYZE فقط؛ seed وarchive يشغلانه بعد تغييرات الحجم الكبيرة. دون إحصاءات
+    يعيد None فيعود KeysetPaginator إلى العدّ محدود السقف.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            # أول رقم في stat عدد صفوف الفهرس؛ الأكبر بين الفهارس (غير الجزئية) هو عدد صفوف الجدول
+            cursor.execute(
+                "SELECT MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 WHERE tbl = %s", [model._meta.db_table]
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+        else:
+            return None
+        row = cursor.fetchone()
+    return max(int(row[0] or 0), 0) if row else None
+
+
+class Cursor:
+    AFTER = "a"
+    BEFORE = "b"
+
+    def __init__(self, direction, value, pk):
+        self.direction = direction
+        self.value = value
+        self.pk = pk
+
+    def encode(self) -> str:
+        raw = json.dumps([self.direction, self.value.isoformat(), str(self.pk)], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token, field):
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            direction, value, pk = json.loads(raw)
+            if direction not in (cls.AFTER, cls.BEFORE):
+                raise ValueError(direction)
+            return cls(direction, field.to_python(value), pk)
+        except (binascii.Error, ValueError, TypeError) as exc:
+            raise ValueError(f"Invalid cursor: {token!r}") from exc
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def next_cursor(self):
+        if self._has_next and self.object_list:
+            return self.paginator.cursor_for(self.object_list[-1], Cursor.AFTER)
+        return None
+
+    def previous_cursor(self):
+        if self._has_previous and self.object_list:
+            return self.paginator.cursor_for(self.object_list[0], Cursor.BEFORE)
+        return None
+
+
+class KeysetPaginator(Paginator):
+    """
+    Paginator متوافق مع Django يضيف keyset_page(cursor).
+    page(number) يبقى متاحًا (OFFSET) للترتيبات التي لا يخدمها المؤشر.
+    """
+
+    def __init__(self, object_list, per_page, *args, field="created_at", estimated_count=False, count_limit=10_000, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.field = field
+        self.estimated_count = estimated_count
+        self.count_limit = count_limit
+        self.count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        if not self.estimated_count:
+            return super().count
+        qs = self.object_list
+        if not qs.query.where:
+            estimate = estimate_table_rows(qs.model, qs.db)
+            if estimate is not None:
+                self.count_is_estimate = True
+                return estimate
+        # مع الفلاتر: عدّ محدود السقف بدل COUNT كامل؛ دون السقف يكون العدد دقيقًا
+        count = qs.order_by()[: self.count_limit].count()
+        self.count_is_estimate = count >= self.count_limit
+        return count
+
+    @property
+    def descending(self) -> bool:
+        ordering = self.object_list.query.order_by
+        return bool(ordering) and ordering[0] == f"-{self.field}"
+
+    def supports_keyset(self) -> bool:
+        # ChangeList قد يكرر حقل الترتيب الافتراضي (-created_at, -created_at, -pk)
+        ordering = list(dict.fromkeys(self.object_list.query.order_by))
+        if not ordering or ordering[0].lstrip("-") != self.field:
+            return False
+        pk_names = {"pk", self.object_list.model._meta.pk.name}
+        return all(o.lstrip("-") in pk_names for o in ordering[1:2]) and len(ordering) <= 2
+
+    def cursor_for(self, obj, direction) -> str:
+        return Cursor(direction, getattr(obj, self.field), obj.pk).encode()
+
+    def decode_cursor(self, token):
+        return Cursor.decode(token, self.object_list.model._meta.get_field(self.field))
+
+    def _ordered(self, qs):
+        prefix = "-" if self.descending else ""
+        return qs.order_by(f"{prefix}{self.field}", f"{prefix}pk")
+
+    def _seek(self, qs, cursor, forward):
+        # forward=True: العناصر التي تأتي بعد المؤشر في ترتيب العرض
+        lower = forward == self.descending
+        op, bound = ("lt", "lte") if lower else ("gt", "gte")
+        # شرط النطاق الزائد يسمح لـ SQLite ببدء المسح من موضع المؤشر في الفهرس
+        return qs.filter(**{f"{self.field}__{bound}": cursor.value}).filter(
+            Q(**{f"{self.field}__{op}": cursor.value}) | Q(**{f"pk__{op}": cursor.pk})
+        )
+
+    def keyset_page(self, token=None) -> KeysetPage:
+        qs = self._ordered(self.object_list)
+        cursor = self.decode_cursor(token) if token else None
+        limit = self.per_page + 1
+
+        if cursor is None:
+            rows = list(qs[:limit])
+            return KeysetPage(rows[: self.per_page], self, len(rows) > self.per_page, False)
+
+        if cursor.direction == Cursor.AFTER:
+            rows = list(self._seek(qs, cursor, forward=True)[:limit])
+            return KeysetPage(rows[: self.per_page], self, len(rows) > self.per_page, True)
+
+        rows = list(self._seek(qs, cursor, forward=False).reverse()[:limit])
+        page = rows[: self.per_page]
+        page.reverse()
+        return KeysetPage(page, self, True, len(rows) > self.per_page)
+
+
+class KeysetChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        # المؤشر ليس فلترًا؛ يُزال قبل أن تُفسَّر المعاملات كشروط بحث
+        self.cursor = self.params.pop(CURSOR_VAR, None)
+        self.filter_params.pop(CURSOR_VAR, None)
+        return super().get_queryset(request, exclude_parameters)
+
+    def get_results(self, request):
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        if not isinstance(paginator, KeysetPaginator) or not paginator.supports_keyset() or self.show_all:
+            self.keyset_page = None
+            return super().get_results(request)
+
+        try:
+            page = paginator.keyset_page(self.cursor)
+        except ValueError:
+            raise IncorrectLookupParameters
+
+        self.keyset_page = page
+        self.result_count = paginator.count
+        self.result_count_is_estimate = paginator.count_is_estimate
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.full_result_count = self.root_queryset.count() if self.show_full_result_count else None
+        self.show_admin_actions = True
+        self.result_list = page.object_list
+        self.can_show_all = False
+        self.multi_page = page.has_other_pages()
+        self.paginator = paginator
+
+    def keyset_url(self, token):
+        return self.get_query_string({CURSOR_VAR: token} if token else {}, remove=[CURSOR_VAR])
+
+    @property
+    def keyset_next_url(self):
+        return self.keyset_url(self.keyset_page.next_cursor())
+
+    @property
+    def keyset_previous_url(self):
+        return self.keyset_url(self.keyset_page.previous_cursor())
+
+    @property
+    def keyset_first_url(self):
+        return self.keyset_url(None)
+
+
+class KeysetPaginationMixin:
+    """
+    Mixin لـ ModelAdmin: صفحات بالمؤشر عند الترتيب حسب created_at، وعدّ تقديري
+    (keyset_estimated_count) حتى لا تُنفّذ القائمة COUNT(*) كاملًا على الجداول الكبيرة.
+    """
+
+    keyset_field = "created_at"
+    keyset_estimated_count = True
+    keyset_count_limit = 10_000
+    show_full_result_count = False
+    change_list_template = "admin/keyset_change_list.html"
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        return KeysetPaginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            field=self.keyset_field,
+            estimated_count=self.keyset_estimated_count,
+            count_limit=self.keyset_count_limit,
+        )
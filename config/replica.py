@@ -0,0 +1,62 @@
+# config/replica.py
+"""
+نسخة قراءة محلية (replica stand-in) للتطوير والاختبار: لقطة من قاعدة SQLite الأساسية
+تُنسخ دوريًا عبر Backup API (الأمر sync_replica)، مع ملف ختم بزمن اللقطة لحساب التأخر.
+
+في الإنتاج مع نسخة قراءة حقيقية (PostgreSQL مثلًا) لا يوجد ملف ختم، فيُعتبر التأخر صفرًا
+ويُترك رصده لأدوات قاعدة البيانات.
+"""
+import os
+import sqlite3
+import time
+
+from django.db import connections
+from django.db.transaction import TransactionManagementError
+
+_STAMP_CACHE_SECONDS = 1.0
+_stamp_cache = {}
+
+
+def stamp_path(alias) -> str:
+    return f"{connections.settings[alias]['NAME']}.stamp"
+
+
+def snapshot(source="default", target="replica", pages=1024) -> float:
+    """ينسخ source إلى ملف target صفحةً صفحة دون إيقاف الكتّاب، ويعيد زمن بدء اللقطة."""
+    if connections[source].vendor != "sqlite":
+        raise NotImplementedError("Replica snapshots require SQLite.")
+    if connections[source].in_atomic_block:
+        # Backup API ينتظر إلى الأبد قفل كتابة يحمله الاتصال نفسه
+        raise TransactionManagementError("Cannot snapshot a database from inside an atomic block.")
+    started = time.time()
+    connections[source].ensure_connection()
+    source_conn = connections[source].connection
+    # النسخ فوق الملف نفسه (لا إعادة تسمية) حتى ترى الاتصالات المفتوحة على النسخة البيانات الجديدة
+    target_conn = sqlite3.connect(str(connections.settings[target]["NAME"]), timeout=30)
+    try:
+        source_conn.backup(target_conn, pages=pages)
+    finally:
+        target_conn.close()
+    path = stamp_path(target)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as fh:
+        fh.write(repr(started))
+    os.replace(f"{path}.tmp", path)
+    _stamp_cache.pop(target, None)
+    return started
+
+
+def replica_lag(alias) -> float:
+    """عمر بيانات النسخة بالثواني؛ inf إن لم تُنسخ بعد. القيمة تُخزن ثانية واحدة لتفادي قراءة الملف لكل استعلام."""
+    if connections.settings[alias]["ENGINE"].rsplit(".", 1)[-1] != "sqlite3":
+        return 0.0
+    now = time.monotonic()
+    cached = _stamp_cache.get(alias)
+    if cached is None or now - cached[0] > _STAMP_CACHE_SECONDS:
+        try:
+            with open(stamp_path(alias), encoding="utf-8") as fh:
+                stamp = float(fh.read())
+        except (OSError, ValueError):
+            stamp = None
+        cached = _stamp_cache[alias] = (now, stamp)
+    stamp = cached[1]
+    return float("inf") if stamp is None else max(time.time() - stamp, 0.0)
@@ -0,0 +1,143 @@
+# config/routers.py
+"""
+توجيه القراءة والكتابة: قراءات النماذج الثقيلة في التقارير وقوائم الإدارة تذهب إلى
+DATABASE_ROUTING["READ_ALIAS"]، وكل كتابة إلى default.
+
+القراءة تعود إلى default (قراءة ما كُتب) في الحالات التالية:
+- بعد أي كتابة في الطلب نفسه، وفي الطلبات التالية من العميل نفسه خلال MAX_LAG ثانية (ملف تعريف ارتباط).
+- داخل معاملة على default.
+- داخل use_primary() أو fresh_reads(max_lag) إن كانت النسخة أقدم من المطلوب.
+- إن كان تأخر النسخة أكبر من MAX_LAG (أو لم تُنسخ بعد).
+"""
+import contextlib
+import contextvars
+import functools
+import time
+
+from django.conf import settings
+from django.db import connections
+
+from config.replica import replica_lag
+
+PRIMARY = "default"
+PIN_COOKIE = "db_primary_until"
+
+_pinned = contextvars.ContextVar("db_pinned", default=False)
+_max_lag = contextvars.ContextVar("db_max_lag", default=None)
+
+
+def get_config() -> dict:
+    return {
+        "READ_ALIAS": None,
+        "MODELS": (),
+        "MAX_LAG": 30.0,
+        **getattr(settings, "DATABASE_ROUTING", {}),
+    }
+
+
+def pin_primary() -> None:
+    _pinned.set(True)
+
+
+def is_pinned() -> bool:
+    return _pinned.get()
+
+
+@contextlib.contextmanager
+def use_primary():
+    """كل القراءات داخل الكتلة من default."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+@contextlib.contextmanager
+def fresh_reads(max_lag=0.0):
+    """يقبل النسخة فقط إن كان تأخرها لا يتجاوز max_lag ثانية (0 = default دائمًا مع النسخة المحلية)."""
+    token = _max_lag.set(max_lag)
+    try:
+        yield
+    finally:
+        _max_lag.reset(token)
+
+
+def require_fresh_reads(max_lag=0.0):
+    """مزخرف view بنفس معنى fresh_reads."""
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            with fresh_reads(max_lag):
+                return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class ReadReplicaRouter:
+    def __init__(self):
+        config = get_config()
+        self.read_alias = config["READ_ALIAS"]
+        # label_lower لا يغيّر حالة app_label (APP3.task)، فالمقارنة بحروف صغيرة بالكامل
+        self.models = {label.lower() for label in config["MODELS"]}
+        self.max_lag = config["MAX_LAG"]
+
+    def db_for_read(self, model, **hints):
+        if not self.read_alias or model._meta.label_lower.lower() not in self.models:
+            return None
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if _pinned.get() or connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        max_lag = _max_lag.get()
+        if replica_lag(self.read_alias) > (self.max_lag if max_lag is None else max_lag):
+            return PRIMARY
+        return self.read_alias
+
+    def db_for_write(self, model, **hints):
+        # حفظ الجلسة يحدث في طلبات كثيرة ولا يؤثر على ما يُقرأ من النسخة
+        if model._meta.app_label != "sessions":
+            _pinned.set(True)
+        # كائن من قاعدة أخرى (قاعدة قياس مؤقتة مثلًا) يُكتب فيها؛ وما قُرئ من النسخة يُكتب في default
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db and instance._state.db != self.read_alias:
+            return instance._state.db
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {PRIMARY, self.read_alias}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # النسخة تُملأ بالنسخ من default لا بالترحيلات
+        if self.read_alias and db == self.read_alias:
+            return False
+        return None
+
+
+class DatabaseRoutingMiddleware:
+    """يبدأ كل طلب غير مثبت، ويثبت العميل على default لمدة MAX_LAG بعد أي كتابة (مثل حفظ ثم إعادة توجيه في الإدارة)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        max_lag = get_config()["MAX_LAG"]
+        try:
+            pinned_until = float(request.COOKIES.get(PIN_COOKIE, 0))
+        except ValueError:
+            pinned_until = 0
+        token = _pinned.set(pinned_until > time.time())
+        try:
+            response = self.get_response(request)
+            if _pinned.get() and request.method not in ("GET", "HEAD", "OPTIONS"):
+                response.set_cookie(PIN_COOKIE, f"{time.time() + max_lag:.0f}", max_age=int(max_lag) + 1, httponly=True, samesite="Lax")
+        finally:
+            _pinned.reset(token)
+        return response
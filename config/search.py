@@ -0,0 +1,274 @@
+# config/search.py
+"""
+فهرس بحث نصي كامل (SQLite FTS5) مع توحيد النص العربي.
+
+لكل تطبيق فهرس خاص به (جدول FTS5 + جدول وثائق يربط rowid بالنموذج والمعرف)
+يُنشأ عبر ترحيل التطبيق (ويُملأ للبيانات الموجودة بالأمر rebuild_search_index)، ويُحدَّث تدريجيًا عبر إشارات post_save/post_delete:
+
+    # app3/search.py
+    index = FullTextIndex("APP3_search")
+    index.register(Task, title=("title",), body=("description",))
+"""
+import re
+
+from django.db import connections, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+from django.utils.text import smart_split, unescape_string_literal
+
+# التشكيل وعلامات القرآن والتطويل
+_DIACRITICS = re.compile("[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]")
+_FOLD = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ة": "ه"})
+_TOKEN = re.compile(r"\w+")
+
+_registry = {}
+
+
+def normalize_arabic(text: str) -> str:
+    """توحيد الألف والياء والتاء المربوطة وحذف التشكيل والتطويل."""
+    if not text:
+        return ""
+    return _DIACRITICS.sub("", text).translate(_FOLD).casefold()
+
+
+def build_match_query(term: str) -> str:
+    """كل كلمة بعد التوحيد تُطابق كبادئة، والكلمات مجتمعة بـ AND."""
+    tokens = _TOKEN.findall(normalize_arabic(term))
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def index_for(model):
+    return _registry.get(model._meta.concrete_model)
+
+
+def registered_indexes():
+    return list(dict.fromkeys(_registry.values()))
+
+
+def registered_models():
+    return list(_registry)
+
+
+class FullTextIndex:
+    # وزن العنوان أعلى من النص في ترتيب bm25
+    title_weight = 10.0
+    body_weight = 1.0
+
+    def __init__(self, table: str, using="default"):
+        self.table = table
+        self.doc_table = f"{table}_doc"
+        self.using = using
+        self.models = {}
+
+    # ---------- التسجيل والمزامنة ----------
+
+    def register(self, model, title=(), body=()):
+        self.models[model] = (tuple(title), tuple(body))
+        _registry[model] = self
+        uid = f"fulltext-{self.table}-{model._meta.label_lower}"
+        post_save.connect(self._on_save, sender=model, dispatch_uid=f"{uid}-save")
+        post_delete.connect(self._on_delete, sender=model, dispatch_uid=f"{uid}-delete")
+
+    def available(self, using=None) -> bool:
+        return connections[using or self.using].vendor == "sqlite"
+
+    def _document(self, instance):
+        title_fields, body_fields = self.models[type(instance)._meta.concrete_model]
+        title = " ".join(str(getattr(instance, f) or "") for f in title_fields)
+        body = " ".join(str(getattr(instance, f) or "") for f in body_fields)
+        return normalize_arabic(title), normalize_arabic(body)
+
+    def _object_id(self, model, pk, connection):
+        return str(model._meta.pk.get_db_prep_value(pk, connection))
+
+    def _on_save(self, sender, instance, raw=False, using=None, **kwargs):
+        if not raw:
+            self.add(instance, using=using)
+
+    def _on_delete(self, sender, instance, using=None, **kwargs):
+        self.remove(instance, using=using)
+
+    def add(self, instance, using=None) -> None:
+        self.add_many([instance], using=using)
+
+    def add_many(self, instances, using=None) -> None:
+        connection = connections[using or self.using]
+        if connection.vendor != "sqlite":
+            return
+        with connection.cursor() as cursor:
+            for instance in instances:
+                model = type(instance)._meta.concrete_model
+                label = model._meta.label_lower
+                object_id = self._object_id(model, instance.pk, connection)
+                cursor.execute(
+                    f'INSERT INTO "{self.doc_table}" ("model", "object_id") VALUES (%s, %s) '
+                    f'ON CONFLICT ("model", "object_id") DO NOTHING',
+                    [label, object_id],
+                )
+                cursor.execute(
+                    f'SELECT "rowid" FROM "{self.doc_table}" WHERE "model" = %s AND "object_id" = %s',
+                    [label, object_id],
+                )
+                rowid = cursor.fetchone()[0]
+                cursor.execute(f'DELETE FROM "{self.table}" WHERE rowid = %s', [rowid])
+                cursor.execute(
+                    f'INSERT INTO "{self.table}" (rowid, title, body) VALUES (%s, %s, %s)',
+                    [rowid, *self._document(instance)],
+                )
+
+    def remove(self, instance, using=None) -> None:
+        connection = connections[using or self.using]
+        if connection.vendor != "sqlite":
+            return
+        model = type(instance)._meta.concrete_model
+        params = [model._meta.label_lower, self._object_id(model, instance.pk, connection)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM "{self.table}" WHERE rowid IN '
+                f'(SELECT "rowid" FROM "{self.doc_table}" WHERE "model" = %s AND "object_id" = %s)',
+                params,
+            )
+            cursor.execute(f'DELETE FROM "{self.doc_table}" WHERE "model" = %s AND "object_id" = %s', params)
+
+    def rebuild(self, batch_size=1000, using=None) -> int:
+        # معاملة واحدة: بدونها يلتزم (ويُزامن القرص) كل سطر على حدة
+        with transaction.atomic(using=using or self.using):
+            return self._rebuild(batch_size, using or self.using)
+
+    def _rebuild(self, batch_size, using):
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM "{self.table}"')
+            cursor.execute(f'DELETE FROM "{self.doc_table}"')
+        total = 0
+        for model, (title_fields, body_fields) in self.models.items():
+            qs = model._default_manager.using(connection.alias).only("pk", *title_fields, *body_fields)
+            batch = []
+            for instance in qs.iterator(chunk_size=batch_size):
+                batch.append(instance)
+                if len(batch) >= batch_size:
+                    self.add_many(batch, using=connection.alias)
+                    total += len(batch)
+                    batch = []
+            self.add_many(batch, using=connection.alias)
+            total += len(batch)
+        return total
+
+    # ---------- البحث ----------
+
+    def _match_sql(self):
+        return (
+            f'SELECT "d"."object_id" FROM "{self.table}" JOIN "{self.doc_table}" "d" ON "d"."rowid" = "{self.table}".rowid '
+            f'WHERE "{self.table}" MATCH %s AND "d"."model" = %s'
+        )
+
+    def matching_q(self, model, term, prefix=""):
+        """شرط Q باستعلام فرعي واحد على الفهرس؛ prefix لمطابقة علاقة FK (مثل project)."""
+        match = build_match_query(term)
+        if not match:
+            return Q()
+        subquery = RawSQL(self._match_sql(), [match, model._meta.concrete_model._meta.label_lower])
+        return Q(**{f"{prefix}__in" if prefix else "pk__in": subquery})
+
+    def filter(self, queryset, term):
+        return queryset.filter(self.matching_q(queryset.model, term))
+
+    def search(self, term, models=None, limit=20, using=None):
+        """نتائج مرتبة حسب الصلة: [(model, pk, rank)] ، الأقل rank أكثر صلة."""
+        match = build_match_query(term)
+        connection = connections[using or self.using]
+        if not match or connection.vendor != "sqlite":
+            return []
+        labels = {m._meta.label_lower: m for m in (models or self.models)}
+        placeholders = ", ".join(["%s"] * len(labels))
+        sql = (
+            f'SELECT "d"."model", "d"."object_id", bm25("{self.table}", {self.title_weight}, {self.body_weight}) AS rank '
+            f'FROM "{self.table}" JOIN "{self.doc_table}" "d" ON "d"."rowid" = "{self.table}".rowid '
+            f'WHERE "{self.table}" MATCH %s AND "d"."model" IN ({placeholders}) ORDER BY rank LIMIT %s'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [match, *labels, limit])
+            rows = cursor.fetchall()
+        return [(labels[label], labels[label]._meta.pk.to_python(object_id), rank) for label, object_id, rank in rows]
+
+
+def search(term, models=None, limit=20):
+    """بحث موحّد عبر كل الفهارس المسجلة مع جلب الكائنات: [(obj, rank)] مرتبة حسب الصلة."""
+    indexes = {}
+    for model, index in _registry.items():
+        if models is None or model in models:
+            indexes.setdefault(index, []).append(model)
+
+    hits = []
+    for index, index_models in indexes.items():
+        hits.extend(index.search(term, index_models, limit=limit))
+    hits.sort(key=lambda hit: hit[2])
+    hits = hits[:limit]
+
+    objects = {}
+    for model in {hit[0] for hit in hits}:
+        objects[model] = model._default_manager.in_bulk([pk for m, pk, _ in hits if m is model])
+    return [(objects[model][pk], rank) for model, pk, rank in hits if pk in objects[model]]
+
+
+SEARCH_PREFIXES = {"^": "istartswith", "=": "iexact", "@": "search"}
+
+
+def search_fields_q(fields, term):
+    """
+    شرط Q لبحث search_fields كما يبنيه ModelAdmin: كل كلمة (أو عبارة بين علامتي تنصيص) تطابق
+    أحد الحقول، والكلمات مجتمعة بـ AND. البادئات ^ و= و@ كما في Django، وإلا icontains.
+    """
+    lookups = []
+    for field in map(str, fields):
+        lookup = SEARCH_PREFIXES.get(field[:1])
+        lookups.append(f"{field[1:]}__{lookup}" if lookup else f"{field}__icontains")
+    terms = []
+    for bit in smart_split(term):
+        if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+            bit = unescape_string_literal(bit)
+        terms.append(Q.create([(lookup, bit) for lookup in lookups], connector=Q.OR))
+    return Q.create(terms)
+
+
+class FullTextSearchMixin:
+    """
+    Mixin لـ ModelAdmin يبحث في حقول search_fields المفهرسة عبر فهرس FTS5 بدل icontains.
+    fulltext_related: علاقات FK نماذجها مفهرسة (مثل project في المهام).
+    بقية search_fields (اسم المستخدم، الرقم التسلسلي...) تُبحث كالمعتاد، والنتيجة اتحاد الاثنين.
+    """
+
+    fulltext_related = ()
+
+    def get_fulltext_fields(self):
+        """حقول search_fields التي يغطيها الفهرس: حقول النموذج المسجلة وحقول fulltext_related."""
+        covered = set()
+        for prefix, model in [("", self.model)] + [
+            (f"{name}__", self.model._meta.get_field(name).related_model) for name in self.fulltext_related
+        ]:
+            index = index_for(model)
+            if index is not None:
+                title, body = index.models[model._meta.concrete_model]
+                covered.update(prefix + field for field in title + body)
+        return covered
+
+    def get_search_results(self, request, queryset, search_term):
+        index = index_for(self.model)
+        if not search_term.strip() or index is None or not index.available(queryset.db):
+            return super().get_search_results(request, queryset, search_term)
+
+        condition = index.matching_q(self.model, search_term)
+        for name in self.fulltext_related:
+            related_model = self.model._meta.get_field(name).related_model
+            related_index = index_for(related_model)
+            if related_index is not None:
+                condition |= related_index.matching_q(related_model, search_term, prefix=name)
+
+        covered = self.get_fulltext_fields()
+        remaining = [field for field in self.get_search_fields(request) if str(field).lstrip("^=@") not in covered]
+        if remaining:
+            # الحقول غير المفهرسة بمطابقة ModelAdmin المعتادة، كاستعلام فرعي لا يكرر الصفوف
+            matches = queryset.filter(search_fields_q(remaining, search_term))
+            condition |= Q(pk__in=matches.values("pk"))
+        return queryset.filter(condition), False
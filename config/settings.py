@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -25,13 +26,16 @@ SECRET_KEY = 'django-insecure-o80((pu5j=ssj&6$s7(e=5qzeps3arv#1d*tw$kh0rvl)2#gvi
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+TESTING = sys.argv[1:2] == ['test']
+
 ALLOWED_HOSTS = []
 
 
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    # django.contrib.admin بموقع إدارة يخزن نتائج autocomplete مؤقتًا
+    'config.apps.AdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -59,7 +63,7 @@ ROOT_URLCONF = 'config.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -79,9 +83,39 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # sqlite3 مع WAL وإعدادات PRAGMA (config/db/backends/sqlite3)؛ مسارات الكتابة بـ config.db.transactions.atomic_immediate
+        'ENGINE': 'config.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        # إعادة استخدام الاتصال بين الطلبات مع فحص صلاحيته قبل كل طلب
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # ثوانٍ لانتظار قفل الكتابة (busy_timeout)
+            'timeout': 20,
+        },
+    },
+    # نسخة القراءة: لقطة محلية من default يحدّثها الأمر sync_replica (config.replica)
+    'replica': {
+        'ENGINE': 'config.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,
+        },
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+}
+
+DATABASE_ROUTERS = ['config.routers.ReadReplicaRouter']
+
+# config.routers: قراءات هذه النماذج من READ_ALIAS ما لم يتجاوز تأخرها MAX_LAG ثانية
+DATABASE_ROUTING = {
+    'READ_ALIAS': 'replica',
+    'MODELS': ['APP3.ActivityLog', 'APP3.Task', 'APP2.Asset', 'APP2.AssetAssignment'],
+    'MAX_LAG': 30.0,
 }
 
 
@@ -113,12 +147,16 @@ USE_I18N = True
 USE_TZ = True
 
 MIDDLEWARE = [
+    'config.sqlstats.SQLInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',  # ✅
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'config.routers.DatabaseRoutingMiddleware',
+    'APP3.audit.AuditMiddleware',
+    'APP1.middleware.ProfileMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -129,3 +167,135 @@ MIDDLEWARE = [
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = 'static/'
+
+MEDIA_ROOT = BASE_DIR / 'var' / 'media'
+
+
+# Attachment storage (APP2.storage): ملف واحد لكل محتوى باسم خلاصته SHA-256
+# الملفات بلا مراجع تُحذف بعد GRACE ثانية عبر: python manage.py gc_blobs
+
+BLOB_STORAGE = {
+    'PREFIX': 'blobs',
+    'GRACE': 3600,
+    'BATCH_SIZE': 500,
+    # المرفقات القديمة (uploads/attachments/…) حُفظت بلا MEDIA_ROOT نسبةً إلى مجلد المشروع؛
+    # تُقرأ من هنا حتى ينقلها: python manage.py backfill_blobs
+    'LEGACY_ROOT': BASE_DIR,
+}
+
+# Attachment downloads (APP2.views): SENDFILE = 'X-Sendfile' أو 'X-Accel-Redirect' لترك الإرسال لخادم الويب
+
+ATTACHMENT_DOWNLOADS = {
+    'CHUNK_SIZE': 64 * 1024,
+    'MAX_AGE': 3600,
+    'SENDFILE': None,
+    'SENDFILE_ROOT': '/protected/',
+}
+
+# Chunked uploads (APP2.uploads): الجلسات المتروكة تُحذف بعد EXPIRE ثانية عبر: python manage.py cleanup_uploads
+
+UPLOADS = {
+    'DIR': None,  # None → MEDIA_ROOT/partial-uploads
+    'MAX_SIZE': 4 * 1024 ** 3,
+    'MAX_CHUNK_SIZE': 16 * 1024 ** 2,
+    'EXPIRE': 24 * 3600,
+}
+
+
+# Primary keys
+# True: uuid7 (time-ordered) instead of uuid4 for TimeStampedModel.id (config.ids)
+
+TIME_ORDERED_PRIMARY_KEYS = False
+
+
+# Activity log writer (APP3.activity)
+
+ACTIVITY_LOG_WRITER = {
+    # الاختبارات تكتب مباشرة حتى لا يكتب الخيط الخلفي في قاعدة الاختبار بين الحالات
+    'SYNC': TESTING,
+    'BATCH_SIZE': 500,
+    'FLUSH_INTERVAL': 1.0,
+    'MAX_QUEUE_SIZE': 10000,
+    'PUT_TIMEOUT': 5.0,
+    'RETRIES': 3,
+    'RETRY_BACKOFF': 0.2,
+}
+
+# Auditing (APP3.audit): الحقول المتغيرة فقط تُكتب في ActivityLog.metadata عبر الكاتب أعلاه
+
+AUDIT = {
+    'ENABLED': True,
+    'MODELS': {
+        'APP1.Profile': {'exclude': ['national_id']},
+        'APP1.Address': {},
+        'APP2.Asset': {},
+        'APP2.AssetAssignment': {},
+        'APP3.Project': {},
+        'APP3.Task': {},
+    },
+    'BUDGET_US': 150,
+}
+
+# Archiving (APP3.archive): نقل الصفوف الباردة إلى JSONL مضغوط عبر: python manage.py archive_data
+# RETENTION_DAYS: سجل النشاط بعمره، والمهام المنتهية (DONE/CANCELED) بآخر تحديث لها
+
+ARCHIVE = {
+    'DIR': BASE_DIR / 'var' / 'archive',
+    'RETENTION_DAYS': {'APP3.ActivityLog': 180, 'APP3.Task': 365},
+    'BATCH_SIZE': 1000,
+    'PAUSE': 0.05,
+}
+
+
+# Caches
+# profiles: الملفات الشخصية المخزنة بين الطلبات (APP1.cache)؛ يمكن تبديلها بـ Redis/Memcached
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'profiles': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'profiles',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+PROFILE_CACHE = {
+    'ALIAS': 'profiles',
+    'TIMEOUT': 600,
+    # يُرفع لإبطال كل المدخلات دفعة واحدة
+    'VERSION': 1,
+}
+
+
+# Admin autocomplete (config.autocomplete): النتائج تُخزن TIMEOUT ثانية وتُبطل مع كل حفظ لنماذج MODELS
+
+AUTOCOMPLETE = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 60,
+    'MODELS': ['auth.User', 'APP1.Profile', 'APP2.Asset', 'APP3.Project', 'APP3.Task'],
+}
+
+
+# Admin facets (config.facets): أعداد الفلاتر تُخزن TIMEOUT ثانية، وبعد أي حفظ تُعاد مرة كل REFRESH ثانية على الأكثر
+
+FACETS = {
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': 600,
+    'REFRESH': 30,
+    'TOP': 30,
+    'MODELS': ['APP2.Asset', 'APP3.Task'],
+}
+
+
+# SQL instrumentation (config.sqlstats): Server-Timing، ميزانيات الاستعلامات، كشف N+1
+# الإحصاءات لكل مسار تُكتب إلى STATS_DIR (الافتراضي BASE_DIR/var/sqlstats) ويعرضها الأمر sql_stats
+
+SQL_INSTRUMENTATION = {
+    'ENABLED': False,
+    'SAMPLE_RATE': 1.0,
+    'BUDGET_QUERIES': 50,
+    'BUDGET_DB_MS': 250.0,
+    'NPLUSONE_THRESHOLD': 5,
+}
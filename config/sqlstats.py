@@ -0,0 +1,261 @@
+# config/sqlstats.py
+"""
+قياس استعلامات SQL لكل طلب عبر connection.execute_wrapper:
+
+- عدد الاستعلامات وزمن قاعدة البيانات وأبطأ الجمل، في ترويسة Server-Timing.
+- بصمات الاستعلامات (SQL بدون القيم، وقوائم IN مطوية) لكشف نمط N+1:
+  نفس البصمة تتكرر N مرة في الطلب نفسه (مثل جلب project لكل صف في قائمة المهام).
+- تسجيل تحذير عند تجاوز ميزانية الاستعلامات أو الزمن.
+- مدرجات تكرارية لكل مسار URL تُكتب دوريًا إلى ملف لكل عملية، ويجمعها الأمر sql_stats.
+
+يُفعّل بـ SQL_INSTRUMENTATION["ENABLED"]؛ وإلا لا تُحمّل الوسيطة أصلًا (MiddlewareNotUsed).
+"""
+import atexit
+import contextlib
+import heapq
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "ENABLED": False,
+    "SAMPLE_RATE": 1.0,
+    "SERVER_TIMING": True,
+    "BUDGET_QUERIES": 50,
+    "BUDGET_DB_MS": 250.0,
+    "SLOW_QUERY_MS": 100.0,
+    "TOP_N": 5,
+    "NPLUSONE_THRESHOLD": 5,
+    "STATS_DIR": None,
+    "FLUSH_INTERVAL": 30.0,
+}
+
+# حدود الفئات العليا للمدرجات (الأخيرة لا نهائية)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+DB_MS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*%s\s*,)*\s*%s\s*\)", re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "SQL_INSTRUMENTATION", {})}
+
+
+def fingerprint(sql: str) -> str:
+    """SQL بلا قيم: الثوابت تصبح ?، وقوائم IN بأي طول تصبح IN (...)."""
+    sql = _IN_LIST.sub("IN (...)", sql)
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+def _bucket(value, bounds) -> int:
+    for i, bound in enumerate(bounds):
+        if value <= bound:
+            return i
+    return len(bounds)
+
+
+class QueryRecorder:
+    """يُمرَّر إلى connection.execute_wrapper ويجمع إحصاءات الطلب الحالي."""
+
+    def __init__(self, top_n=5):
+        self.top_n = top_n
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.slowest = []  # كومة صغرى من (المدة، sql)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            self.fingerprints[fingerprint(sql)] += 1
+            entry = (elapsed, sql)
+            if len(self.slowest) < self.top_n:
+                heapq.heappush(self.slowest, entry)
+            elif entry > self.slowest[0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    @contextlib.contextmanager
+    def record(self):
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+    @property
+    def db_ms(self) -> float:
+        return self.duration * 1000
+
+    def repeated(self, threshold):
+        """البصمات المتكررة threshold مرة فأكثر (مرشحات N+1)، الأكثر تكرارًا أولًا."""
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n >= threshold]
+
+    def slowest_queries(self):
+        return sorted(self.slowest, reverse=True)
+
+
+class RouteStats:
+    """مدرجات تكرارية لكل مسار داخل العملية، تُكتب إلى STATS_DIR/sqlstats-<pid>.json."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.last_flush = time.monotonic()
+
+    def add(self, route, recorder, nplusone):
+        with self.lock:
+            entry = self.routes.setdefault(route, {
+                "requests": 0,
+                "queries": 0,
+                "db_ms": 0.0,
+                "query_hist": [0] * (len(QUERY_BUCKETS) + 1),
+                "db_ms_hist": [0] * (len(DB_MS_BUCKETS) + 1),
+                "nplusone": {},
+            })
+            entry["requests"] += 1
+            entry["queries"] += recorder.count
+            entry["db_ms"] += recorder.db_ms
+            entry["query_hist"][_bucket(recorder.count, QUERY_BUCKETS)] += 1
+            entry["db_ms_hist"][_bucket(recorder.db_ms, DB_MS_BUCKETS)] += 1
+            for fp, n in nplusone:
+                entry["nplusone"][fp] = max(entry["nplusone"].get(fp, 0), n)
+
+    def maybe_flush(self, config):
+        if time.monotonic() - self.last_flush >= config["FLUSH_INTERVAL"]:
+            self.flush(config)
+
+    def flush(self, config=None):
+        config = config or get_config()
+        directory = stats_dir(config)
+        with self.lock:
+            self.last_flush = time.monotonic()
+            if not self.routes:
+                return
+            data = json.dumps(self.routes, ensure_ascii=False)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"sqlstats-{os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def stats_dir(config=None) -> Path:
+    config = config or get_config()
+    return Path(config["STATS_DIR"] or Path(settings.BASE_DIR) / "var" / "sqlstats")
+
+
+def load_route_stats(directory=None) -> dict:
+    """يدمج ملفات كل العمليات في قاموس واحد لكل مسار."""
+    merged = {}
+    for path in sorted(Path(directory or stats_dir()).glob("sqlstats-*.json")):
+        for route, entry in json.loads(path.read_text(encoding="utf-8")).items():
+            target = merged.get(route)
+            if target is None:
+                merged[route] = entry
+                continue
+            for key in ("requests", "queries", "db_ms"):
+                target[key] += entry[key]
+            for key in ("query_hist", "db_ms_hist"):
+                target[key] = [a + b for a, b in zip(target[key], entry[key])]
+            for fp, n in entry["nplusone"].items():
+                target["nplusone"][fp] = max(target["nplusone"].get(fp, 0), n)
+    return merged
+
+
+def histogram_percentile(hist, bounds, fraction):
+    """الحد الأعلى للفئة التي تقع فيها النسبة المئوية (None = أكبر من آخر حد)."""
+    total = sum(hist)
+    if not total:
+        return 0
+    running = 0
+    for i, count in enumerate(hist):
+        running += count
+        if running >= total * fraction:
+            return bounds[i] if i < len(bounds) else None
+    return None
+
+
+route_stats = RouteStats()
+atexit.register(lambda: route_stats.flush() if get_config()["ENABLED"] else None)
+
+
+class SQLInstrumentationMiddleware:
+    """يُوضع أول الوسائط حتى يشمل استعلامات الجلسة والمصادقة."""
+
+    def __init__(self, get_response):
+        self.config = get_config()
+        if not self.config["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = self.config
+        if config["SAMPLE_RATE"] < 1.0 and random.random() >= config["SAMPLE_RATE"]:
+            return self.get_response(request)
+
+        recorder = QueryRecorder(top_n=config["TOP_N"])
+        started = time.perf_counter()
+        with recorder.record():
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        request.sql_stats = recorder
+        nplusone = recorder.repeated(config["NPLUSONE_THRESHOLD"])
+        route = self.route_name(request)
+
+        if config["SERVER_TIMING"]:
+            timing = f'db;dur={recorder.db_ms:.1f};desc="{recorder.count} queries", app;dur={total_ms:.1f}'
+            existing = response.get("Server-Timing")
+            response["Server-Timing"] = f"{existing}, {timing}" if existing else timing
+
+        if nplusone:
+            for fp, n in nplusone:
+                logger.warning("Possible N+1 on %s: %d× %s", route, n, fp)
+        if recorder.count > config["BUDGET_QUERIES"] or recorder.db_ms > config["BUDGET_DB_MS"]:
+            logger.warning(
+                "Query budget exceeded on %s %s: %d queries, %.1f ms DB (budget %d / %.0f ms); slowest: %s",
+                request.method,
+                route,
+                recorder.count,
+                recorder.db_ms,
+                config["BUDGET_QUERIES"],
+                config["BUDGET_DB_MS"],
+                "; ".join(f"{elapsed * 1000:.1f} ms {fingerprint(sql)[:200]}" for elapsed, sql in recorder.slowest_queries()),
+            )
+        else:
+            for elapsed, sql in recorder.slowest_queries():
+                if elapsed * 1000 >= config["SLOW_QUERY_MS"]:
+                    logger.info("Slow query on %s: %.1f ms %s", route, elapsed * 1000, fingerprint(sql)[:200])
+
+        route_stats.add(route, recorder, nplusone)
+        route_stats.maybe_flush(config)
+        return response
+
+    @staticmethod
+    def route_name(request) -> str:
+        # المسار كنمط (admin/APP3/task/<path:object_id>/change/) حتى لا تتفرق الإحصاءات حسب المعرفات
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return "<unresolved>"
+        return match.route or match.view_name
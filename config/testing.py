@@ -0,0 +1,100 @@
+# config/testing.py
+"""
+أدوات اختبار مشتركة: ميزانية الاستعلامات والزمن لصفحات لوحة الإدارة.
+
+كل تطبيق يزرع بياناته (بعلاقات مختلفة لكل صف حتى يظهر أي N+1) ثم يستدعي
+assertAdminBudgets(app_label)، فتُفتح قائمة التغيير والبحث ونموذج الإضافة والتعديل
+لكل ModelAdmin مسجّل في التطبيق. عند الفشل تُطبع بصمات الاستعلامات مرتبة حسب التكرار.
+
+ADMIN_BUDGET_ROWS في البيئة يرفع حجم البيانات المزروعة للقياس اليدوي.
+
+TemporaryMediaRootMixin يوجّه MEDIA_ROOT إلى مجلد مؤقت يُحذف بعد كل اختبار (المرفقات ومخزن الكتل).
+
+query_plan(queryset) يعيد خطة SQLite (EXPLAIN QUERY PLAN) لاختبار أن الاستعلام يستخدم الفهرس المقصود.
+"""
+import os
+import shutil
+import tempfile
+import time
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from config.sqlstats import fingerprint
+
+ADMIN_BUDGET_ROWS = int(os.environ.get("ADMIN_BUDGET_ROWS", 30))
+
+
+def query_plan(queryset) -> str:
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return "; ".join(row[-1] for row in cursor.fetchall())
+
+
+class TemporaryMediaRootMixin:
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+
+class AdminQueryBudgetMixin:
+    # الحدود ثابتة لا تتبع عدد الصفوف؛ تجاوزها يعني استعلامًا لكل صف
+    changelist_budget = 12
+    search_budget = 12
+    changeform_budget = 16
+    time_ceiling = 2.0
+
+    def login_superuser(self):
+        User = get_user_model()
+        user = User.objects.filter(is_superuser=True).first() or User.objects.create_superuser(
+            "budget-admin", "budget@example.com", "pass"
+        )
+        self.client.force_login(user)
+        return user
+
+    def assertQueryBudget(self, url, max_queries, params=None, max_seconds=None):
+        max_seconds = self.time_ceiling if max_seconds is None else max_seconds
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = self.client.get(url, params or {})
+            if getattr(response, "streaming", False):
+                b"".join(response.streaming_content)
+            else:
+                response.content  # noqa: B018  (التأكد من اكتمال العرض)
+            elapsed = time.perf_counter() - started
+        self.assertEqual(response.status_code, 200, url)
+        if len(queries) > max_queries:
+            counts = {}
+            for query in queries.captured_queries:
+                key = fingerprint(query["sql"])
+                counts[key] = counts.get(key, 0) + 1
+            report = "\n".join(f"  {n:>4}× {sql[:300]}" for sql, n in sorted(counts.items(), key=lambda item: -item[1]))
+            self.fail(f"{url}: {len(queries)} queries > budget {max_queries}\n{report}")
+        self.assertLessEqual(elapsed, max_seconds, f"{url}: {elapsed:.2f}s > {max_seconds:.2f}s")
+        return response
+
+    def assertAdminBudgets(self, app_label, search_term="1"):
+        self.login_superuser()
+        registered = [(m, ma) for m, ma in admin.site._registry.items() if m._meta.app_label == app_label]
+        self.assertTrue(registered, f"no admin registered for {app_label}")
+        for model, model_admin in registered:
+            info = (model._meta.app_label, model._meta.model_name)
+            with self.subTest(model=model._meta.label):
+                changelist = reverse("admin:%s_%s_changelist" % info)
+                response = self.assertQueryBudget(changelist, self.changelist_budget)
+                self.assertGreater(response.context["cl"].result_count, 0, f"{model._meta.label} not seeded")
+                if model_admin.search_fields:
+                    self.assertQueryBudget(changelist, self.search_budget, {"q": search_term})
+                self.assertQueryBudget(reverse("admin:%s_%s_add" % info), self.changeform_budget)
+                obj = model._default_manager.order_by("pk").first()
+                self.assertQueryBudget(reverse("admin:%s_%s_change" % info, args=[obj.pk]), self.changeform_budget)
+
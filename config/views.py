@@ -0,0 +1,34 @@
+# config/views.py
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.urls import NoReverseMatch, reverse
+from django.views.decorators.http import require_GET
+
+from .search import registered_models, search as fulltext_search
+
+SEARCH_LIMIT = 50
+
+
+@staff_member_required
+@require_GET
+def search(request):
+    term = request.GET.get("q", "").strip()
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 20)), SEARCH_LIMIT))
+    except ValueError:
+        limit = 20
+    # النماذج التي يملك المستخدم صلاحية عرضها فقط
+    models = [
+        model for model in registered_models()
+        if request.user.has_perm(f"{model._meta.app_label}.view_{model._meta.model_name}")
+    ]
+
+    results = []
+    for obj, rank in fulltext_search(term, models=models, limit=limit) if term and models else []:
+        opts = obj._meta
+        try:
+            url = reverse(f"admin:{opts.app_label}_{opts.model_name}_change", args=[obj.pk])
+        except NoReverseMatch:
+            url = None
+        results.append({"model": opts.label_lower, "id": str(obj.pk), "text": str(obj), "rank": rank, "url": url})
+    return JsonResponse({"query": term, "results": results})